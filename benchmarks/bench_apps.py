@@ -0,0 +1,367 @@
+"""Headless benchmarks of the three dashboards at growing data sizes.
+
+For every app and size, synthetic data matching the real schema is
+generated once into ``--data-dir`` (and reused by later runs), then a fresh
+Python process drives the app's scripts with Streamlit's ``AppTest`` through
+its main interactions and records wall time and peak RSS of each:
+
+- power: every ``option_menu`` page of ``app.py`` (first visit, then a
+  rerun), a one-day zoom of the Energy Trends date chart and a second
+  Visualizations column. The first visit includes building the store and
+  the Feather caches.
+- cars: ``main.py`` and each page, every ``analysis_type`` of
+  ``Visualization.py`` plus its bar plot, and the sidebar filters (one fuel
+  type, then a year range) on Pandas Analysis.
+- tutorial: ``dashboard.py`` on ``SALES_ROWS`` synthetic rows with Region
+  and Product filter changes, and ``chapter-4.py`` parsing a synthetic
+  ``chai_sales.csv`` upload and filtering a city.
+
+AppTest renders neither custom components nor uploads, so ``option_menu``
+is replaced by a stub returning the page under test and
+``st.file_uploader`` by one returning the generated file. Derived caches
+(``.cache/``) are cleared before each process, so every run starts cold.
+
+Results go to a JSON report (``--out``); ``--baseline`` compares against an
+earlier report. The apps' dependencies must be importable, e.g. from the
+power project's environment, which has all of them:
+
+    uv run --project household_power_consumption_eda python benchmarks/bench_apps.py
+    uv run --project household_power_consumption_eda python benchmarks/bench_apps.py \\
+        --apps power cars --rows 10000 1000000 10000000 --baseline bench_report.json
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+APP_DIRS = {
+    "power": REPO / "household_power_consumption_eda",
+    "cars": REPO / "cars_eda",
+    "tutorial": REPO / "tutorial",
+}
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+POWER_PAGES = ["Home", "Data Overview", "Energy Trends", "Visualizations", "Insights", "About"]
+CARS_PAGES = ["Data_Intro", "Pandas Analysis", "Visualization"]
+CARS_FUEL = "Diesel"
+# Seconds AppTest waits for one script run; cold loads at 10M rows take minutes
+RUN_TIMEOUT = 3600
+SAMPLE_SECONDS = 0.005
+# Files the apps open relative to the working directory, linked next to the generated data
+ASSETS = {"power": ["wp2252989.jpg"]}
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def _rss():
+    """Current resident set size in bytes (Linux ``/proc``; ``None`` elsewhere)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _max_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryWatch:
+    """Peak RSS while the block runs.
+
+    ``ru_maxrss`` is exact but only ever grows, so it gives the block's peak
+    when the block set a new process high; otherwise the peak comes from
+    sampling the current RSS on a thread.
+    """
+
+    def __enter__(self):
+        self.start_rss = _rss() or 0
+        self.peak = self.start_rss
+        self._high = _max_rss()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._done.wait(SAMPLE_SECONDS):
+            self.peak = max(self.peak, _rss() or 0)
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss() or 0)
+        high = _max_rss()
+        if high > self._high:
+            self.peak = max(self.peak, high)
+        return False
+
+
+# ---------------------
+# Data
+# ---------------------
+def prepare(app, rows, data_dir):
+    """Directory holding ``app``'s synthetic data at ``rows``, generated if missing."""
+    target = Path(data_dir) / f"{app}-{rows}"
+    done = target / ".complete"
+    if done.exists():
+        return target
+    shutil.rmtree(target, ignore_errors=True)
+    target.mkdir(parents=True)
+    if app == "power":
+        import cleaning
+        import synthetic
+        from schema import CLEANED_FILE, RAW_FILE
+
+        synthetic.write_raw_csv(target / RAW_FILE, rows)
+        cleaning.clean_file(target / RAW_FILE, target / CLEANED_FILE)
+    elif app == "cars":
+        import cars_data
+        import synthetic
+
+        synthetic.write_raw_csv(target / cars_data.RAW_FILE, rows)
+        synthetic.write_cleaned_csv(target / cars_data.RAW_FILE, target / cars_data.CLEANED_FILE)
+    else:
+        import synthetic
+
+        synthetic.write_chai_csv(target / "chai_sales.csv", rows)
+    done.touch()
+    return target
+
+
+# ---------------------
+# Interactions
+# ---------------------
+# Each generator yields (name, action) pairs. An action performs one user
+# interaction and returns the AppTest it ran. Widgets are looked up inside
+# the action: the elements of an earlier run go stale once the app reruns.
+def _labelled(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def power_interactions(app_dir, data):
+    from streamlit.testing.v1 import AppTest
+
+    menu = types.ModuleType("streamlit_option_menu")
+    menu.page = POWER_PAGES[0]
+    menu.option_menu = lambda *args, **kwargs: menu.page
+    sys.modules["streamlit_option_menu"] = menu
+
+    at = AppTest.from_file(str(app_dir / "app.py"), default_timeout=RUN_TIMEOUT)
+    for page in POWER_PAGES:
+        menu.page = page
+        yield page, at.run
+        yield f"{page} (rerun)", at.run
+        if page == "Energy Trends":
+            last_day = _labelled(at.slider, "Date range").value[1]
+            # One day is drawn from minute rows read out of the store
+            yield "Energy Trends one-day zoom", lambda: (
+                _labelled(at.slider, "Date range").set_value((last_day - ONE_DAY, last_day)).run())
+        elif page == "Visualizations":
+            second = _labelled(at.selectbox, "Select numeric column").options[1]
+            yield "Visualizations second column", lambda: (
+                _labelled(at.selectbox, "Select numeric column").set_value(second).run())
+
+
+def cars_interactions(app_dir, data):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(app_dir / "main.py"), default_timeout=RUN_TIMEOUT)
+    yield "main", at.run
+    for page in CARS_PAGES:
+        yield page, lambda page=page: at.switch_page(f"pages/{page}.py").run()
+    analysis = "📌 Choose Analysis Type"
+    for kind in _labelled(at.radio, analysis).options[1:]:
+        yield f"Visualization {kind}", lambda kind=kind: _labelled(at.radio, analysis).set_value(kind).run()
+    yield "Visualization Multivariate Bar Plot", lambda: (
+        _labelled(at.radio, "Select plot type").set_value("Bar Plot").run())
+
+    yield "Pandas Analysis (revisit)", lambda: at.switch_page("pages/Pandas Analysis.py").run()
+    # Options are labelled with their counts, so the value is named rather than read off the widget
+    yield "filter Fuel_Type", lambda: at.multiselect(key="facet_Fuel_Type").set_value([CARS_FUEL]).run()
+    lo, hi = at.slider(key="range_Year").value
+    yield "filter Year range", lambda: at.slider(key="range_Year").set_value(((lo + hi) // 2, hi)).run()
+
+
+class _Upload(io.BytesIO):
+    """What ``st.file_uploader`` returns, for a file read from disk."""
+
+    def __init__(self, path):
+        super().__init__(Path(path).read_bytes())
+        self.name = Path(path).name
+        self.file_id = f"{self.name}-{os.path.getmtime(path)}"
+
+
+def tutorial_interactions(app_dir, data):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # dashboard.py generates its own rows from SALES_ROWS
+    os.environ["SALES_ROWS"] = str(data.rows)
+    at = AppTest.from_file(str(app_dir / "dashboard.py"), default_timeout=RUN_TIMEOUT)
+    yield "dashboard", at.run
+    yield "dashboard (rerun)", at.run
+    regions = _labelled(at.multiselect, "Select Region").options[:2]
+    yield "dashboard Region filter", lambda: _labelled(at.multiselect, "Select Region").set_value(regions).run()
+    products = _labelled(at.multiselect, "Select Product").options[:1]
+    yield "dashboard Product filter", lambda: _labelled(at.multiselect, "Select Product").set_value(products).run()
+
+    upload = _Upload(data.path / "chai_sales.csv")
+    st.file_uploader = lambda *args, **kwargs: upload
+    at = AppTest.from_file(str(app_dir / "chapter-4.py"), default_timeout=RUN_TIMEOUT)
+    yield "chapter-4 upload", at.run
+    yield "chapter-4 (rerun)", at.run
+    yield "chapter-4 city filter", lambda: _labelled(at.selectbox, "Filter by cities").set_value(1).run()
+
+
+INTERACTIONS = {"power": power_interactions, "cars": cars_interactions, "tutorial": tutorial_interactions}
+
+
+# ---------------------
+# Runs
+# ---------------------
+def run_worker(app, rows, data_dir, results):
+    """Generate (or reuse) ``app``'s data at ``rows`` and time each interaction into ``results``."""
+    app_dir = APP_DIRS[app]
+    sys.path.insert(0, str(app_dir))
+    start = time.perf_counter()
+    path = prepare(app, rows, data_dir)
+    print(f"  data ready in {time.perf_counter() - start:.1f}s ({path})", flush=True)
+    # Every run starts without derived caches (Feather copies, the partitioned store, exports)
+    shutil.rmtree(path / ".cache", ignore_errors=True)
+    for asset in ASSETS.get(app, []):
+        if not (path / asset).exists():
+            (path / asset).symlink_to(app_dir / asset)
+    os.chdir(path)
+
+    data = types.SimpleNamespace(path=path, rows=rows)
+    with open(results, "a") as out:
+        for name, action in INTERACTIONS[app](app_dir, data):
+            with MemoryWatch() as mem:
+                start = time.perf_counter()
+                at = action()
+                ms = (time.perf_counter() - start) * 1000
+            errors = [str(exc.value) for exc in at.exception]
+            result = {"app": app, "rows": rows, "interaction": name, "ms": ms,
+                      "peak_mb": mem.peak / 2**20, "delta_mb": (mem.peak - mem.start_rss) / 2**20}
+            if errors:
+                result["error"] = errors[0]
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            note = f" ERROR: {errors[0]}" if errors else ""
+            print(f"  {name:<40} {ms:>10,.0f} ms {result['peak_mb']:>8,.0f} MB peak{note}", flush=True)
+
+
+def size_label(rows):
+    for div, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if rows >= div and rows % div == 0:
+            return f"{rows // div}{suffix}"
+    return f"{rows:,}"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    """One table per app: interactions down, sizes across; times against ``baseline`` if given."""
+    before = {}
+    if baseline:
+        before = {(r["app"], r["interaction"], r["rows"]): r for r in baseline["results"]}
+    for app in report["apps"]:
+        results = [r for r in report["results"] if r["app"] == app]
+        sizes = sorted({r["rows"] for r in results})
+        cells = {(r["interaction"], r["rows"]): r for r in results}
+        names = list(dict.fromkeys(r["interaction"] for r in results))
+        print(f"\n{app}")
+        print(f"{'interaction':<40}" + "".join(f"{size_label(rows):>28}" for rows in sizes))
+        for name in names:
+            line = f"{name:<40}"
+            for rows in sizes:
+                r = cells.get((name, rows))
+                if r is None or "error" in r:
+                    cell = "—" if r is None else "error"
+                else:
+                    cell = f"{r['ms']:,.0f} ms {r['peak_mb']:,.0f} MB"
+                    old = before.get((app, name, rows))
+                    if old and "error" not in old and old["ms"]:
+                        cell += f" ({r['ms'] / old['ms']:.2f}x)"
+                line += f"{cell:>28}"
+            print(line)
+        for r in results:
+            if "error" in r:
+                print(f"  {size_label(r['rows'])} {r['interaction']}: {r['error']}")
+    for app, rows in report["failed"]:
+        print(f"\n{app} at {size_label(rows)} rows did not finish (see its output above)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", nargs="+", choices=list(APP_DIRS), default=list(APP_DIRS))
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Dataset sizes (default: %(default)s)")
+    parser.add_argument("--data-dir", default=Path(__file__).resolve().parent / ".cache",
+                        help="Where generated datasets are kept between runs (default: benchmarks/.cache)")
+    parser.add_argument("--out", default="bench_report.json", help="JSON report to write (default %(default)s)")
+    parser.add_argument("--baseline", help="Earlier report to compare wall times against")
+    parser.add_argument("--worker", nargs=2, metavar=("APP", "ROWS"), help=argparse.SUPPRESS)
+    parser.add_argument("--results", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        app, rows = args.worker
+        run_worker(app, int(rows), Path(args.data_dir), args.results)
+        return
+
+    results = Path(args.out).resolve().with_suffix(".partial.jsonl")
+    results.unlink(missing_ok=True)
+    failed = []
+    for app in args.apps:
+        for rows in sorted(args.rows):
+            print(f"{app} at {size_label(rows)} rows", flush=True)
+            # A process per app and size: caches start empty and peaks are not inherited
+            done = subprocess.run([sys.executable, __file__, "--worker", app, str(rows),
+                                   "--data-dir", str(Path(args.data_dir).resolve()), "--results", str(results)])
+            if done.returncode:
+                failed.append((app, rows))
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "apps": args.apps,
+        "failed": failed,
+        "results": [json.loads(line) for line in results.read_text().splitlines()] if results.exists() else [],
+    }
+    results.unlink(missing_ok=True)
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=1)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    print_report(report, baseline)
+    print(f"\nReport written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
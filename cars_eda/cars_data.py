@@ -0,0 +1,228 @@
+"""Typed, process-wide access to the cars datasets.
+
+Every page calls ``load_cleaned()`` / ``load_raw()`` and gets the same
+frame object: it is parsed once per process with the declared dtypes and
+kept with ``st.cache_resource``, keyed on the file's size and mtime so an
+edited CSV is picked up on the next rerun. The frame is shared between
+pages and sessions, so pages must not modify it in place.
+
+``category_index()`` is built alongside it: per-category counts and price/
+km/year moments (and lazily per category pair) for the breakdown sections.
+``correlation_stats()`` holds the sufficient statistics every correlation
+heatmap is sliced from.
+
+``sidebar_filters()`` draws the facet filters every page shares and returns
+the matching ``Selection``. Filters resolve on a ``FacetIndex`` (bitmap
+intersections), and the subset's frame, category index and correlation
+statistics are cached per filter combination, with the selection's version
+string standing in for the file version in the pages' caches.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from eda_common import instrument
+from eda_common.category_index import CategoryIndex
+from eda_common.correlation import CorrelationStats
+from eda_common.facets import FacetIndex
+from eda_common.fingerprint import file_version
+
+RAW_FILE = "Cars.csv"
+CLEANED_FILE = "Cars_cleaned.csv"
+
+CATEGORICAL_COLUMNS = [
+    "Name",
+    "Location",
+    "Fuel_Type",
+    "Transmission",
+    "Owner_Type",
+    "Colour",
+    "Mileage_unit",
+    "Engine_unit",
+    "Power_unit",
+    "Company_Name",
+    "Model_Name",
+]
+
+# Stored as float64 in the CSV, but always whole numbers without gaps
+SMALL_INT_COLUMNS = {
+    "Year": "int16",
+    "Seats": "int8",
+    "No. of Doors": "int8",
+}
+
+CLEANED_DTYPES = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    **SMALL_INT_COLUMNS,
+}
+
+# Sidebar filters: categories to keep per facet, and inclusive ranges
+FACET_COLUMNS = ["Location", "Company_Name", "Fuel_Type", "Transmission"]
+RANGE_COLUMNS = ["Year", "Price"]
+
+# Filtered subsets (and their indexes) kept per filter combination
+MAX_SELECTIONS = 4
+
+
+# Two entries per file: the current version, plus the previous one while a rerun switches over
+@instrument.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def _read_cleaned(version):
+    # Parse as float first: the CSV writes "2014.0", which the int parsers reject
+    df = pd.read_csv(CLEANED_FILE, dtype={col: "category" for col in CATEGORICAL_COLUMNS})
+    return df.astype(SMALL_INT_COLUMNS)
+
+
+@instrument.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def _build_index(version):
+    return CategoryIndex(_read_cleaned(version))
+
+
+@instrument.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def _build_correlation(version):
+    return CorrelationStats.from_frame(_read_cleaned(version))
+
+
+@instrument.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def _build_facets(version):
+    return FacetIndex(_read_cleaned(version), FACET_COLUMNS, RANGE_COLUMNS)
+
+
+@instrument.cached(st.cache_resource(max_entries=MAX_SELECTIONS, show_spinner=False))
+def _select(version, selected, ranges):
+    facets = _build_facets(version)
+    rows = facets.rows(facets.select(dict(selected), dict(ranges)))
+    return rows, _read_cleaned(version).iloc[rows]
+
+
+@instrument.cached(st.cache_resource(max_entries=MAX_SELECTIONS, show_spinner=False))
+def _build_subset_index(selection_version, _df):
+    return CategoryIndex(_df)
+
+
+@instrument.cached(st.cache_resource(max_entries=MAX_SELECTIONS, show_spinner=False))
+def _build_subset_correlation(selection_version, _df):
+    return CorrelationStats.from_frame(_df)
+
+
+@instrument.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def _read_raw(version):
+    return pd.read_csv(RAW_FILE)
+
+
+def load_cleaned():
+    """The cleaned dataset with ``CLEANED_DTYPES``; shared, do not mutate."""
+    return _read_cleaned(cleaned_version())
+
+
+def load_raw():
+    """The raw dataset as read from the CSV; shared, do not mutate."""
+    return _read_raw(raw_version())
+
+
+def category_index(selection=None):
+    """``CategoryIndex`` over the cleaned dataset's (or a selection's) categorical and numeric columns."""
+    if selection is None or not selection.filtered:
+        return _build_index(cleaned_version())
+    return _build_subset_index(selection.version, selection.df)
+
+
+def correlation_stats(selection=None):
+    """``CorrelationStats`` over the cleaned dataset's (or a selection's) numeric columns."""
+    if selection is None or not selection.filtered:
+        return _build_correlation(cleaned_version())
+    return _build_subset_correlation(selection.version, selection.df)
+
+
+def facet_index():
+    """``FacetIndex`` over ``FACET_COLUMNS`` and ``RANGE_COLUMNS`` of the cleaned dataset."""
+    return _build_facets(cleaned_version())
+
+
+class Selection(NamedTuple):
+    """The cleaned listings matching the sidebar filters.
+
+    ``rows`` are positions in ``load_cleaned()``; ``df`` is that subset
+    (the full shared frame when nothing is filtered). ``version`` identifies
+    file and filters together, for use as a cache key.
+    """
+
+    df: pd.DataFrame
+    rows: np.ndarray
+    version: str
+    filtered: bool
+
+
+def select(selected=None, ranges=None):
+    """``Selection`` for facet categories ``selected`` and inclusive ``ranges``."""
+    version = cleaned_version()
+    selected = tuple((col, tuple(values)) for col, values in (selected or {}).items() if values)
+    ranges = tuple((col, (lo, hi)) for col, (lo, hi) in (ranges or {}).items())
+    if not selected and not ranges:
+        df = _read_cleaned(version)
+        return Selection(df, np.arange(len(df)), version, False)
+    rows, df = _select(version, selected, ranges)
+    key = hashlib.sha1(repr((selected, ranges)).encode()).hexdigest()[:8]
+    return Selection(df, rows, f"{version}-{key}", True)
+
+
+def _keep(key):
+    # Widget state is dropped when another page runs; keep a copy the next page can restore
+    st.session_state[f"_kept_{key}"] = st.session_state[key]
+
+
+def _restore(key, default):
+    st.session_state[key] = st.session_state.get(f"_kept_{key}", default)
+
+
+def _reset_filters():
+    for key in list(st.session_state):
+        if str(key).startswith(("facet_", "range_", "_kept_facet_", "_kept_range_")):
+            del st.session_state[key]
+
+
+def sidebar_filters():
+    """Draw the shared sidebar filters and return the matching ``Selection``.
+
+    Each facet lists its categories with the number of listings picking it
+    would leave, given the other filters. Stops the page when nothing matches.
+    """
+    facets = facet_index()
+    bounds = {col: facets.bounds(col) for col in RANGE_COLUMNS}
+    bounds["Year"] = tuple(int(v) for v in bounds["Year"])
+    for col in FACET_COLUMNS:
+        _restore(f"facet_{col}", [])
+    for col in RANGE_COLUMNS:
+        _restore(f"range_{col}", bounds[col])
+    selected = {col: st.session_state[f"facet_{col}"] for col in FACET_COLUMNS}
+    ranges = {col: st.session_state[f"range_{col}"] for col in RANGE_COLUMNS
+              if tuple(st.session_state[f"range_{col}"]) != bounds[col]}
+
+    with st.sidebar:
+        st.markdown("### 🔎 Filters")
+        for col in FACET_COLUMNS:
+            counts = facets.facet_counts(col, selected, ranges)
+            st.multiselect(col.replace("_", " "), facets.categories(col).tolist(), key=f"facet_{col}",
+                           format_func=lambda c, counts=counts: f"{c} ({counts[c]:,})",
+                           on_change=_keep, args=(f"facet_{col}",), placeholder="All")
+        st.slider("Year", *bounds["Year"], key="range_Year", on_change=_keep, args=("range_Year",))
+        st.slider("Price (₹ Lakh)", *bounds["Price"], key="range_Price", step=0.25,
+                  on_change=_keep, args=("range_Price",))
+        st.button("Reset filters", on_click=_reset_filters)
+
+    selection = select(selected, ranges)
+    st.sidebar.caption(f"{len(selection.df):,} of {facets.n_rows:,} listings match")
+    if selection.df.empty:
+        st.warning("⚠️ No listings match the sidebar filters.")
+        st.stop()
+    return selection
+
+
+def cleaned_version():
+    return file_version(CLEANED_FILE)
+
+
+def raw_version():
+    return file_version(RAW_FILE)
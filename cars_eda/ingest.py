@@ -0,0 +1,312 @@
+"""Build (or extend) ``Cars_cleaned.csv`` from a raw listings dump.
+
+The raw file is read in chunks, and every step works on the distinct
+strings of a chunk rather than on each row: ``Mileage``/``Engine``/``Power``
+are split into ``*_value``/``*_unit`` with one regex over the factorized
+values, and ``Name`` is split into ``Company_Name``/``Model_Name`` the same
+way. The cleaning follows the original notebook:
+
+- ``New_Price`` is dropped, then exact duplicate listings
+- ``Kilometers_Driven`` above ``MAX_KILOMETERS`` is treated as an entry error
+- missing text columns get the most frequent value, missing numbers the
+  median; a missing ``Mileage`` gets the mean of the most common unit
+- rows without a ``Name`` or ``Price`` are dropped
+
+Each listing is keyed by a hash of its raw fields. The hashes already
+written, and the fill values used, are kept next to the output, so a new
+dump only appends listings whose content is new (new or changed rows) and
+cleans them the same way as the existing ones. Memory is bounded by
+``chunk_rows`` plus 8 bytes per listing seen.
+
+Usage::
+
+    python ingest.py Cars.csv Cars_cleaned.csv
+    python ingest.py new_dump.csv Cars_cleaned.csv            # append new listings
+    python ingest.py Cars.csv Cars_cleaned.csv --rebuild
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 100_000
+
+RAW_COLUMNS = [
+    "Name", "Location", "Year", "Kilometers_Driven", "Fuel_Type", "Transmission", "Owner_Type",
+    "Mileage", "Engine", "Power", "Colour", "Seats", "No. of Doors", "New_Price", "Price",
+]
+# Everything but New_Price identifies a listing
+KEY_COLUMNS = [col for col in RAW_COLUMNS if col != "New_Price"]
+
+CLEANED_COLUMNS = [
+    "Name", "Location", "Year", "Kilometers_Driven", "Fuel_Type", "Transmission", "Owner_Type",
+    "Colour", "Seats", "No. of Doors", "Price",
+    "Mileage_value", "Mileage_unit", "Engine_value", "Engine_unit", "Power_value", "Power_unit",
+    "Company_Name", "Model_Name",
+]
+
+TEXT_COLUMNS = ["Location", "Fuel_Type", "Transmission", "Owner_Type", "Colour"]
+NUMBER_COLUMNS = ["Year", "Kilometers_Driven", "Seats", "No. of Doors"]
+UNIT_COLUMNS = ["Mileage", "Engine", "Power"]
+
+# "12.05 kmpl", "20.0 km/kg", "2179 CC", "120 bhp"; "null bhp" keeps its unit but no value
+UNIT_PATTERN = r"^\s*(?P<value>\d+(?:\.\d+)?)?\D*?(?P<unit>[A-Za-z/]+)\s*$"
+
+MAX_KILOMETERS = 1_000_000
+
+# Brands spelled with two words, and their spelling in the cleaned data
+TWO_WORD_BRANDS = {"Land Rover": "Land rover"}
+MODEL_NAMES = {("Land rover", "Range"): "Range rover"}
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield raw chunks: plain numbers parsed as float64, everything else as text."""
+    dtypes = {col: str for col in RAW_COLUMNS}
+    dtypes.update({col: "float64" for col in NUMBER_COLUMNS + ["Price"]})
+    reader = pd.read_csv(path, usecols=RAW_COLUMNS, dtype=dtypes, chunksize=chunk_rows)
+    with reader:
+        yield from reader
+
+
+def listing_hashes(chunk):
+    """64-bit content hash of each raw listing (``KEY_COLUMNS`` only)."""
+    return pd.util.hash_pandas_object(chunk[KEY_COLUMNS], index=False).to_numpy()
+
+
+class SeenListings:
+    """Sorted hashes of the listings written so far."""
+
+    def __init__(self, hashes=None):
+        self.hashes = np.empty(0, dtype=np.uint64) if hashes is None else np.asarray(hashes, dtype=np.uint64)
+
+    def new(self, chunk):
+        """Rows of ``chunk`` not seen before (first of any repeats), recorded as seen."""
+        hashes = listing_hashes(chunk)
+        _, first = np.unique(hashes, return_index=True)
+        keep = np.zeros(len(chunk), dtype=bool)
+        keep[first] = True
+        if len(self.hashes):
+            pos = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+            keep &= self.hashes[pos] != hashes
+        self.hashes = np.union1d(self.hashes, hashes[keep])
+        return chunk[keep]
+
+
+def _per_unique(series, parse):
+    """Apply ``parse`` (a function of an Index of strings) to the distinct values only."""
+    codes, uniques = pd.factorize(series)
+    parsed = parse(pd.Index(uniques, dtype=object))
+    # Code -1 (missing) picks the trailing all-missing row
+    parsed = pd.concat([parsed, pd.DataFrame(np.nan, index=[len(parsed)], columns=parsed.columns)])
+    return parsed.iloc[codes].set_axis(series.index)
+
+
+def split_units(series):
+    """``value`` (float) and ``unit`` columns from strings like ``"12.05 kmpl"``."""
+    def parse(uniques):
+        parts = uniques.str.extract(UNIT_PATTERN)
+        return parts.assign(value=pd.to_numeric(parts["value"])).reset_index(drop=True)
+    return _per_unique(series, parse)
+
+
+def split_names(series):
+    """``Company_Name`` and ``Model_Name`` from listing names like ``"Maruti Swift"``."""
+    def parse(uniques):
+        brand, model = uniques.str.split(n=1).str[0], uniques.str.split(n=1).str[1]
+        for words, spelling in TWO_WORD_BRANDS.items():
+            two = uniques.str.startswith(words + " ")
+            brand = brand.where(~two, spelling)
+            model = model.where(~two, uniques.str[len(words) + 1:])
+        model = pd.Series([MODEL_NAMES.get((b, m), m) for b, m in zip(brand, model)], dtype=object)
+        return pd.DataFrame({"Company_Name": brand.to_numpy(), "Model_Name": model.to_numpy()})
+    return _per_unique(series, parse)
+
+
+def parse_chunk(chunk):
+    """Typed columns of a raw chunk, before missing values are filled."""
+    df = chunk.loc[chunk["Name"].notna() & chunk["Price"].notna()]
+    parsed = {col: df[col] for col in ["Name", *TEXT_COLUMNS, *NUMBER_COLUMNS, "Price"]}
+    parsed["Kilometers_Driven"] = parsed["Kilometers_Driven"].where(parsed["Kilometers_Driven"] <= MAX_KILOMETERS)
+    for col in UNIT_COLUMNS:
+        parts = split_units(df[col])
+        parsed[f"{col}_value"], parsed[f"{col}_unit"] = parts["value"], parts["unit"]
+    names = split_names(df["Name"])
+    parsed["Company_Name"], parsed["Model_Name"] = names["Company_Name"], names["Model_Name"]
+    return pd.DataFrame(parsed)
+
+
+class FillValues:
+    """Exact modes, medians and unit means, accumulated chunk by chunk.
+
+    Everything is kept as value counts, so memory grows with the number of
+    distinct values rather than rows.
+    """
+
+    MODE_COLUMNS = TEXT_COLUMNS + [f"{col}_unit" for col in UNIT_COLUMNS]
+    MEDIAN_COLUMNS = NUMBER_COLUMNS + ["Engine_value", "Power_value"]
+
+    def __init__(self):
+        self._counts = {col: pd.Series(dtype="float64") for col in self.MODE_COLUMNS + self.MEDIAN_COLUMNS}
+        self._mileage = pd.DataFrame(columns=["sum", "count"], dtype="float64")
+
+    def update(self, parsed):
+        for col, counts in self._counts.items():
+            self._counts[col] = counts.add(parsed[col].value_counts(), fill_value=0)
+        by_unit = parsed.groupby("Mileage_unit")["Mileage_value"].agg(["sum", "count"])
+        self._mileage = self._mileage.add(by_unit, fill_value=0)
+
+    @staticmethod
+    def _mode(counts):
+        # Smallest of the most frequent values, like Series.mode()[0]
+        return min(counts.index[counts == counts.max()]) if len(counts) else None
+
+    @staticmethod
+    def _median(counts):
+        counts = counts.sort_index()
+        below = counts.cumsum().to_numpy()
+        n = below[-1] if len(below) else 0
+        if not n:
+            return None
+        lo = counts.index[np.searchsorted(below, (n + 1) // 2)]
+        hi = counts.index[np.searchsorted(below, n // 2 + 1)]
+        return (float(lo) + float(hi)) / 2
+
+    def values(self):
+        """Fill value per cleaned column, as a JSON-friendly dict."""
+        fills = {col: self._mode(self._counts[col]) for col in self.MODE_COLUMNS}
+        fills.update({col: self._median(self._counts[col]) for col in self.MEDIAN_COLUMNS})
+        unit = fills["Mileage_unit"]
+        if unit in self._mileage.index and self._mileage.loc[unit, "count"]:
+            fills["Mileage_value"] = float(self._mileage.loc[unit, "sum"] / self._mileage.loc[unit, "count"])
+        return fills
+
+
+def clean_chunk(parsed, fills):
+    """Fill missing values and order the columns like ``Cars_cleaned.csv``."""
+    filled = parsed.fillna({col: value for col, value in fills.items() if value is not None})
+    # A filled value is in the most common unit
+    for col in UNIT_COLUMNS:
+        missing = parsed[f"{col}_value"].isna()
+        filled.loc[missing, f"{col}_unit"] = fills[f"{col}_unit"]
+    return filled[CLEANED_COLUMNS]
+
+
+def _csv_column(values):
+    """CSV text of each value, formatted once per distinct value (``to_csv``'s rules)."""
+    codes, uniques = pd.factorize(values)
+    text = pd.Index(uniques.astype(str), dtype=object)
+    if values.dtype == object:
+        quote = text.str.contains(r'[,"\r\n]')
+        text = text.where(~quote, '"' + text.str.replace('"', '""') + '"')
+    return np.append(text.to_numpy(), "")[codes]
+
+
+def write_chunk(cleaned, path):
+    """Append ``cleaned`` to the CSV at ``path`` without a header.
+
+    The output matches ``DataFrame.to_csv`` (floats as ``2012.0``, minimal
+    quoting), but every column repeats a few thousand distinct values, so
+    those are formatted once and the rows are joined from them.
+    """
+    columns = [_csv_column(cleaned[col]) for col in cleaned.columns]
+    with open(path, "a", newline="") as fh:
+        fh.writelines(",".join(row) + "\n" for row in zip(*columns))
+
+
+def _state_paths(out_path):
+    return Path(f"{out_path}.hashes.npy"), Path(f"{out_path}.fills.json")
+
+
+def load_state(out_path):
+    """``(SeenListings, fills)`` stored with ``out_path``, or ``None`` if there are none."""
+    hashes_path, fills_path = _state_paths(out_path)
+    if not (Path(out_path).exists() and hashes_path.exists() and fills_path.exists()):
+        return None
+    return SeenListings(np.load(hashes_path)), json.loads(fills_path.read_text())
+
+
+def save_state(out_path, seen, fills):
+    hashes_path, fills_path = _state_paths(out_path)
+    np.save(hashes_path, seen.hashes)
+    fills_path.write_text(json.dumps(fills, indent=2))
+
+
+def fill_values(raw_path, seen, chunk_rows=CHUNK_ROWS):
+    """Fill values over the listings of ``raw_path`` that ``seen`` does not hold yet.
+
+    ``seen`` itself is left unchanged.
+    """
+    fills = FillValues()
+    seen = SeenListings(seen.hashes)
+    for chunk in read_chunks(raw_path, chunk_rows):
+        fills.update(parse_chunk(seen.new(chunk)))
+    return fills.values()
+
+
+def ingest(raw_path, out_path, chunk_rows=CHUNK_ROWS, rebuild=False, progress=None):
+    """Append the new listings of ``raw_path`` to ``out_path``, cleaned.
+
+    With ``rebuild`` (or when ``out_path`` does not exist yet) the output is
+    written from ``raw_path`` alone: fill values are computed in a first
+    pass, and the file is written to a temporary name and moved into place.
+    Otherwise the stored fill values are reused and only listings with an
+    unseen hash are appended. ``progress(rows_read, rows_written)`` is called
+    after each chunk. Returns ``(rows_read, rows_written)``.
+    """
+    state = None if rebuild else load_state(out_path)
+    if state is None and not rebuild and Path(out_path).exists():
+        raise FileNotFoundError(
+            f"No ingest state next to {out_path}; rebuild it once from the full raw dump with --rebuild"
+        )
+    if state is None:
+        seen = SeenListings()
+        fills = fill_values(raw_path, seen, chunk_rows)
+        target = Path(f"{out_path}.tmp")
+        pd.DataFrame(columns=CLEANED_COLUMNS).to_csv(target, index=False)
+    else:
+        seen, fills = state
+        target = Path(out_path)
+
+    rows_in = rows_out = 0
+    for chunk in read_chunks(raw_path, chunk_rows):
+        cleaned = clean_chunk(parse_chunk(seen.new(chunk)), fills)
+        write_chunk(cleaned, target)
+        rows_in += len(chunk)
+        rows_out += len(cleaned)
+        if progress:
+            progress(rows_in, rows_out)
+    if target != Path(out_path):
+        os.replace(target, out_path)
+    save_state(out_path, seen, fills)
+    return rows_in, rows_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", help="Raw listings dump (same columns as Cars.csv)")
+    parser.add_argument("out", help="Cleaned CSV to create or append to")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk (default %(default)s)")
+    parser.add_argument("--rebuild", action="store_true", help="Rewrite the output instead of appending")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(rows_in, rows_out):
+        rate = rows_in / (time.perf_counter() - start)
+        print(f"\r{rows_in:,} rows read, {rows_out:,} new ({rate:,.0f} rows/s)", end="", flush=True)
+
+    try:
+        rows_in, rows_out = ingest(args.raw, args.out, args.chunk_rows, args.rebuild, progress=report)
+    except FileNotFoundError as exc:
+        parser.error(str(exc))
+    print(f"\nAppended {rows_out:,} of {rows_in:,} listings to {args.out} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,24 @@
 import streamlit as st
-import pandas as pd
+from eda_common import export, grid, instrument, summary
+
+import cars_data
 
 # Page config
 st.set_page_config(page_title="Car Data Overview", layout="wide")
+instrument.start_run("cars/Data Intro", instrument.requested(st.query_params))
+
 
-# Load data
-@st.cache_data
-def load_data():
-    raw = pd.read_csv("Cars.csv")
-    clean = pd.read_csv("Cars_cleaned.csv")
-    return raw, clean
+# describe()-style tables from one streaming pass, cached per file version (and filters)
+@instrument.cached(st.cache_data(max_entries=2 * cars_data.MAX_SELECTIONS))
+def summary_table(version, kind, _df):
+    return summary.describe(summary.summarize(_df))
 
-raw_df, clean_df = load_data()
+
+# Load data (shared, typed frames; parsed once per process).
+# The cleaned side is narrowed to the listings matching the sidebar filters.
+raw_df = cars_data.load_raw()
+selection = cars_data.sidebar_filters()
+clean_df = selection.df
 
 # Title
 st.title("🚗 Car Dataset Comparison App")
@@ -67,8 +74,7 @@ st.markdown("---")
 st.markdown("## 🧪 Explore the Cleaned Dataset")
 
 with st.expander("🔍 Column Explorer"):
-    selected_cols = st.multiselect("Choose columns to view", clean_df.columns.tolist(), default=clean_df.columns.tolist())
-    st.dataframe(clean_df[selected_cols], use_container_width=True)
+    grid.explorer(clean_df, version=selection.version)
 
 # Summary Statistics
 st.markdown("## 📈 Summary Statistics")
@@ -76,16 +82,41 @@ st.markdown("## 📈 Summary Statistics")
 tab1, tab2 = st.tabs(["📊 Raw Dataset", "📊 Cleaned Dataset"])
 
 with tab1:
-    st.write(raw_df.describe())
+    st.write(summary_table(cars_data.raw_version(), "raw", raw_df))
 
 with tab2:
-    st.write(clean_df.describe())
+    st.write(summary_table(selection.version, "cleaned", clean_df))
+
+st.caption(f"Percentiles are approximate (within ±{summary.RANK_ERROR:.2%} of the row count in rank); "
+           "the other statistics are exact.")
 
 # Download button
+# Encoded in chunks only when asked for, then kept in .cache/ per file version and options
 st.markdown("## ⬇️ Download Cleaned Dataset")
-st.download_button(
-    label="Download Cleaned CSV",
-    data=clean_df.to_csv(index=False),
-    file_name="cleaned_car_data.csv",
-    mime="text/csv"
-)
\ No newline at end of file
+c1, c2, c3 = st.columns([2, 1, 1])
+export_cols = c1.multiselect("Columns to export", clean_df.columns.tolist(), default=clean_df.columns.tolist())
+export_format = c2.selectbox("Format", export.available_formats())
+
+where = None
+years = clean_df["Year"].dropna()
+# A selection spanning one year (or none) has no range to narrow, and a slider needs min < max
+if len(years) and years.min() < years.max():
+    first_year, last_year = int(years.min()), int(years.max())
+    export_years = c3.slider("Year range", first_year, last_year, (first_year, last_year))
+    if export_years != (first_year, last_year):
+        where = ("Year", export_years[0], export_years[1] + 1)
+export_args = (selection.version, export_format, ".cache", "cleaned_car_data", export_cols, where)
+export_path = export.export_path(*export_args)
+
+if not export_path.exists() and st.button("Prepare download"):
+    with st.spinner("Encoding export..."):
+        export.export_file(clean_df, *export_args)
+if export_path.exists():
+    st.download_button(
+        label=f"Download Cleaned {export_format}",
+        data=export.read_bytes(export_path),
+        file_name=f"cleaned_car_data{export.FORMATS[export_format].suffix}",
+        mime=export.FORMATS[export_format].mime
+    )
+
+instrument.sidebar_panel()
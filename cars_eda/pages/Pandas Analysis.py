@@ -1,11 +1,29 @@
 import streamlit as st
 import pandas as pd
+from eda_common import facets, instrument, profiling, summary
 
-# Load Data
-df = pd.read_csv("Cars_cleaned.csv")
+import cars_data
+
+
+# Keyed on the selection's version (file and sidebar filters); a few filter combinations are kept
+@instrument.cached(st.cache_data(max_entries=cars_data.MAX_SELECTIONS))
+def summary_table(version, _df):
+    """describe()-style table of ``_df`` (the selection ``version``) from one streaming pass."""
+    return summary.describe(summary.summarize(_df))
+
+
+@instrument.cached(st.cache_data(max_entries=cars_data.MAX_SELECTIONS))
+def column_profile(version, _df):
+    """Counts, distinct values, examples, memory and top values per column of ``_df``, in one pass."""
+    return profiling.profile(_df)
 
 # Page Config
 st.set_page_config(page_title="🚗 Cars EDA Dashboard", page_icon="🚗", layout="wide")
+instrument.start_run("cars/Pandas Analysis", instrument.requested(st.query_params))
+
+# Listings matching the sidebar filters (the shared, typed frame when nothing is filtered)
+selection = cars_data.sidebar_filters()
+df = selection.df
 
 # --- Custom CSS Styling ---
 st.markdown("""
@@ -52,14 +70,15 @@ st.markdown("#### Gain insights into the used car market with data-powered explo
 
 # Section: Basic Info
 st.markdown("## 🔍 1. Dataset Overview")
-mem_usage = df.memory_usage(deep=True).sum() / (1024 ** 2)
+prof = column_profile(selection.version, df)
+mem_usage = prof["memory_bytes"].sum() / (1024 ** 2)
 
 info_df = pd.DataFrame({
-    "📌 Column": df.columns,
-    "✅ Non-Null Count": df.notnull().sum().values,
-    "🔠 Data Type": df.dtypes.astype(str).values,
-    "🔢 Unique Values": [df[col].nunique() for col in df.columns],
-    "📍 Example Value": [df[col].dropna().iloc[0] if not df[col].dropna().empty else "N/A" for col in df.columns]
+    "📌 Column": prof.index,
+    "✅ Non-Null Count": prof["non_null"].values,
+    "🔠 Data Type": prof["dtype"].values,
+    "🔢 Unique Values": prof["distinct"].values,
+    "📍 Example Value": prof["example"].fillna("N/A").values
 })
 
 st.dataframe(info_df, use_container_width=True)
@@ -74,11 +93,13 @@ st.markdown(f"""
 
 # Section: Summary Statistics
 st.markdown("## 📈 2. Summary Statistics")
-st.dataframe(df.describe(), use_container_width=True)
+st.dataframe(summary_table(selection.version, df), use_container_width=True)
+st.caption(f"Percentiles are approximate (within ±{summary.RANK_ERROR:.2%} of the row count in rank); "
+           "the other statistics are exact.")
 
 # Section: Null Values
 st.markdown("## ❓ 3. Missing Values")
-nulls = df.isnull().sum()
+nulls = prof["missing"]
 nulls = nulls[nulls > 0].sort_values(ascending=False)
 
 if nulls.empty:
@@ -89,18 +110,27 @@ else:
 # Section: Unique Value Counts
 st.markdown("## 🧬 4. Unique Value Counts")
 
+# Counts and per-brand averages come from the precomputed category index, not a scan of the rows
+index = cars_data.category_index(selection)
 cols_to_check = ['Fuel_Type', 'Transmission', 'Owner_Type', 'Colour', 'Company_Name']
 for col in cols_to_check:
     st.markdown(f"### 🔹 {col}")
-    st.markdown(f"- Unique Values: `{df[col].nunique()}`")
-    st.dataframe(df[col].value_counts().to_frame(name="Count"))
+    st.markdown(f"- Unique Values: `{index.nunique(col)}`")
+    st.dataframe(index.counts(col).to_frame(name="Count"))
 
 # Section: Top Driven Cars
 st.markdown("## 🚘 5. Top 5 Most Driven Cars")
-top_driven = df.sort_values(by='Kilometers_Driven', ascending=False)[['Name', 'Kilometers_Driven']].head()
+# Partial selection of the top rows instead of sorting every listing
+top_driven = df.iloc[facets.top_k(df['Kilometers_Driven'], 5)][['Name', 'Kilometers_Driven']]
 st.dataframe(top_driven, use_container_width=True)
 
+st.markdown("### 🏷️ Top 5 Cheapest Cars")
+cheapest = df.iloc[facets.top_k(df['Price'], 5, largest=False)][['Name', 'Year', 'Kilometers_Driven', 'Price']]
+st.dataframe(cheapest, use_container_width=True)
+
 # Section: Average Price by Brand
 st.markdown("## 💸 6. Average Car Price by Brand")
-avg_price = df.groupby("Company_Name")["Price"].mean().sort_values(ascending=False).round(2)
+avg_price = index.group_stats("Company_Name", "Price")["mean"].sort_values(ascending=False).round(2)
 st.dataframe(avg_price.to_frame(name="Average Price (₹)"), use_container_width=True)
+
+instrument.sidebar_panel()
@@ -2,12 +2,66 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from eda_common import bars, density, distribution, figure_cache, instrument
+
+import cars_data
 
 # Page config
 st.set_page_config(page_title="📊 Visual Analysis", layout="wide")
+instrument.start_run("cars/Visualization", instrument.requested(st.query_params))
+
+# Listings matching the sidebar filters (the shared, typed frame when nothing is filtered)
+selection = cars_data.sidebar_filters()
+df = selection.df
+data_version = selection.version
+index = cars_data.category_index(selection)
+
+
+@instrument.cached(st.cache_data(max_entries=4 * cars_data.MAX_SELECTIONS))
+def column_distribution(data_version, column, _df):
+    """Histogram bins, KDE curve and box statistics for one numeric column of ``_df``."""
+    return distribution.column_stats(_df[column].to_numpy())
+
+
+def show_figure(chart, params, draw):
+    """Render ``draw()`` through the shared figure cache and display the PNG."""
+    png = figure_cache.render((data_version, chart, params), draw)
+    with instrument.span(f"image:{chart}", "render"):
+        st.image(png, use_container_width=True)
+
+
+def density_controls(key):
+    """Rendering mode for scatter plots; "Auto" rasterises above ``density.DENSITY_THRESHOLD`` rows."""
+    c1, c2 = st.columns(2)
+    mode = c1.radio("Rendering", ("Auto", "Points", "Density"), horizontal=True, key=f"{key}_mode")
+    overlay = c2.checkbox("Overlay outlier points", value=True, key=f"{key}_outliers")
+    return density.use_density(len(df), mode), overlay
+
+
+def draw_density(ax, x_col, y_col, hue_col=None, overlay=True):
+    """Scatter of ``x_col`` vs ``y_col`` as one binned image, with isolated points drawn exactly."""
+    r = density.raster(df[x_col], df[y_col], hue=None if hue_col is None else df[hue_col])
+    density.plot_raster(ax, r)
+    if overlay:
+        rows = density.outliers(r)
+        ax.scatter(df[x_col].to_numpy()[rows], df[y_col].to_numpy()[rows], s=6, color="black", linewidths=0)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+
+
+def distinct(col):
+    """Number of distinct values of ``col`` in the selection."""
+    return index.nunique(col) if col in index.categorical else df[col].nunique()
+
+
+def bar_stats(x_col, y_col, hue_col=None):
+    """count/mean/std of ``y_col`` per x (and hue) group, from the category index when possible."""
+    if x_col in index.categorical and y_col in index.values and hue_col in (None, *index.categorical):
+        if hue_col is None:
+            return index.group_stats(x_col, y_col)
+        return index.pair_stats(x_col, hue_col, y_col)
+    return bars.group_stats(df[x_col], df[y_col], None if hue_col is None else df[hue_col])
 
-# Load data
-df = pd.read_csv("Cars_cleaned.csv")
 
 # Inject Custom CSS
 st.markdown("""
@@ -47,24 +101,39 @@ if analysis_type == "Univariate":
 
         with col1:
             st.subheader("📊 Distribution")
-            fig, ax = plt.subplots()
-            sns.histplot(df[column], kde=True, ax=ax, color="skyblue")
-            ax.set_title(f'Distribution of {column}')
-            st.pyplot(fig)
+
+            def draw_histogram():
+                fig, ax = plt.subplots()
+                distribution.plot_histogram(ax, column_distribution(data_version, column, df), color="skyblue")
+                ax.set_xlabel(column)
+                ax.set_title(f'Distribution of {column}')
+                return fig
+
+            show_figure("histogram", {"column": column}, draw_histogram)
 
         with col2:
             st.subheader("📦 Boxplot")
-            fig2, ax2 = plt.subplots()
-            sns.boxplot(x=df[column], ax=ax2, color="lightgreen")
-            ax2.set_title(f'Boxplot of {column}')
-            st.pyplot(fig2)
+
+            def draw_boxplot():
+                fig2, ax2 = plt.subplots()
+                distribution.plot_boxplot(ax2, column_distribution(data_version, column, df), color="lightgreen")
+                ax2.set_xlabel(column)
+                ax2.set_title(f'Boxplot of {column}')
+                return fig2
+
+            show_figure("boxplot", {"column": column}, draw_boxplot)
     else:
         st.subheader("📊 Count Plot")
-        fig, ax = plt.subplots(figsize=(8, 4))
-        df[column].value_counts().head(15).plot(kind='bar', color="salmon", ax=ax)
-        ax.set_title(f'Count Plot of {column}')
-        ax.set_ylabel("Count")
-        st.pyplot(fig)
+
+        def draw_counts():
+            fig, ax = plt.subplots(figsize=(8, 4))
+            counts = index.counts(column) if column in index.categorical else df[column].value_counts()
+            counts.head(15).plot(kind='bar', color="salmon", ax=ax)
+            ax.set_title(f'Count Plot of {column}')
+            ax.set_ylabel("Count")
+            return fig
+
+        show_figure("counts", {"column": column}, draw_counts)
 
 # === BIVARIATE ===
 elif analysis_type == "Bivariate":
@@ -74,18 +143,40 @@ elif analysis_type == "Bivariate":
 
     if pd.api.types.is_numeric_dtype(df[col1]) and pd.api.types.is_numeric_dtype(df[col2]):
         st.subheader("📈 Scatter Plot")
-        fig, ax = plt.subplots()
-        sns.scatterplot(x=df[col1], y=df[col2], ax=ax, color="orange")
-        ax.set_title(f'Scatter Plot: {col1} vs {col2}')
-        st.pyplot(fig)
+        use_density, overlay = density_controls("scatter")
+
+        def draw_scatter():
+            fig, ax = plt.subplots()
+            if use_density:
+                draw_density(ax, col1, col2, overlay=overlay)
+            else:
+                sns.scatterplot(x=df[col1], y=df[col2], ax=ax, color="orange")
+            ax.set_title(f'Scatter Plot: {col1} vs {col2}')
+            return fig
+
+        show_figure("scatter", {"x": col1, "y": col2, "density": use_density, "outliers": overlay}, draw_scatter)
 
     elif pd.api.types.is_numeric_dtype(df[col1]) and not pd.api.types.is_numeric_dtype(df[col2]):
         st.subheader("📦 Boxplot Grouped by Category")
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.boxplot(x=df[col2], y=df[col1], ax=ax, palette="Set2")
-        ax.set_title(f'Boxplot of {col1} grouped by {col2}')
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha="right")
-        st.pyplot(fig)
+
+        def draw_grouped_boxplot():
+            fig, ax = plt.subplots(figsize=(10, 5))
+            if col2 in index.categorical and col1 in index.values:
+                # Boxes read off the index's per-category sorted values
+                labels, boxes = index.box_stats(col2, col1)
+                artists = ax.bxp(boxes, patch_artist=True, medianprops={"color": "0.2"},
+                                 flierprops={"marker": "d", "markersize": 4, "markerfacecolor": "0.3"})
+                for patch, color in zip(artists["boxes"], sns.color_palette("Set2", len(boxes))):
+                    patch.set_facecolor(color)
+                ax.set_xlabel(col2)
+                ax.set_ylabel(col1)
+            else:
+                sns.boxplot(x=df[col2], y=df[col1], ax=ax, palette="Set2")
+            ax.set_title(f'Boxplot of {col1} grouped by {col2}')
+            ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha="right")
+            return fig
+
+        show_figure("grouped_boxplot", {"y": col1, "by": col2}, draw_grouped_boxplot)
     else:
         st.warning("⚠️ Bivariate plot not available for selected combination.")
 
@@ -99,10 +190,13 @@ elif analysis_type == "Multivariate":
     selected_cols = st.multiselect("Select numeric columns for heatmap", numeric_cols, default=numeric_cols[:5])
 
     if len(selected_cols) >= 2:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(df[selected_cols].corr(), annot=True, cmap='coolwarm', ax=ax)
-        ax.set_title("Correlation Heatmap")
-        st.pyplot(fig)
+        def draw_heatmap():
+            fig, ax = plt.subplots(figsize=(10, 6))
+            sns.heatmap(cars_data.correlation_stats(selection).corr(selected_cols), annot=True, cmap='coolwarm', ax=ax)
+            ax.set_title("Correlation Heatmap")
+            return fig
+
+        show_figure("correlation", {"columns": selected_cols}, draw_heatmap)
     else:
         st.info("ℹ️ Select at least two numeric columns to generate the heatmap.")
 
@@ -115,15 +209,52 @@ elif analysis_type == "Multivariate":
 
     plot_type = st.radio("Select plot type", ("Scatter Plot", "Bar Plot"))
 
+    # Binned rendering needs numeric axes; categorical ones keep the point plot
+    use_density = overlay = False
+    numeric_axes = all(pd.api.types.is_numeric_dtype(df[c]) for c in (x_col, y_col))
+    if plot_type == "Scatter Plot" and numeric_axes:
+        use_density, overlay = density_controls("hue_scatter")
+
+    # Bars are drawn from per-group mean and standard error, capped to the most frequent x and hue values
+    fast_bars = plot_type == "Bar Plot" and pd.api.types.is_numeric_dtype(df[y_col])
+    top = bars.TOP_N
+    if fast_bars:
+        top = st.slider("Bars (most frequent x values; the rest are pooled as \"Other\")", 5, 50, bars.TOP_N)
+        n_x = distinct(x_col)
+        if n_x > bars.CARDINALITY_WARNING:
+            st.warning(f"⚠️ `{x_col}` has {n_x:,} distinct values; only the top {top} are drawn "
+                       f"and the other {n_x - top:,} are pooled into \"{bars.OTHER}\".")
+        n_hue = 0 if hue_col is None else distinct(hue_col)
+        if n_hue > bars.HUE_TOP_N:
+            st.warning(f"⚠️ `{hue_col}` has {n_hue:,} distinct values; the {bars.HUE_TOP_N} most frequent get "
+                       f"their own bars and the other {n_hue - bars.HUE_TOP_N:,} are pooled into \"{bars.OTHER}\".")
+
     if x_col and y_col:
         try:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            if plot_type == "Scatter Plot":
-                sns.scatterplot(data=df, x=x_col, y=y_col, hue=hue_col if hue_col else None, ax=ax)
-            else:
-                sns.barplot(data=df, x=x_col, y=y_col, hue=hue_col if hue_col else None, ax=ax)
-            ax.set_title(f'{plot_type} of {y_col} vs {x_col} grouped by {hue_col}')
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha="right")
-            st.pyplot(fig)
+            def draw_hue_plot():
+                fig, ax = plt.subplots(figsize=(10, 5))
+                try:
+                    if plot_type == "Scatter Plot" and use_density:
+                        draw_density(ax, x_col, y_col, hue_col, overlay)
+                    elif plot_type == "Scatter Plot":
+                        sns.scatterplot(data=df, x=x_col, y=y_col, hue=hue_col if hue_col else None, ax=ax)
+                    elif fast_bars:
+                        bars.plot(ax, bars.top_n(bar_stats(x_col, y_col, hue_col), top))
+                        ax.set_ylabel(f"{y_col} (mean ± 95% CI)")
+                    else:
+                        sns.barplot(data=df, x=x_col, y=y_col, hue=hue_col if hue_col else None, ax=ax)
+                    ax.set_title(f'{plot_type} of {y_col} vs {x_col} grouped by {hue_col}')
+                    ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha="right")
+                except Exception:
+                    plt.close(fig)
+                    raise
+                return fig
+
+            show_figure("hue_plot", {"type": plot_type, "x": x_col, "y": y_col, "hue": hue_col,
+                                     "density": use_density, "outliers": overlay, "top": top}, draw_hue_plot)
         except Exception as e:
             st.error(f"❌ Plotting failed: {e}")
+
+# Cache effectiveness
+st.sidebar.caption(figure_cache.describe())
+instrument.sidebar_panel()
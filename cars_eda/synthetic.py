@@ -0,0 +1,111 @@
+"""Synthetic used-car listings shaped like ``Cars.csv``.
+
+Rows carry the raw file's quirks: ``Mileage``/``Engine``/``Power`` as
+unit-suffixed strings (``"18.9 kmpl"``, ``"20.0 km/kg"``, ``"1197 CC"``,
+``"74 bhp"``), ``New_Price`` mostly empty, a few gaps in every other column
+and the odd ``Kilometers_Driven`` entry error. Used by the benchmarks so the
+pages can be measured well beyond the real file's 6k listings:
+
+    write_raw_csv("Cars.csv", 1_000_000)
+    write_cleaned_csv("Cars.csv", "Cars_cleaned.csv")
+"""
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+CHUNK_ROWS = 500_000
+
+# (brand, models, median price in lakh)
+CATALOG = [
+    ("Maruti", ["Swift", "Alto", "Wagon R", "Baleno", "Ertiga", "Ciaz", "Vitara"], 5.0),
+    ("Hyundai", ["i10", "i20", "Creta", "Verna", "Santro", "Xcent"], 6.0),
+    ("Honda", ["City", "Amaze", "Jazz", "Brio", "WR-V"], 7.0),
+    ("Toyota", ["Innova", "Fortuner", "Corolla", "Etios"], 12.0),
+    ("Mahindra", ["Scorpio", "XUV500", "Bolero", "Thar"], 8.5),
+    ("Ford", ["EcoSport", "Figo", "Endeavour"], 6.5),
+    ("Volkswagen", ["Polo", "Vento", "Jetta"], 5.5),
+    ("Tata", ["Nexon", "Tiago", "Indica"], 4.0),
+    ("Mercedes-Benz", ["C-Class", "E-Class", "GLA"], 28.0),
+    ("BMW", ["3", "5", "X1"], 26.0),
+    ("Audi", ["A4", "A6", "Q3"], 25.0),
+    ("Land Rover", ["Range Rover", "Discovery"], 45.0),
+]
+LOCATIONS = ["Mumbai", "Hyderabad", "Coimbatore", "Kochi", "Pune", "Delhi", "Kolkata", "Chennai",
+             "Jaipur", "Bangalore", "Ahmedabad"]
+FUEL_TYPES = ["Diesel", "Petrol", "CNG", "LPG", "Electric"]
+FUEL_WEIGHTS = [0.535, 0.454, 0.009, 0.0017, 0.0003]
+OWNER_TYPES = ["First", "Second", "Third", "Fourth & Above"]
+OWNER_WEIGHTS = [0.82, 0.16, 0.018, 0.002]
+COLOURS = ["White", "Others", "Black/Silver"]
+# Share of blanks per column, about as in the real file
+MISSING = {
+    "Location": 0.002, "Year": 0.0005, "Kilometers_Driven": 0.001, "Transmission": 0.005,
+    "Owner_Type": 0.003, "Mileage": 0.0005, "Engine": 0.003, "Power": 0.005, "Colour": 0.002,
+    "Seats": 0.001, "No. of Doors": 0.0002,
+}
+NEW_PRICE_RATE = 0.14
+
+
+def _format(values, fmt):
+    """``values`` as strings, each distinct value formatted once."""
+    codes, uniques = pd.factorize(values)
+    return np.array([fmt.format(v) for v in uniques], dtype=object)[codes]
+
+
+def raw_chunks(n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Yield raw-format DataFrames (strings with units, gaps as NaN) totalling ``n_rows`` listings."""
+    rng = np.random.default_rng(seed)
+    names = [f"{brand} {model}" for brand, models, _ in CATALOG for model in models]
+    base_price = np.array([price for _, models, price in CATALOG for _ in models])
+    for offset in range(0, n_rows, chunk_rows):
+        n = min(chunk_rows, n_rows - offset)
+        model = rng.integers(0, len(names), n)
+        year = rng.integers(1998, 2020, n)
+        age = 2020 - year
+        fuel = rng.choice(len(FUEL_TYPES), n, p=FUEL_WEIGHTS)
+        engine = np.round(rng.normal(1200 + 60 * base_price[model], 250, n).clip(624, 5998))
+        power = np.round(engine * rng.normal(0.075, 0.01, n), 1).clip(34)
+        mileage = np.round(rng.normal(25 - engine / 250, 3, n).clip(5, 33), 1)
+        kilometers = np.round(rng.gamma(2.0, 8000 * (age + 1), n)).clip(171)
+        # Entry errors the cleaner caps
+        kilometers[rng.random(n) < 1e-4] = 6_500_000
+        price = np.round(base_price[model] * np.exp(rng.normal(0, 0.35, n)) * 0.9 ** age, 2).clip(0.44)
+        new_price = np.where(rng.random(n) < NEW_PRICE_RATE, base_price[model] * 1.6, np.nan)
+
+        frame = pd.DataFrame({
+            "Name": np.array(names, dtype=object)[model],
+            "Location": np.array(LOCATIONS, dtype=object)[rng.integers(0, len(LOCATIONS), n)],
+            "Year": year.astype(float),
+            "Kilometers_Driven": kilometers,
+            "Fuel_Type": np.array(FUEL_TYPES, dtype=object)[fuel],
+            "Transmission": np.where(rng.random(n) < 0.29, "Automatic", "Manual").astype(object),
+            "Owner_Type": np.array(OWNER_TYPES, dtype=object)[rng.choice(len(OWNER_TYPES), n, p=OWNER_WEIGHTS)],
+            # CNG and LPG cars report km/kg
+            "Mileage": np.where(np.isin(fuel, [2, 3]), _format(mileage, "{} km/kg"), _format(mileage, "{} kmpl")),
+            "Engine": _format(engine.astype(int), "{} CC"),
+            "Power": _format(power, "{:g} bhp"),
+            "Colour": np.array(COLOURS, dtype=object)[rng.integers(0, len(COLOURS), n)],
+            "Seats": np.where(rng.random(n) < 0.15, 7.0, 5.0),
+            "No. of Doors": np.where(rng.random(n) < 0.12, 5.0, 4.0),
+            "New_Price": _format(np.round(new_price, 2), "{} Lakh"),
+            "Price": price,
+        }, columns=ingest.RAW_COLUMNS)
+        frame.loc[np.isnan(new_price), "New_Price"] = np.nan
+        for col, rate in MISSING.items():
+            frame.loc[rng.random(n) < rate, col] = np.nan
+        yield frame
+
+
+def write_raw_csv(path, n_rows, seed=0, **kwargs):
+    """Write a synthetic ``Cars.csv`` of ``n_rows`` listings to ``path``."""
+    for i, chunk in enumerate(raw_chunks(n_rows, seed=seed, **kwargs)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
+
+
+def write_cleaned_csv(raw_path, path):
+    """Run ``ingest`` over ``raw_path`` and write ``path`` from scratch."""
+    ingest.ingest(raw_path, path, rebuild=True)
+    return path
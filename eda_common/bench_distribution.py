@@ -0,0 +1,97 @@
+"""Histogram+KDE and boxplot: seaborn on raw rows vs. ``eda_common.distribution``.
+
+Times each path end to end (statistics + drawing + PNG render) on synthetic
+columns, and checks the binned FFT KDE against an exact Gaussian KDE.
+
+    python bench_distribution.py
+    python bench_distribution.py --rows 10000 100000 2000000
+"""
+
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from eda_common import distribution
+
+
+def synthetic_column(n_rows, seed=0):
+    """Skewed, bimodal column with outliers, rounded like the power readings."""
+    rng = np.random.default_rng(seed)
+    values = np.where(rng.random(n_rows) < 0.7, rng.gamma(2.0, 0.5, n_rows), rng.normal(4.0, 0.6, n_rows))
+    values[rng.random(n_rows) < 0.001] *= 5
+    return np.round(values, 3)
+
+
+def _render(fig):
+    fig.savefig(io.BytesIO(), format="png", dpi=100)
+    plt.close(fig)
+
+
+def seaborn_path(values):
+    fig, ax = plt.subplots()
+    sns.histplot(values, kde=True, ax=ax)
+    _render(fig)
+    fig, ax = plt.subplots()
+    sns.boxplot(x=values, ax=ax)
+    _render(fig)
+
+
+def numpy_path(values):
+    stats = distribution.column_stats(values)
+    fig, ax = plt.subplots()
+    distribution.plot_histogram(ax, stats)
+    _render(fig)
+    fig, ax = plt.subplots()
+    distribution.plot_boxplot(ax, stats)
+    _render(fig)
+
+
+def exact_kde(values, x, chunk=1_000_000):
+    """Direct Gaussian KDE with the same bandwidth, accumulated in chunks."""
+    bw = values.std(ddof=1) * len(values) ** (-1 / 5)
+    density = np.zeros_like(x)
+    step = max(1, chunk // len(x))
+    for start in range(0, len(values), step):
+        part = values[start:start + step]
+        density += np.exp(-0.5 * ((x[:, None] - part[None, :]) / bw) ** 2).sum(axis=1)
+    return density / (len(values) * bw * np.sqrt(2 * np.pi))
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--accuracy-rows", type=int, default=100_000,
+                        help="Rows for the exact-KDE comparison (it is O(rows x grid))")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'seaborn s':>12}{'numpy s':>10}{'speedup':>10}")
+    for n_rows in args.rows:
+        values = synthetic_column(n_rows)
+        numpy_path(values[:1000])  # warm up imports and font caches
+        slow = _timed(seaborn_path, values)
+        fast = _timed(numpy_path, values)
+        print(f"{n_rows:>10,}{slow:>12.2f}{fast:>10.3f}{slow / fast:>9.1f}x")
+
+    values = synthetic_column(args.accuracy_rows)
+    stats = distribution.column_stats(values)
+    exact = exact_kde(values, stats["kde_x"])
+    error = np.abs(stats["kde_y"] - exact).max() / exact.max()
+    print(f"\nKDE max abs error vs. exact ({args.accuracy_rows:,} rows, {len(exact)}-point grid): "
+          f"{error:.2e} of peak density")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Grouped bar charts from precomputed per-group moments.
+
+``sns.barplot`` on raw rows bootstraps a confidence interval for every
+bar. Here the groups are summarised once (count/mean/std, from a
+``CategoryIndex`` or a vectorised ``group_stats``), the interval is the
+analytic ``mean ± z * std / sqrt(count)``, x is capped to the ``top_n``
+most frequent categories (and hue to the ``hue_n`` most frequent levels)
+with the rest pooled into "Other", and only that small table is drawn.
+
+    stats = bars.top_n(bars.group_stats(df["Name"], df["Price"], df["Fuel_Type"]), 20)
+    bars.plot(ax, stats)
+"""
+
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+
+TOP_N = 20
+# With "Other", the hue levels drawn fill tab10's ten colours without repeats
+HUE_TOP_N = 9
+CARDINALITY_WARNING = 100
+Z_95 = 1.96
+OTHER = "Other"
+
+
+def _moments(codes, y, size):
+    ok = (codes >= 0) & ~np.isnan(y)
+    codes, y = codes[ok], y[ok]
+    n = np.bincount(codes, minlength=size)
+    shift = y.mean() if len(y) else 0.0  # keeps the sum of squares well conditioned
+    s = np.bincount(codes, weights=y - shift, minlength=size)
+    ss = np.bincount(codes, weights=(y - shift) ** 2, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n + shift
+        std = np.sqrt(np.clip((ss - s * s / n) / (n - 1), 0, None))
+    return n, mean, std
+
+
+def group_stats(x, y, hue=None):
+    """``count``/``mean``/``std`` of ``y`` per ``x`` (and ``hue``) value, observed groups only."""
+    x_codes, x_values = pd.factorize(pd.Series(x), sort=True)
+    y = pd.Series(y).to_numpy(dtype="float64", na_value=np.nan)
+    if hue is None:
+        n, mean, std = _moments(x_codes, y, len(x_values))
+        index = pd.Index(x_values, name=getattr(x, "name", None))
+    else:
+        h_codes, h_values = pd.factorize(pd.Series(hue), sort=True)
+        codes = np.where((x_codes >= 0) & (h_codes >= 0), x_codes * len(h_values) + h_codes, -1)
+        n, mean, std = _moments(codes, y, len(x_values) * len(h_values))
+        index = pd.MultiIndex.from_product([x_values, h_values],
+                                           names=[getattr(x, "name", None), getattr(hue, "name", None)])
+    frame = pd.DataFrame({"count": n, "mean": mean, "std": std}, index=index)
+    return frame[n > 0]
+
+
+def _pool(stats):
+    """Combine groups' count/mean/std into one (the parallel variance formula)."""
+    n = stats["count"].sum()
+    mean = (stats["count"] * stats["mean"]).sum() / n
+    within = ((stats["count"] - 1) * stats["std"].fillna(0) ** 2).sum()
+    between = (stats["count"] * (stats["mean"] - mean) ** 2).sum()
+    std = np.sqrt((within + between) / (n - 1)) if n > 1 else np.nan
+    return n, mean, std
+
+
+def _top_hues(stats, n):
+    """Keep the ``n`` hue levels with most rows, pooling the rest per x into ``OTHER``."""
+    by_hue = stats["count"].groupby(level=1, sort=False, observed=True).sum()
+    if len(by_hue) <= n:
+        return stats
+    keep = by_hue.sort_values(ascending=False, kind="stable").index[:n]
+    hues = stats.index.get_level_values(1)
+    kept = stats[hues.isin(keep)].rename(index=str, level=1)
+    rest = stats[~hues.isin(keep)]
+    pooled = {(x, OTHER): _pool(g) for x, g in rest.groupby(level=0, sort=False, observed=True)}
+    other = pd.DataFrame.from_dict(pooled, orient="index", columns=["count", "mean", "std"])
+    other.index = pd.MultiIndex.from_tuples(other.index, names=stats.index.names)
+    return pd.concat([kept, other])
+
+
+def top_n(stats, n=TOP_N, hue_n=HUE_TOP_N):
+    """Keep the ``n`` x categories with most rows, pool the rest into ``OTHER``.
+
+    ``stats`` is indexed by x, or by (x, hue); hue levels beyond the ``hue_n``
+    with most rows are pooled into ``OTHER`` within each x first. Rows come
+    back ordered by x count, with "Other" last; x labels (and pooled hue
+    labels) become strings.
+    """
+    if stats.index.nlevels > 1:
+        stats = _top_hues(stats, hue_n)
+    by_x = stats["count"].groupby(level=0, sort=False, observed=True).sum().sort_values(ascending=False, kind="stable")
+    keep = by_x.index[:n]
+    kept = stats[stats.index.get_level_values(0).isin(keep)]
+    rest = stats[~stats.index.get_level_values(0).isin(keep)]
+    order = {label: i for i, label in enumerate(keep)}
+    kept = kept.iloc[np.argsort([order[x] for x in kept.index.get_level_values(0)], kind="stable")]
+    kept = kept.rename(index=str, level=0) if kept.index.nlevels > 1 else kept.rename(index=str)
+    if rest.empty:
+        return kept
+    if stats.index.nlevels > 1:
+        pooled = {(OTHER, h): _pool(g) for h, g in rest.groupby(level=1, sort=True, observed=True)}
+    else:
+        pooled = {OTHER: _pool(rest)}
+    other = pd.DataFrame.from_dict(pooled, orient="index", columns=["count", "mean", "std"])
+    if stats.index.nlevels > 1:
+        other.index = pd.MultiIndex.from_tuples(other.index, names=stats.index.names)
+    else:
+        other.index.name = stats.index.name
+    return pd.concat([kept, other])
+
+
+def intervals(stats, z=Z_95):
+    """Half-widths of the normal-approximation interval of each mean."""
+    return z * stats["std"].fillna(0) / np.sqrt(stats["count"])
+
+
+def _colors(palette, n):
+    colors = colormaps[palette].colors
+    return [colors[i % len(colors)] for i in range(n)]
+
+
+def plot(ax, stats, z=Z_95, palette="tab10"):
+    """Draw the (top-N) summary as grouped bars with analytic error bars."""
+    err = intervals(stats, z)
+    if stats.index.nlevels == 1:
+        positions = np.arange(len(stats))
+        ax.bar(positions, stats["mean"], yerr=err, capsize=2,
+               color=_colors(palette, 1)[0], error_kw={"elinewidth": 1})
+        labels = stats.index
+    else:
+        labels = stats.index.get_level_values(0).unique()
+        hues = stats.index.get_level_values(1).unique()
+        hues = [h for h in hues if h != OTHER] + [h for h in hues if h == OTHER]
+        width = 0.8 / len(hues)
+        x_pos = {label: i for i, label in enumerate(labels)}
+        for j, (hue, color) in enumerate(zip(hues, _colors(palette, len(hues)))):
+            part = stats.xs(hue, level=1)
+            at = np.array([x_pos[x] for x in part.index]) - 0.4 + width * (j + 0.5)
+            ax.bar(at, part["mean"], width=width, yerr=err.xs(hue, level=1), capsize=2,
+                   color=color, label=str(hue), error_kw={"elinewidth": 1})
+        ax.legend(title=stats.index.names[1], fontsize="small")
+    ax.set_xticks(np.arange(len(labels)), [str(label) for label in labels])
+    ax.set_xlabel(stats.index.names[0])
+    return ax
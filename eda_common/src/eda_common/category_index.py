@@ -0,0 +1,156 @@
+"""Per-category counts and moments, built once from categorical codes.
+
+For every categorical column the index keeps, per category, the row count
+and for every numeric column the non-null count, sum and sum of squares
+(one ``np.bincount`` each). Category pairs are indexed the same way on a
+combined code the first time they are asked for. Breakdowns such as
+``value_counts()``, ``groupby(col)[value].mean()`` or a crosstab are then
+O(categories) instead of O(rows).
+
+Grouped boxplots additionally need each category's values in sorted order;
+those are built per ``(category, value)`` column on first use (one lexsort)
+and kept, after which each box is read off by position.
+
+    index = CategoryIndex(df)
+    index.counts("Fuel_Type")                      # like value_counts()
+    index.group_stats("Company_Name", "Price")     # count / mean / std
+    labels, boxes = index.box_stats("Fuel_Type", "Price")
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from eda_common import distribution
+
+MAX_SORTED = 16
+
+
+class CategoryIndex:
+    """Counts, sums and sums of squares per category and category pair."""
+
+    def __init__(self, df, categorical=None, values=None):
+        if categorical is None:
+            categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+        if values is None:
+            values = [col for col in df.columns
+                      if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+        self.n_rows = len(df)
+        self._categories = {col: df[col].cat.categories for col in categorical}
+        self._codes = {col: df[col].cat.codes.to_numpy().astype(np.int64) for col in categorical}
+        self._values = {col: df[col].to_numpy(dtype="float64", na_value=np.nan) for col in values}
+        # Moments are accumulated around each column's mean so sum of squares stays well conditioned
+        self._shift = {col: float(np.nanmean(v)) if len(v) and not np.isnan(v).all() else 0.0
+                       for col, v in self._values.items()}
+        self._single = {col: self._accumulate(codes, len(self._categories[col]))
+                        for col, codes in self._codes.items()}
+        self._pairs = {}
+        self._sorted = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def categorical(self):
+        return list(self._codes)
+
+    @property
+    def values(self):
+        return list(self._values)
+
+    def _accumulate(self, codes, size):
+        valid = codes >= 0
+        codes = codes[valid]
+        stats = {"rows": np.bincount(codes, minlength=size)}
+        for col, values in self._values.items():
+            x = values[valid] - self._shift[col]
+            present = ~np.isnan(x)
+            x = np.where(present, x, 0.0)
+            stats[col] = (
+                np.bincount(codes, weights=present, minlength=size),
+                np.bincount(codes, weights=x, minlength=size),
+                np.bincount(codes, weights=x * x, minlength=size),
+            )
+        return stats
+
+    def _pair(self, a, b):
+        key = (a, b)
+        with self._lock:
+            stats = self._pairs.get(key)
+        if stats is None:
+            n_b = len(self._categories[b])
+            codes_a, codes_b = self._codes[a], self._codes[b]
+            codes = np.where((codes_a >= 0) & (codes_b >= 0), codes_a * n_b + codes_b, -1)
+            stats = self._accumulate(codes, len(self._categories[a]) * n_b)
+            with self._lock:
+                self._pairs[key] = stats
+        return stats
+
+    def _moments(self, stats, value):
+        n, s, ss = stats[value]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s / n + self._shift[value]
+            var = (ss - s * s / n) / (n - 1)
+        return n, mean, np.sqrt(np.clip(var, 0, None))
+
+    def counts(self, col):
+        """Rows per observed category, most frequent first (like ``value_counts()``)."""
+        rows = self._single[col]["rows"]
+        series = pd.Series(rows, index=self._categories[col], name="count")
+        series.index.name = col
+        return series[rows > 0].sort_values(ascending=False, kind="stable")
+
+    def nunique(self, col):
+        return int(np.count_nonzero(self._single[col]["rows"]))
+
+    def group_stats(self, col, value):
+        """``count``/``mean``/``std`` of ``value`` per observed category of ``col``."""
+        n, mean, std = self._moments(self._single[col], value)
+        frame = pd.DataFrame({"count": n.astype(np.int64), "mean": mean, "std": std},
+                             index=self._categories[col])
+        frame.index.name = col
+        return frame[n > 0]
+
+    def pair_counts(self, a, b):
+        """Crosstab of ``a`` x ``b`` (observed categories only)."""
+        rows = self._pair(a, b)["rows"].reshape(len(self._categories[a]), -1)
+        table = pd.DataFrame(rows, index=self._categories[a], columns=self._categories[b])
+        table.index.name, table.columns.name = a, b
+        return table.loc[rows.sum(axis=1) > 0, rows.sum(axis=0) > 0]
+
+    def pair_stats(self, a, b, value):
+        """``count``/``mean``/``std`` of ``value`` per observed ``(a, b)`` pair."""
+        n, mean, std = self._moments(self._pair(a, b), value)
+        index = pd.MultiIndex.from_product([self._categories[a], self._categories[b]], names=[a, b])
+        frame = pd.DataFrame({"count": n.astype(np.int64), "mean": mean, "std": std}, index=index)
+        return frame[n > 0]
+
+    def _sorted_groups(self, col, value):
+        key = (col, value)
+        with self._lock:
+            if key in self._sorted:
+                self._sorted.move_to_end(key)
+                return self._sorted[key]
+        codes, values = self._codes[col], self._values[value]
+        keep = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[keep], values[keep]
+        order = np.lexsort((values, codes))
+        n = self._single[col][value][0].astype(np.int64)
+        groups = (values[order], np.concatenate([[0], np.cumsum(n)]))
+        with self._lock:
+            self._sorted[key] = groups
+            while len(self._sorted) > MAX_SORTED:
+                self._sorted.popitem(last=False)
+        return groups
+
+    def box_stats(self, col, value):
+        """Category labels and ``Axes.bxp`` statistics of ``value`` per category of ``col``."""
+        values, offsets = self._sorted_groups(col, value)
+        _, means, _ = self._moments(self._single[col], value)
+        labels, boxes = [], []
+        for i, label in enumerate(self._categories[col]):
+            group = values[offsets[i]:offsets[i + 1]]
+            if len(group):
+                labels.append(label)
+                boxes.append(dict(distribution.sorted_box_stats(group, means[i]), label=str(label)))
+        return labels, boxes
@@ -0,0 +1,108 @@
+"""Mergeable sufficient statistics for Pearson correlation matrices.
+
+One pass over the rows (in chunks, as a few matrix products) accumulates,
+for every pair of numeric columns over the rows where *both* are present:
+the pair count, each column's sum and sum of squares, and the sum of
+cross-products. Any subset of columns is then a ``k x k`` slice with no
+further data pass, matching ``DataFrame.corr()``'s pairwise-complete NaN
+handling. Statistics from separate chunks, partitions or newly appended
+rows are combined with ``merge``.
+
+    stats = CorrelationStats.from_frame(df)
+    stats.corr(["Price", "Year", "Power_value"])
+    stats.merge(CorrelationStats.from_frame(new_rows))
+"""
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 250_000
+
+
+def numeric_columns(df):
+    """The columns ``df.select_dtypes(include="number")`` would pick."""
+    return df.select_dtypes(include="number").columns.tolist()
+
+
+class CorrelationStats:
+    """Pairwise-complete count, sum, sum-of-squares and cross-product matrices.
+
+    Entry ``[i, j]`` of ``sums``/``squares`` is over column ``i`` restricted
+    to rows where column ``j`` is present. Values are accumulated relative to
+    a per-column ``shift`` (the first chunk's means) so the products stay
+    well conditioned; ``merge`` re-expresses the other side's shift first.
+    """
+
+    def __init__(self, columns, shift=None):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.shift = np.zeros(k) if shift is None else np.asarray(shift, dtype="float64")
+        self.counts = np.zeros((k, k))
+        self.sums = np.zeros((k, k))
+        self.squares = np.zeros((k, k))
+        self.products = np.zeros((k, k))
+        self._started = shift is not None
+
+    @classmethod
+    def from_frame(cls, df, columns=None, chunk_rows=CHUNK_ROWS):
+        stats = cls(numeric_columns(df) if columns is None else columns)
+        for start in range(0, len(df), chunk_rows):
+            stats.update(df.iloc[start:start + chunk_rows])
+        return stats
+
+    def update(self, chunk):
+        """Fold the rows of ``chunk`` (a frame holding ``columns``) in."""
+        x = np.column_stack([chunk[col].to_numpy(dtype="float64", na_value=np.nan) for col in self.columns]) \
+            if self.columns else np.empty((len(chunk), 0))
+        present = ~np.isnan(x)
+        if not self._started:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(np.where(present, x, np.nan), axis=0)) if len(x) else self.shift
+            self._started = True
+        x = np.where(present, x - self.shift, 0.0)
+        mask = present.astype("float64")
+        self.counts += mask.T @ mask
+        self.sums += x.T @ mask
+        self.squares += (x * x).T @ mask
+        self.products += x.T @ x
+        return self
+
+    def _reshifted(self, shift):
+        """(sums, squares, products) with values measured from ``shift`` instead."""
+        d = self.shift - shift  # x - shift = (x - self.shift) + d
+        n, s = self.counts, self.sums
+        sums = s + d[:, None] * n
+        squares = self.squares + 2 * d[:, None] * s + (d ** 2)[:, None] * n
+        products = self.products + d[:, None] * s.T + d[None, :] * s + np.outer(d, d) * n
+        return sums, squares, products
+
+    def merge(self, other):
+        """Add ``other``'s rows (same columns) into this object."""
+        if other.columns != self.columns:
+            raise ValueError("Can only merge correlation statistics over the same columns")
+        if not self._started:
+            self.shift = other.shift.copy()
+            self._started = other._started
+        sums, squares, products = other._reshifted(self.shift)
+        self.counts += other.counts
+        self.sums += sums
+        self.squares += squares
+        self.products += products
+        return self
+
+    def corr(self, columns=None):
+        """Pearson correlation of ``columns`` (default all), like ``DataFrame.corr()``."""
+        columns = self.columns if columns is None else list(columns)
+        pos = [self.columns.index(col) for col in columns]
+        ix = np.ix_(pos, pos)
+        n, s, q, p = self.counts[ix], self.sums[ix], self.squares[ix], self.products[ix]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * p - s * s.T
+            var_i = n * q - s * s
+            r = cov / np.sqrt(var_i * var_i.T)
+        r = np.clip(r, -1, 1)
+        # Constant columns and pairs without overlap are undefined, as in pandas
+        r[(n < 2) | (var_i <= 0) | (var_i.T <= 0)] = np.nan
+        diag = np.diag_indices(len(pos))
+        r[diag] = np.where(np.isnan(r[diag]), np.nan, 1.0)
+        return pd.DataFrame(r, index=columns, columns=columns)
@@ -0,0 +1,144 @@
+"""Scatter plots drawn as a 2D density raster instead of one marker per row.
+
+Points are binned onto a ``bins x bins`` grid with one ``np.bincount``:
+
+- no hue: counts per cell, shown on a log colour scale
+- categorical hue: counts per cell and category (the ``MAX_HUES - 1`` most
+  frequent, the rest pooled as "Other"), blended into one colour per cell
+  weighted by share, with opacity following the total count
+- numeric hue: the mean hue per cell on a colormap
+
+The whole plot is then a single ``imshow``. Isolated points, those in cells
+holding at most ``OUTLIER_CELL_COUNT`` rows, can be drawn exactly on top.
+
+    r = density.raster(x, y, hue=df["Fuel_Type"])
+    density.plot_raster(ax, r)
+    idx = density.outliers(r)
+    ax.scatter(x[idx], y[idx], s=4)
+"""
+
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.colors import LogNorm, to_rgb
+from matplotlib.patches import Patch
+
+DENSITY_THRESHOLD = 10_000
+BINS = 300
+MAX_HUES = 10
+OUTLIER_CELL_COUNT = 2
+MAX_OUTLIERS = 2_000
+
+
+def use_density(n_rows, mode="Auto", threshold=DENSITY_THRESHOLD):
+    """Whether to rasterise: ``mode`` is "Auto", "Points" or "Density"."""
+    return mode == "Density" or (mode == "Auto" and n_rows > threshold)
+
+
+def _extent(values):
+    """``(lo, hi)`` of finite ``values``, widened when flat; ``(0, 1)`` when there are none."""
+    if len(values) == 0:
+        return 0.0, 1.0
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return float(lo), float(hi)
+
+
+def _hue_codes(hue, keep):
+    """Codes for the ``keep - 1`` most frequent hue values, the rest as "Other"."""
+    codes, uniques = pd.factorize(hue, sort=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if len(uniques) <= keep:
+        return codes, [str(u) for u in uniques]
+    top = np.sort(np.argsort(counts, kind="stable")[::-1][:keep - 1])
+    remap = np.full(len(uniques), keep - 1)
+    remap[top] = np.arange(keep - 1)
+    return np.where(codes >= 0, remap[np.maximum(codes, 0)], -1), [str(uniques[i]) for i in top] + ["Other"]
+
+
+def raster(x, y, hue=None, bins=BINS, max_hues=MAX_HUES):
+    """Bin ``x``/``y`` (and optionally ``hue``) onto a ``bins x bins`` grid.
+
+    Rows with missing coordinates (or a missing categorical hue) are skipped;
+    with none left the raster is empty (all counts zero, unit extent).
+    Returns a dict with ``counts`` (``bins x bins``, rows are y), ``extent``,
+    and for a hue either ``hue_counts``/``labels`` or ``hue_mean``.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    keep = np.isfinite(x) & np.isfinite(y)
+    x0, x1 = _extent(x[keep])
+    y0, y1 = _extent(y[keep])
+    with np.errstate(invalid="ignore"):  # missing coordinates cast to garbage; masked out below
+        col = np.clip(((x - x0) / (x1 - x0) * bins).astype(np.int64, copy=False), 0, bins - 1)
+        row = np.clip(((y - y0) / (y1 - y0) * bins).astype(np.int64, copy=False), 0, bins - 1)
+    cell = np.where(keep, row * bins + col, -1)
+
+    result = {"extent": (x0, x1, y0, y1), "bins": bins, "cell": cell, "n": int(keep.sum())}
+    valid = cell >= 0
+    counts = np.bincount(cell[valid], minlength=bins * bins)
+    result["counts"] = counts.reshape(bins, bins)
+    if hue is None:
+        return result
+
+    hue = pd.Series(hue)
+    if pd.api.types.is_numeric_dtype(hue) and not pd.api.types.is_bool_dtype(hue):
+        h = hue.to_numpy(dtype="float64", na_value=np.nan)
+        ok = valid & ~np.isnan(h)
+        n = np.bincount(cell[ok], minlength=bins * bins)
+        s = np.bincount(cell[ok], weights=h[ok], minlength=bins * bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result["hue_mean"] = (s / n).reshape(bins, bins)
+        result["hue_range"] = _extent(h[ok])
+        return result
+
+    codes, labels = _hue_codes(hue.to_numpy(), max_hues)
+    ok = valid & (codes >= 0)
+    per_hue = np.bincount(codes[ok] * (bins * bins) + cell[ok], minlength=len(labels) * bins * bins)
+    result["hue_counts"] = per_hue.reshape(len(labels), bins, bins)
+    result["labels"] = labels
+    return result
+
+
+def _opacity(counts):
+    """0 for empty cells, then log-scaled from 0.35 up to 1 at the densest cell."""
+    top = counts.max()
+    if top <= 1:
+        return (counts > 0).astype("float64")
+    return np.where(counts > 0, 0.35 + 0.65 * np.log(np.maximum(counts, 1)) / np.log(top), 0.0)
+
+
+def plot_raster(ax, r, cmap="viridis", palette=None):
+    """Draw a ``raster()`` result on ``ax`` as a single image; returns the image."""
+    imshow = {"extent": r["extent"], "origin": "lower", "aspect": "auto", "interpolation": "nearest"}
+    counts = r["counts"]
+    if "hue_counts" in r:
+        hue_counts = r["hue_counts"]
+        colors = np.array([to_rgb(c) for c in (palette or colormaps["tab10"].colors)[:len(r["labels"])]]).reshape(-1, 3)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = hue_counts / counts
+        rgb = np.nan_to_num(np.einsum("khw,kc->hwc", share, colors))
+        image = ax.imshow(np.dstack([rgb, _opacity(counts)]), **imshow)
+        ax.legend(handles=[Patch(color=c, label=label) for c, label in zip(colors, r["labels"])],
+                  fontsize="small", loc="best")
+        return image
+    if "hue_mean" in r:
+        lo, hi = r["hue_range"]
+        shaded = colormaps[cmap]((r["hue_mean"] - lo) / ((hi - lo) or 1.0))
+        shaded[..., 3] = _opacity(counts)
+        return ax.imshow(shaded, **imshow)
+    masked = np.ma.masked_equal(counts, 0)
+    image = ax.imshow(masked, cmap=cmap, norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), **imshow)
+    ax.figure.colorbar(image, ax=ax, label="Rows per cell")
+    return image
+
+
+def outliers(r, max_cell=OUTLIER_CELL_COUNT, max_points=MAX_OUTLIERS, seed=0):
+    """Row positions in sparse cells (at most ``max_cell`` rows), sampled to ``max_points``."""
+    cell = r["cell"]
+    sparse = np.flatnonzero(r["counts"].ravel() <= max_cell)
+    rows = np.flatnonzero(np.isin(cell, sparse) & (cell >= 0))
+    if len(rows) > max_points:
+        rows = np.sort(np.random.default_rng(seed).choice(rows, max_points, replace=False))
+    return rows
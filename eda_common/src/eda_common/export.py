@@ -0,0 +1,216 @@
+"""Lazy, chunked export of a frame to CSV, gzip CSV or Parquet.
+
+Nothing is encoded until a page asks for a file. The frame is then written
+in row chunks straight to disk (optionally restricted to some columns and
+a half-open ``[lo, hi)`` range of one column) and the file is kept under
+``cache_dir``, named after the dataset version and the export options, so
+the same download is served again without re-encoding. When a new file is
+written, files from other dataset versions are removed and at most
+``KEEP_FILES`` option combinations of the current one are kept.
+
+    path = export.export_file(df, version, "CSV (gzip)", ".cache", "cleaned",
+                              columns=["DateTime", "Voltage"],
+                              where=("DateTime", lo, hi))
+    st.download_button("Download", export.read_bytes(path), file_name=path.name,
+                       mime=export.FORMATS["CSV (gzip)"].mime)
+
+A path names one version and set of options and its content never
+changes, so ``read_bytes`` keeps the bytes of the last few files served
+rather than reading the file on every rerun.
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from eda_common import instrument
+
+CHUNK_ROWS = 250_000
+# Exports kept per stem; the oldest are removed when a new one is written
+KEEP_FILES = 8
+# Files whose bytes read_bytes keeps in memory (a download button holds one per page)
+CACHED_READS = 2
+
+
+class Format(NamedTuple):
+    suffix: str
+    mime: str
+
+
+FORMATS = {
+    "CSV": Format(".csv", "text/csv"),
+    "CSV (gzip)": Format(".csv.gz", "application/gzip"),
+    "Parquet": Format(".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _has_pyarrow():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def available_formats():
+    """Format names usable here; Parquet needs pyarrow."""
+    return [name for name in FORMATS if name != "Parquet" or _has_pyarrow()]
+
+
+def iter_chunks(df, columns=None, where=None, chunk_rows=CHUNK_ROWS):
+    """Row chunks of ``df[columns]`` with ``where[1] <= df[where[0]] < where[2]``.
+
+    Categoricals come out as plain strings so every chunk has the same
+    schema regardless of which categories it happens to contain. At least
+    one (possibly empty) chunk is always yielded, so writers emit a header.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    indexer = df.columns.get_indexer(columns)
+    categorical = {col: object for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)}
+    yielded = False
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows, indexer]
+        if where is not None:
+            column, lo, hi = where
+            values = df[column].iloc[start:start + chunk_rows]
+            chunk = chunk[((values >= lo) & (values < hi)).to_numpy()]
+        if len(chunk) == 0 and (yielded or start + chunk_rows < len(df)):
+            continue
+        yielded = True
+        yield chunk.astype(categorical) if categorical else chunk
+
+
+def _whole_seconds(df, columns):
+    """Datetime columns with no sub-second part, written without the ``.000000000``."""
+    return [col for col in columns if pd.api.types.is_datetime64_any_dtype(df[col])
+            and not (df[col].dropna().to_numpy().view("int64") % 10**9).any()]
+
+
+def _write_csv(chunks, stream, seconds=()):
+    if _has_pyarrow():
+        import pyarrow as pa
+        from pyarrow import csv
+
+        writer = schema = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                for col in seconds:
+                    i = schema.get_field_index(col)
+                    schema = schema.set(i, schema.field(i).with_type(pa.timestamp("s")))
+                writer = csv.CSVWriter(stream, schema)
+            writer.write_table(table.cast(schema))
+        writer.close()
+        return
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(text, header=i == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write(df, path, fmt, columns=None, where=None, chunk_rows=CHUNK_ROWS):
+    """Stream ``df`` to ``path`` in format ``fmt`` (a ``FORMATS`` key)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(FORMATS)}")
+    columns = list(df.columns) if columns is None else list(columns)
+    chunks = iter_chunks(df, columns, where, chunk_rows)
+    if fmt == "Parquet":
+        if not _has_pyarrow():
+            raise ImportError("Parquet export needs pyarrow")
+        _write_parquet(chunks, path)
+        return
+    with open(path, "wb") as raw:
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) if fmt == "CSV (gzip)" else raw
+        _write_csv(chunks, stream, _whole_seconds(df, columns))
+        if stream is not raw:
+            stream.close()
+
+
+def export_key(version, fmt, columns=None, where=None):
+    """Short hash identifying an export of one dataset version."""
+    return hashlib.sha1(repr((version, fmt, columns and list(columns), where)).encode()).hexdigest()[:12]
+
+
+def export_path(version, fmt, cache_dir, stem, columns=None, where=None):
+    """Where ``export_file`` keeps this export; it exists once it has been written."""
+    return Path(cache_dir) / f"{stem}.export.{version}.{export_key(version, fmt, columns, where)}{FORMATS[fmt].suffix}"
+
+
+def export_file(df, version, fmt, cache_dir, stem, columns=None, where=None, chunk_rows=CHUNK_ROWS):
+    """Path of the cached export, writing it first if this combination is new."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = export_path(version, fmt, cache_dir, stem, columns, where)
+    if path.exists():
+        return path
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        write(df, tmp, fmt, columns, where, chunk_rows)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    _prune(cache_dir, stem, version)
+    return path
+
+
+def _prune(cache_dir, stem, version, keep=KEEP_FILES):
+    """Remove other versions' exports of ``stem`` and all but the ``keep`` newest of ``version``."""
+    current = []
+    for old in cache_dir.glob(f"{stem}.export.*"):
+        if old.name.endswith(".tmp"):
+            continue
+        if old.name.startswith(f"{stem}.export.{version}."):
+            current.append(old)
+        else:
+            old.unlink(missing_ok=True)
+    current.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in current[keep:]:
+        old.unlink(missing_ok=True)
+
+
+_reads = OrderedDict()
+_reads_lock = threading.Lock()
+
+
+def read_bytes(path):
+    """Bytes of an export file, read from disk once per path.
+
+    The ``CACHED_READS`` most recently used files stay in memory, shared by
+    every session.
+    """
+    key = str(path)
+    with _reads_lock:
+        data = _reads.get(key)
+        if data is not None:
+            _reads.move_to_end(key)
+    instrument.count_cache("export.read_bytes", data is not None)
+    if data is None:
+        data = Path(path).read_bytes()
+        with _reads_lock:
+            _reads[key] = data
+            while len(_reads) > CACHED_READS:
+                _reads.popitem(last=False)
+    return data
@@ -0,0 +1,137 @@
+"""Server-side cache of rendered matplotlib/seaborn figures.
+
+Pages describe a chart as ``(dataset version, chart type, parameters)`` plus
+a ``draw`` callable that builds the figure. On a miss the figure is drawn,
+rendered to PNG, closed, and the bytes are kept; on a hit nothing is drawn.
+Entries are evicted least-recently-used once the total size passes
+``max_bytes``.
+
+    png = figure_cache.render(("v1", "histogram", {"col": "Price"}), draw)
+    st.image(png, use_container_width=True)
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+from eda_common import instrument
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+# Same output settings as st.pyplot, so cached images look identical
+SAVE_KWARGS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+
+def _freeze(value):
+    """Turn parameter containers into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    return value
+
+
+class FigureCache:
+    """Thread-safe LRU of PNG bytes with a total size cap.
+
+    Streamlit runs each session in its own thread, so all bookkeeping happens
+    under a lock. Rendering happens outside it; two sessions missing on the
+    same key at once both draw, and the second store wins.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        key = _freeze(key)
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        key = _freeze(key)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= len(old)
+            if len(png) > self.max_bytes:
+                return
+            self._entries[key] = png
+            self._nbytes += len(png)
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= len(evicted)
+                self.evictions += 1
+
+    def render(self, key, draw):
+        """Return PNG bytes for ``key``, calling ``draw()`` only on a miss.
+
+        ``draw`` must return a matplotlib Figure; it is always closed after
+        rendering, even if saving fails.
+        """
+        png = self.get(key)
+        instrument.count_cache("figure_cache", hit=png is not None)
+        if png is not None:
+            return png
+        # Keys are (version, chart, params) by convention; name the span after the chart
+        label = f"figure:{key[1]}" if isinstance(key, tuple) and len(key) > 1 else "figure"
+        with instrument.span(label, "render"):
+            fig = draw()
+            try:
+                buf = io.BytesIO()
+                fig.savefig(buf, **SAVE_KWARGS)
+            finally:
+                plt.close(fig)
+        png = buf.getvalue()
+        self.put(key, png)
+        return png
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide instance shared by every page and session
+_default = FigureCache()
+
+
+def render(key, draw):
+    return _default.render(key, draw)
+
+
+def stats():
+    return _default.stats()
+
+
+def describe():
+    """One-line summary for a sidebar caption."""
+    s = stats()
+    return (f"Figure cache: {s['hits']} hits / {s['misses']} misses "
+            f"({s['hit_rate']:.0%}), {s['entries']} figures, {s['bytes'] / 2**20:.1f} MB")
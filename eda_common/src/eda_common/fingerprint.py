@@ -0,0 +1,16 @@
+"""Cheap version strings for data files."""
+
+import hashlib
+import os
+
+
+def file_version(*paths):
+    """Short hash of the size and mtime of ``paths``.
+
+    Changes whenever any of the files is rewritten, without reading them.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        st = os.stat(path)
+        digest.update(f"{os.fspath(path)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
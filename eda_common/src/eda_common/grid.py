@@ -0,0 +1,202 @@
+"""Server-side pagination for large frames.
+
+Only the visible page is ever materialised: sorting works on a cached
+argsort per ``(dataset version, column, direction)``, filters produce a
+boolean mask, and the page is a positional ``iloc`` window into the
+original frame. Without sort or filters the window is a plain slice.
+
+    page, n_rows = grid.window(df, columns, page=3, page_size=100,
+                               sort="Voltage", ascending=False,
+                               predicates=[("Days", "==", "Sunday")], version=v)
+
+``explorer`` draws the Column Explorer (column picker, sort, filters, page
+number) around ``window`` for a Streamlit page:
+
+    with st.expander("Column Explorer"):
+        grid.explorer(df, version=v)
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from eda_common import instrument
+
+OPERATORS = ("==", "!=", ">", ">=", "<", "<=", "contains")
+PAGE_SIZES = (25, 50, 100, 500)
+MAX_CACHED_ORDERS = 32
+
+
+def _sort_key(series):
+    """Numeric key whose ascending order matches the column's; NaN for missing.
+
+    Ordered categoricals sort in category order, as ``filter_mask`` compares
+    them; unordered ones by their labels.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        if series.cat.ordered:
+            return np.where(codes >= 0, codes, np.nan)
+        categories = series.cat.categories
+        rank = np.empty(len(categories), dtype="float64")
+        rank[np.argsort(categories.to_numpy(), kind="stable")] = np.arange(len(categories))
+        return np.where(codes >= 0, rank[codes], np.nan)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy()
+        return np.where(np.isnat(values), np.nan, values.view("int64").astype("float64"))
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    codes, _ = pd.factorize(series, sort=True)
+    return np.where(codes >= 0, codes, np.nan).astype("float64")
+
+
+def argsort(series, ascending=True):
+    """Stable row order for ``series``, missing values last in both directions."""
+    key = _sort_key(series)
+    if not ascending:
+        key = -key
+    return np.argsort(key, kind="stable")
+
+
+class OrderCache:
+    """LRU of argsort arrays keyed on ``(version, column, ascending)``."""
+
+    def __init__(self, max_entries=MAX_CACHED_ORDERS):
+        self.max_entries = max_entries
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, series, ascending=True):
+        key = (version, series.name, ascending)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+                return order
+        order = argsort(series, ascending)
+        with self._lock:
+            self._orders[key] = order
+            while len(self._orders) > self.max_entries:
+                self._orders.popitem(last=False)
+        return order
+
+
+_orders = OrderCache()
+
+
+def parse_value(series, text):
+    """Convert filter input ``text`` to something comparable with ``series``."""
+    if pd.api.types.is_bool_dtype(series):
+        return text.strip().lower() in ("1", "true", "yes")
+    if pd.api.types.is_numeric_dtype(series):
+        return float(text)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(text)
+    return text
+
+
+def filter_mask(df, predicates):
+    """AND of ``(column, operator, value)`` predicates, or ``None`` if there are none.
+
+    Raises ``ValueError`` for a value that doesn't fit the column or an
+    ordering comparison on an unordered categorical.
+    """
+    mask = None
+    for column, op, text in predicates:
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator {op!r}")
+        series = df[column]
+        if op == "contains":
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Match against the categories once, then look codes up
+                hits = series.cat.categories.astype(str).str.contains(str(text), case=False, regex=False)
+                codes = series.cat.codes.to_numpy()
+                part = np.append(hits, False)[np.where(codes >= 0, codes, len(hits))]
+            else:
+                part = series.astype(str).str.contains(str(text), case=False, regex=False).to_numpy()
+        else:
+            try:
+                value = parse_value(series, text)
+                part = {
+                    "==": series.__eq__, "!=": series.__ne__, ">": series.__gt__,
+                    ">=": series.__ge__, "<": series.__lt__, "<=": series.__le__,
+                }[op](value).to_numpy(dtype=bool)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Can't compare {column} {op} {text!r}: {exc}") from exc
+        mask = part if mask is None else mask & part
+    return mask
+
+
+def n_pages(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def window(df, columns, page=1, page_size=PAGE_SIZES[1], sort=None, ascending=True,
+           predicates=(), *, version):
+    """Rows for page ``page`` (1-based) and the number of matching rows.
+
+    ``version`` keys the cached sort order together with the column name, so
+    it has to identify ``df`` itself (dataset version, plus any filters that
+    narrowed it); an edited file or another selection never reuses a stale order.
+    """
+    mask = filter_mask(df, predicates)
+    positions = None
+    if sort is not None:
+        positions = _orders.get(version, df[sort], ascending)
+        if mask is not None:
+            positions = positions[mask[positions]]
+    elif mask is not None:
+        positions = np.flatnonzero(mask)
+
+    n_rows = len(df) if positions is None else len(positions)
+    start = (min(page, n_pages(n_rows, page_size)) - 1) * page_size
+    stop = min(start + page_size, n_rows)
+    rows = slice(start, stop) if positions is None else positions[start:stop]
+    # Select rows and columns in one positional take; df[columns] alone would copy every row
+    return df.iloc[rows, df.columns.get_indexer(columns)], n_rows
+
+
+def explorer(df, version):
+    """Draw the Column Explorer for ``df`` on the current Streamlit page.
+
+    Columns, sort, up to three filters and the page number are widgets; only
+    the requested window is sent to the browser. ``version`` is passed to
+    ``window``.
+    """
+    import streamlit as st
+
+    columns = df.columns.tolist()
+    selected_cols = st.multiselect("Choose columns to view", columns, default=columns)
+
+    c1, c2, c3 = st.columns(3)
+    sort_col = c1.selectbox("Sort by", ["(none)"] + columns)
+    ascending = c2.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+    page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+    predicates = []
+    for i in range(st.number_input("Filters", min_value=0, max_value=3, value=0)):
+        f1, f2, f3 = st.columns(3)
+        predicates.append((
+            f1.selectbox("Column", columns, key=f"filter_col_{i}"),
+            f2.selectbox("Operator", OPERATORS, key=f"filter_op_{i}"),
+            f3.text_input("Value", key=f"filter_value_{i}"),
+        ))
+    predicates = [p for p in predicates if p[2] != ""]
+
+    page = st.number_input("Page", min_value=1, value=1)
+    try:
+        with instrument.span("grid.window"):
+            rows, n_rows = window(
+                df, selected_cols, page, page_size,
+                sort=None if sort_col == "(none)" else sort_col, ascending=ascending,
+                predicates=predicates, version=version,
+            )
+    except ValueError as exc:
+        st.warning(str(exc))
+        return
+    pages = n_pages(n_rows, page_size)
+    with instrument.span("explorer table", "render"):
+        st.dataframe(rows, use_container_width=True)
+    st.caption(f"Page {min(page, pages)} of {pages:,} · {n_rows:,} matching rows")
@@ -0,0 +1,280 @@
+"""Opt-in timing spans, cache counters and message sizes for dashboard reruns.
+
+A page calls ``start_run`` first and ``sidebar_panel`` last. In between,
+``span`` times a stage (``"load"``, ``"transform"`` or ``"render"``),
+loaders decorated with ``cached(st.cache_data)`` count their hits and
+misses, ``figure_cache`` reports its own, and every message the rerun sends
+to the browser is sized by element type. The panel shows where the rerun's
+time went (self time per stage, so nested spans are not counted twice),
+peak RSS and bytes per element, and offers recent runs as JSON lines;
+``EDA_INSTRUMENT_LOG`` also appends every run to a file.
+
+A session is instrumented when ``EDA_INSTRUMENT=1`` or its URL has
+``?debug=1``. Otherwise ``start_run`` leaves no run for the thread and
+every hook returns after one thread-local lookup, so the calls can stay in
+production code.
+
+    instrument.start_run("Energy Trends", instrument.requested(st.query_params))
+    with instrument.span("downsample"):
+        plotted = downsample.downsample(series)
+    ...
+    instrument.sidebar_panel()
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+ENV = "EDA_INSTRUMENT"
+LOG_ENV = "EDA_INSTRUMENT_LOG"
+QUERY_PARAM = "debug"
+STAGES = ("load", "transform", "render")
+# Finished runs kept for the panel's JSON lines download
+HISTORY = 50
+
+_local = threading.local()
+_history = deque(maxlen=HISTORY)
+_lock = threading.Lock()
+_NOOP = contextlib.nullcontext()
+
+
+def requested(query_params=None):
+    """Whether to instrument this session: ``EDA_INSTRUMENT`` set, or ``?debug=1`` in the URL."""
+    if os.environ.get(ENV, "") not in ("", "0"):
+        return True
+    return query_params is not None and query_params.get(QUERY_PARAM) in ("1", "true")
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (``None`` where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Run:
+    """Spans, cache counters and message sizes of one rerun."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.total_ms = None
+        self.peak_rss = None
+        self.spans = []
+        self.caches = {}
+        self.messages = {}
+        self._t0 = time.perf_counter()
+        self._stack = []
+
+    def current_span(self):
+        return self._stack[-1][0] if self._stack else None
+
+    def add_message(self, msg):
+        kind = msg.WhichOneof("type")
+        if kind == "delta":
+            kind = msg.delta.WhichOneof("type")
+            if kind == "new_element":
+                kind = msg.delta.new_element.WhichOneof("type")
+        entry = self.messages.setdefault((kind, self.current_span()), [0, 0])
+        entry[0] += 1
+        entry[1] += msg.ByteSize()
+
+    def stage_ms(self):
+        """Self time per stage, plus ``"other"`` for time outside every span."""
+        totals = dict.fromkeys(STAGES, 0.0)
+        for span in self.spans:
+            totals[span["stage"]] = totals.get(span["stage"], 0.0) + span["self_ms"]
+        if self.total_ms is not None:
+            totals["other"] = max(self.total_ms - sum(totals.values()), 0.0)
+        return totals
+
+    def to_dict(self):
+        return {
+            "page": self.page,
+            "started": self.started,
+            "total_ms": self.total_ms,
+            "peak_rss": self.peak_rss,
+            "stages": self.stage_ms(),
+            "spans": self.spans,
+            "caches": self.caches,
+            "messages": [{"element": kind, "span": span, "count": count, "bytes": size}
+                         for (kind, span), (count, size) in self.messages.items()],
+        }
+
+
+class _Span:
+    __slots__ = ("run", "name", "stage", "start")
+
+    def __init__(self, run, name, stage):
+        self.run, self.name, self.stage = run, name, stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        # [name, time spent in child spans]
+        self.run._stack.append([self.name, 0.0])
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        _, child_ms = self.run._stack.pop()
+        if self.run._stack:
+            self.run._stack[-1][1] += ms
+        self.run.spans.append({
+            "name": self.name, "stage": self.stage, "depth": len(self.run._stack),
+            "start_ms": (self.start - self.run._t0) * 1000, "ms": ms, "self_ms": ms - child_ms,
+        })
+        return False
+
+
+def current():
+    """The calling thread's ``Run``, or ``None`` when not instrumented."""
+    return getattr(_local, "run", None)
+
+
+def span(name, stage="transform"):
+    """Context manager timing ``name`` as part of ``stage``; a shared no-op when off."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return _NOOP
+    return _Span(run, name, stage)
+
+
+def count_cache(name, hit):
+    """Count one lookup of a cache that is not wrapped with ``cached``."""
+    run = getattr(_local, "run", None)
+    if run is not None:
+        stats = run.caches.setdefault(name, {"calls": 0, "misses": 0, "ms": 0.0})
+        stats["calls"] += 1
+        stats["misses"] += not hit
+
+
+def cached(cache, name=None, stage="load"):
+    """Decorate with ``cache`` (e.g. ``st.cache_data`` or ``st.cache_resource(max_entries=2)``), counting hits and misses.
+
+    The miss counter sits inside the cache, so it only runs when the cache
+    calls the function; calls minus misses are hits. The cache still sees
+    the original function's source and signature.
+    """
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            run = getattr(_local, "run", None)
+            if run is not None and label in run.caches:
+                run.caches[label]["misses"] += 1
+            return fn(*args, **kwargs)
+
+        cached_fn = cache(on_miss)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = getattr(_local, "run", None)
+            if run is None:
+                return cached_fn(*args, **kwargs)
+            stats = run.caches.setdefault(label, {"calls": 0, "misses": 0, "ms": 0.0})
+            stats["calls"] += 1
+            start = time.perf_counter()
+            with _Span(run, label, stage):
+                result = cached_fn(*args, **kwargs)
+            stats["ms"] += (time.perf_counter() - start) * 1000
+            return result
+
+        wrapper.clear = cached_fn.clear
+        return wrapper
+    return decorate
+
+
+def _watch_messages():
+    # Size every ForwardMsg of this session by wrapping its script-run context's enqueue once
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None or getattr(ctx, "_eda_instrumented", False):
+        return
+    # A private attribute: if a Streamlit release renames it, messages just go unsized
+    enqueue = getattr(ctx, "_enqueue", None)
+    if enqueue is None:
+        return
+
+    def sized(msg):
+        run = getattr(_local, "run", None)
+        if run is not None:
+            run.add_message(msg)
+        return enqueue(msg)
+
+    ctx._enqueue = sized
+    ctx._eda_instrumented = True
+
+
+def start_run(page, enabled=None):
+    """Begin instrumenting this thread's rerun of ``page`` if ``enabled`` (default: ``requested()``)."""
+    if not (requested() if enabled is None else enabled):
+        _local.run = None
+        return None
+    run = _local.run = Run(page)
+    _watch_messages()
+    return run
+
+
+def finish_run():
+    """Close the thread's run: total time and peak RSS, history and ``EDA_INSTRUMENT_LOG``."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    run.total_ms = (time.perf_counter() - run._t0) * 1000
+    run.peak_rss = peak_rss()
+    line = json.dumps(run.to_dict(), default=str)
+    with _lock:
+        _history.append(line)
+        path = os.environ.get(LOG_ENV)
+        if path:
+            with open(path, "a") as fh:
+                fh.write(line + "\n")
+    return run
+
+
+def history_jsonl():
+    """Recent finished runs, one JSON object per line."""
+    with _lock:
+        return "".join(line + "\n" for line in _history)
+
+
+def sidebar_panel():
+    """Finish the run and show its breakdown in a sidebar expander (nothing when off)."""
+    run = finish_run()
+    if run is None:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        rss = f"{run.peak_rss / 2**20:,.0f} MB" if run.peak_rss else "n/a"
+        st.caption(f"Rerun {run.total_ms:,.0f} ms · peak RSS {rss}")
+        st.dataframe(pd.Series(run.stage_ms(), name="ms").round(1), use_container_width=True)
+        if run.spans:
+            spans = pd.DataFrame(sorted(run.spans, key=lambda s: s["start_ms"]))
+            spans["name"] = ["  " * depth + name for depth, name in zip(spans["depth"], spans["name"])]
+            st.dataframe(spans[["name", "stage", "ms", "self_ms"]].round(1), hide_index=True,
+                         use_container_width=True)
+        if run.caches:
+            caches = pd.DataFrame(run.caches).T
+            caches.insert(1, "hits", caches["calls"] - caches["misses"])
+            st.dataframe(caches.round(1), use_container_width=True)
+        if run.messages:
+            messages = pd.DataFrame(run.to_dict()["messages"]).sort_values("bytes", ascending=False)
+            st.dataframe(messages, hide_index=True, use_container_width=True)
+        st.download_button("Download runs (JSON lines)", history_jsonl(), file_name="eda_runs.jsonl",
+                           mime="application/x-ndjson")
@@ -0,0 +1,233 @@
+"""Streaming, mergeable replacement for ``DataFrame.describe()``.
+
+Each column keeps exact count/mean/variance/min/max (Chan et al.'s pairwise
+update, so partials combine without revisiting rows) and a KLL quantile
+sketch for the percentiles. Frames are consumed in row chunks, and
+summaries built over separate chunks, files or partitions can be merged.
+
+Error bound: count, mean, std, min and max are exact (up to float64
+rounding). A reported percentile ``q`` is a value whose rank lies within
+``±RANK_ERROR * count`` of ``q * count`` with ~99% probability, i.e. with
+the default ``k=200`` the "50%" row is somewhere between the 48.35th and
+51.65th percentile. Columns that fit in the sketch (count <= ``k``) are exact.
+
+    summaries = summary.summarize(df)              # or an iterable of chunks
+    summaries = summary.merge(summaries, other)    # e.g. another partition
+    st.dataframe(summary.describe(summaries))
+"""
+
+import copy
+import math
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 200
+CHUNK_ROWS = 250_000
+# Normalised rank error of a KLL sketch at 99% confidence is about 3.3 / k (1.65% at k=200)
+RANK_ERROR = 3.3 / DEFAULT_K
+_SHRINK = 2 / 3
+
+
+def rank_error(k=DEFAULT_K):
+    """Approximate normalised rank error (99% confidence) for sketch size ``k``."""
+    return 3.3 / k
+
+
+class QuantileSketch:
+    """KLL sketch: levels of sorted-on-demand buffers, level ``h`` items weigh ``2**h``.
+
+    When a level overflows it is sorted and every other item (random
+    parity) moves up a level. Large batches are sorted once and subsampled
+    straight to the level where they fit, which is the same as compacting
+    them repeatedly.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self._levels) - h - 1
+        return max(2, math.ceil(self.k * _SHRINK ** depth))
+
+    def _ensure_levels(self, height):
+        while len(self._levels) < height:
+            self._levels.append(np.empty(0))
+
+    def update(self, values):
+        values = np.asarray(values, dtype="float64")
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        level = 0
+        if len(values) > self.k:
+            level = math.ceil(math.log2(len(values) / self.k))
+            stride = 2 ** level
+            values = np.sort(values)[self._rng.integers(stride)::stride]
+        self._ensure_levels(level + 1)
+        self._levels[level] = np.concatenate([self._levels[level], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch, in place; ``other`` is left unchanged."""
+        self._ensure_levels(len(other._levels))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            items = self._levels[h]
+            if len(items) > self._capacity(h):
+                items = np.sort(items)
+                keep = items[:0]
+                if len(items) % 2:
+                    # Odd one out stays behind, from a random end so neither tail is favoured
+                    if self._rng.integers(2):
+                        keep, items = items[:1], items[1:]
+                    else:
+                        keep, items = items[-1:], items[:-1]
+                self._ensure_levels(h + 2)
+                self._levels[h] = keep
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], items[self._rng.integers(2)::2]])
+            h += 1
+
+    def quantile(self, qs):
+        """Approximate quantiles, interpolated between weighted sketch items."""
+        qs = np.atleast_1d(np.asarray(qs, dtype="float64"))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(lvl), 2.0 ** h) for h, lvl in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        # Each item stands for the middle of the rank range it covers
+        centres = np.cumsum(weights) - weights / 2
+        return np.interp(qs * weights.sum(), centres, items)
+
+
+class ColumnSummary:
+    """Exact moments plus a quantile sketch for one column."""
+
+    def __init__(self, k=DEFAULT_K, datetime=False, seed=None):
+        self.datetime = datetime
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(k, seed)
+
+    def update(self, values):
+        if self.datetime:
+            values = np.asarray(values, dtype="datetime64[ns]")
+            values = values[~np.isnat(values)].view("int64").astype("float64")
+        else:
+            values = np.asarray(values, dtype="float64")
+            values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        mean = values.mean()
+        self._combine(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+        self.sketch.update(values)
+        return self
+
+    def _combine(self, count, mean, m2, lo, hi):
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def merge(self, other):
+        """Fold ``other`` into this summary, in place, like ``update``; ``other`` is left unchanged."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def describe(self, percentiles=(0.25, 0.5, 0.75)):
+        """Statistics in ``DataFrame.describe()`` order."""
+        if self.count == 0:
+            stats = {"count": 0, "mean": np.nan, "std": np.nan, "min": np.nan}
+            stats.update({_label(p): np.nan for p in percentiles})
+            stats["max"] = np.nan
+            return stats
+        # Clip to the exact extremes; interpolation can't know them otherwise
+        quantiles = np.clip(self.sketch.quantile(percentiles), self.min, self.max)
+        stats = {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min}
+        stats.update({_label(p): q for p, q in zip(percentiles, quantiles)})
+        stats["max"] = self.max
+        if self.datetime:
+            # describe() shows datetimes as timestamps and has no std for them
+            stats = {name: value if name == "count" else pd.Timestamp(int(value)) for name, value in stats.items()
+                     if name != "std"}
+        return stats
+
+
+def _label(p):
+    return f"{p * 100:g}%"
+
+
+def _columns(frame):
+    """What ``describe()`` picks by default: numeric and datetime columns."""
+    return [col for col in frame.columns
+            if pd.api.types.is_numeric_dtype(frame[col]) or pd.api.types.is_datetime64_any_dtype(frame[col])]
+
+
+def _chunks(data, chunk_rows):
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start:start + chunk_rows]
+    else:
+        yield from data
+
+
+def summarize(data, columns=None, k=DEFAULT_K, chunk_rows=CHUNK_ROWS, seed=0):
+    """One streaming pass over a frame (in row chunks) or an iterable of frames.
+
+    Returns ``{column: ColumnSummary}``.
+    """
+    summaries = None
+    for chunk in _chunks(data, chunk_rows):
+        if summaries is None:
+            columns = columns if columns is not None else _columns(chunk)
+            summaries = {col: ColumnSummary(k, pd.api.types.is_datetime64_any_dtype(chunk[col]), seed)
+                         for col in columns}
+        for col, summ in summaries.items():
+            summ.update(chunk[col].to_numpy())
+    return summaries or {}
+
+
+def merge(*parts):
+    """Combine ``summarize`` results over disjoint rows of the same columns.
+
+    Returns new summaries: the parts (often cached) are left unchanged.
+    """
+    merged = {}
+    for part in parts:
+        for col, summ in part.items():
+            if col in merged:
+                merged[col].merge(summ)
+            else:
+                merged[col] = copy.deepcopy(summ)
+    return merged
+
+
+def describe(summaries, percentiles=(0.25, 0.5, 0.75)):
+    """A frame laid out like ``DataFrame.describe()``."""
+    table = pd.DataFrame({col: summ.describe(percentiles) for col, summ in summaries.items()})
+    return table.reindex(["count", "mean", "std", "min", *map(_label, percentiles), "max"])
@@ -0,0 +1,238 @@
+"""Abnormal-minute detection for the cleaned household frame.
+
+Three kinds of anomaly are scored per minute, all with vectorized windows:
+
+- ``voltage_sag``: ``Voltage`` below the median of the preceding ``WINDOW``,
+  in units of that window's MAD (median absolute deviation);
+- ``power_spike``: ``Global_active_power`` above both its rolling median and
+  its hour-of-week baseline (median/MAD of that weekday hour over the fitted
+  history), so an ordinary evening peak is not a spike;
+- ``submeter_mismatch``: the sub-meters record more energy in a minute
+  (Wh) than ``Voltage x Global_intensity`` can deliver in one.
+
+Flagged minutes of one kind at most ``MERGE_GAP`` apart merge into an
+interval. Rolling windows only look back, so a minute's score depends on
+earlier minutes alone: ``Detector`` keeps the last ``2 x WINDOW`` of the
+series and scores appended rows exactly as rescoring the whole frame would
+(with the hour-of-week baseline it was fitted on).
+
+    intervals = anomalies.detect(df_cleaned)
+    detector = anomalies.Detector(df_cleaned)
+    appended = detector.update(new_rows)
+"""
+
+import numpy as np
+import pandas as pd
+
+WINDOW = pd.Timedelta(minutes=60)
+# Minutes a window needs before its median/MAD are trusted
+MIN_PERIODS = 30
+MERGE_GAP = pd.Timedelta(minutes=2)
+# MAD -> standard deviation for normally distributed readings
+MAD_SCALE = 1.4826
+
+KINDS = {
+    "voltage_sag": "Voltage",
+    "power_spike": "Global_active_power",
+    "submeter_mismatch": "Total_sub_metering",
+}
+KIND_LABELS = {
+    "voltage_sag": "Voltage sag",
+    "power_spike": "Power spike",
+    "submeter_mismatch": "Sub-meter mismatch",
+}
+# Robust z-scores for sags/spikes, excess Wh for mismatches (sub-meters count whole Wh)
+THRESHOLDS = {"voltage_sag": 5.0, "power_spike": 8.0, "submeter_mismatch": 3.0}
+# Smallest scale a z-score divides by, so flat stretches don't turn rounding into anomalies
+MIN_SCALE = {"Voltage": 0.5, "Global_active_power": 0.05}
+
+INPUT_COLUMNS = ["DateTime", "Global_active_power", "Voltage", "Global_intensity", "Total_sub_metering"]
+
+
+def _slots(stamps):
+    """Hour of week, 0 (Monday 00:00) .. 167."""
+    return stamps.dayofweek.to_numpy() * 24 + stamps.hour.to_numpy()
+
+
+def seasonal_baseline(df, col="Global_active_power"):
+    """Median and scaled MAD of ``col`` per hour of week (168 rows, NaN for unseen hours)."""
+    values = df[col].to_numpy(dtype="float64")
+    slots = _slots(pd.DatetimeIndex(df["DateTime"]))
+    median = pd.Series(values).groupby(slots).median()
+    deviation = np.abs(values - median.reindex(slots).to_numpy())
+    mad = pd.Series(deviation).groupby(slots).median()
+    baseline = pd.DataFrame({"median": median, "scale": MAD_SCALE * mad}).reindex(range(168))
+    baseline["scale"] = baseline["scale"].clip(lower=MIN_SCALE[col])
+    baseline.index.name = "hour_of_week"
+    return baseline
+
+
+def _rolling_z(values, stamps, floor):
+    series = pd.Series(values, index=stamps)
+    median = series.rolling(WINDOW, closed="left", min_periods=MIN_PERIODS).median()
+    deviation = (series - median).abs()
+    mad = deviation.rolling(WINDOW, closed="left", min_periods=MIN_PERIODS).median()
+    scale = np.maximum(MAD_SCALE * mad.to_numpy(), floor)
+    return (values - median.to_numpy()) / scale
+
+
+def scores(df, baseline):
+    """Per-minute severity of each kind (larger is worse, NaN where a window is too short).
+
+    ``df`` must be in ``DateTime`` order; ``baseline`` comes from ``seasonal_baseline``.
+    """
+    stamps = pd.DatetimeIndex(df["DateTime"])
+    voltage = df["Voltage"].to_numpy(dtype="float64")
+    power = df["Global_active_power"].to_numpy(dtype="float64")
+    slots = _slots(stamps)
+
+    sag = -_rolling_z(voltage, stamps, MIN_SCALE["Voltage"])
+    local = _rolling_z(power, stamps, MIN_SCALE["Global_active_power"])
+    seasonal = (power - baseline["median"].to_numpy()[slots]) / baseline["scale"].to_numpy()[slots]
+    # V x A over one minute, in Wh: an upper bound on the active energy the sub-meters share
+    apparent = voltage * df["Global_intensity"].to_numpy(dtype="float64") / 60
+    excess = df["Total_sub_metering"].to_numpy(dtype="float64") - apparent
+    return pd.DataFrame({
+        "voltage_sag": sag,
+        "power_spike": np.minimum(local, seasonal),
+        "submeter_mismatch": excess,
+    }, index=df.index)
+
+
+def intervals(df, minute_scores):
+    """Merge the minutes whose score passes ``THRESHOLDS`` into one row per interval.
+
+    Each interval has its ``kind``, first/last flagged minute, the number of
+    flagged minutes, the worst ``score`` and the reading (``value``) at it.
+    """
+    stamps = df["DateTime"].to_numpy()
+    parts = []
+    for kind, col in KINDS.items():
+        score = minute_scores[kind].to_numpy()
+        flagged = np.flatnonzero(score > THRESHOLDS[kind])
+        if len(flagged) == 0:
+            continue
+        times = stamps[flagged]
+        group = np.concatenate([[0], np.cumsum(np.diff(times) > MERGE_GAP.to_timedelta64())])
+        frame = pd.DataFrame({"time": times, "score": score[flagged],
+                              "value": df[col].to_numpy(dtype="float64")[flagged], "group": group})
+        worst = frame.loc[frame.groupby("group")["score"].idxmax()]
+        spans = frame.groupby("group")["time"].agg(["min", "max", "size"])
+        parts.append(pd.DataFrame({
+            "kind": kind,
+            "start": spans["min"].to_numpy(),
+            "end": spans["max"].to_numpy(),
+            "minutes": spans["size"].to_numpy(),
+            "score": worst["score"].to_numpy(),
+            "value": worst["value"].to_numpy(),
+        }))
+    if not parts:
+        return _empty()
+    return pd.concat(parts, ignore_index=True).sort_values(["start", "kind"], ignore_index=True)
+
+
+def _empty():
+    return pd.DataFrame({
+        "kind": pd.Series(dtype="object"),
+        "start": pd.Series(dtype="datetime64[ns]"),
+        "end": pd.Series(dtype="datetime64[ns]"),
+        "minutes": pd.Series(dtype="int64"),
+        "score": pd.Series(dtype="float64"),
+        "value": pd.Series(dtype="float64"),
+    })
+
+
+def _in_order(df):
+    df = df[INPUT_COLUMNS]
+    if not df["DateTime"].is_monotonic_increasing:
+        df = df.sort_values("DateTime", kind="stable")
+    return df
+
+
+def detect(df, baseline=None):
+    """Anomaly intervals over a cleaned frame (see ``intervals`` for the columns)."""
+    df = _in_order(df)
+    if baseline is None:
+        baseline = seasonal_baseline(df)
+    return intervals(df, scores(df, baseline))
+
+
+def detect_parts(parts, baseline):
+    """``detect`` over consecutive time-ordered frames (e.g. monthly partitions).
+
+    Scores are the same as for the concatenated frame, but only one part
+    (plus a two-window tail) is in memory at a time. ``baseline`` has to be
+    fitted up front, e.g. on the ``DateTime`` and ``Global_active_power``
+    columns alone.
+    """
+    detector = None
+    for part in parts:
+        if detector is None:
+            detector = Detector(part, baseline)
+        else:
+            detector.update(part)
+    return _empty() if detector is None else detector.intervals
+
+
+class Detector:
+    """Incremental scoring of rows appended to a cleaned frame.
+
+    The hour-of-week baseline is fitted on the initial frame (unless one is
+    given) and kept; build a new ``Detector`` to refit it on a longer history.
+    """
+
+    def __init__(self, df, baseline=None):
+        df = _in_order(df)
+        self.baseline = seasonal_baseline(df) if baseline is None else baseline
+        self.intervals = intervals(df, scores(df, self.baseline))
+        self._tail = self._keep(df)
+
+    @staticmethod
+    def _keep(df):
+        # Two windows back: the last row's MAD window needs the medians of its own window
+        if len(df) == 0:
+            return df
+        last = df["DateTime"].iloc[-1]
+        return df[df["DateTime"] >= last - 2 * WINDOW]
+
+    def update(self, df):
+        """Score rows appended after the frame seen so far and return their intervals.
+
+        ``self.intervals`` is updated too, with an interval that continues
+        one already there merged into it.
+        """
+        df = _in_order(df)
+        if len(df) == 0:
+            return _empty()
+        if len(self._tail) and df["DateTime"].iloc[0] < self._tail["DateTime"].iloc[-1]:
+            raise ValueError("appended rows must not start before the rows already scored")
+        frame = pd.concat([self._tail, df], ignore_index=True)
+        minute_scores = scores(frame, self.baseline).iloc[len(self._tail):]
+        appended = intervals(frame.iloc[len(self._tail):], minute_scores)
+        self.intervals = merge_intervals(self.intervals, appended)
+        self._tail = self._keep(frame)
+        return appended
+
+
+def merge_intervals(old, new):
+    """Add intervals of later rows to ``old``, joining any that continue an interval there."""
+    if len(new) == 0:
+        return old
+    if len(old) == 0:
+        return new
+    old, new = old.copy(), new.copy()
+    continued = []
+    # Only the first new interval of a kind can continue an old one
+    for i, row in new.groupby("kind").head(1).iterrows():
+        previous = old.index[old["kind"] == row["kind"]]
+        if len(previous) == 0:
+            continue
+        j = old.loc[previous, "end"].idxmax()
+        if row["start"] - old.at[j, "end"] <= MERGE_GAP:
+            old.at[j, "end"] = row["end"]
+            old.at[j, "minutes"] += row["minutes"]
+            if row["score"] > old.at[j, "score"]:
+                old.at[j, "score"], old.at[j, "value"] = row["score"], row["value"]
+            continued.append(i)
+    merged = pd.concat([old, new.drop(index=continued)], ignore_index=True)
+    return merged.sort_values(["start", "kind"], ignore_index=True)
@@ -4,8 +4,21 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from PIL import Image
 from streamlit_option_menu import option_menu
+import os
 import time
 
+from eda_common import correlation, distribution, export, figure_cache, grid, instrument, summary
+
+import anomalies
+import cleaning
+import data_cache
+import downsample
+import live
+import parallel
+import partitioned
+import rollups
+from schema import CLEANED_FILE, RAW_FILE
+
 # ---------------------
 # Page Setup
 # ---------------------
@@ -34,15 +47,136 @@ with st.sidebar:
         }
     )
 
+# Timing spans, cache hits/misses and bytes per element for this rerun, shown in a sidebar
+# panel when EDA_INSTRUMENT=1 or the URL has ?debug=1 (otherwise every hook is a no-op).
+instrument.start_run(f"power/{selected}", instrument.requested(st.query_params))
+
 # Load data
-@st.cache_data
-def load_data():
-    df_raw = pd.read_csv('household_power_consumption.csv')
-    df_cleaned = pd.read_csv("cleaned_dataset.csv", parse_dates=['DateTime'])
-    return df_raw, df_cleaned
+# Cleaned data is read from a month-partitioned store (partitioned.py): each page opens only
+# the months and columns it needs. The store is built in .cache/ from the cleaned CSV and
+# rebuilt when it changes, unless POWER_EDA_STORE names a prebuilt (multi-household) store.
+@instrument.cached(st.cache_resource(show_spinner="Partitioning cleaned data..."))
+def open_store(store_key):
+    return partitioned.open_store(CLEANED_FILE)
+
+
+store = open_store(partitioned.store_key(CLEANED_FILE))
+if len(store.households) > 1:
+    household = st.sidebar.selectbox("Household", store.households)
+else:
+    household = store.households[0]
+# Every cache derived from the cleaned data is keyed on this
+cleaned_version = f"{store.version}-{household}"
+
+
+# Row count, first rows and describe()-style table of the raw file from one streaming pass, keyed
+# on the file's content hash; the raw file is never held in memory whole.
+@instrument.cached(st.cache_data)
+def raw_overview(raw_version):
+    seen = {"rows": 0, "head": None}
+
+    def chunks():
+        for chunk in cleaning.read_chunks(RAW_FILE):
+            seen["rows"] += len(chunk)
+            if seen["head"] is None:
+                seen["head"] = chunk.head()
+            yield chunk
+
+    table = summary.describe(summary.summarize(chunks()))
+    return seen["rows"], seen["head"], table
+
+
+# Every row of the household, read only once the Data Overview explorer is opened. Shared
+# read-only through cache_resource, so reruns neither copy it nor defeat the explorer's windowing;
+# one entry, so switching households does not keep two resident.
+@instrument.cached(st.cache_resource(max_entries=1))
+def load_cleaned(cleaned_version):
+    return store.read(household=household)
+
+
+# Hour x date partials, persisted in the store per version; every trend view is derived from these.
+# A first build reads the monthly partitions in-process; POWER_EDA_WORKERS=N opts into N processes,
+# started without forking the server (its threads could deadlock a forked child).
+@instrument.cached(st.cache_data)
+def load_rollups(cleaned_version):
+    workers = parallel.resolve_workers(default=1)
+    context = parallel.server_context() if workers > 1 else None
+    return rollups.load_store_cube(store, household, workers=workers, mp_context=context)
+
+
+# describe()-style table from one streaming pass with a quantile sketch, per dataset version.
+# Streams the store one month at a time.
+@instrument.cached(st.cache_data)
+def summary_table(cleaned_version):
+    return summary.describe(summary.summarize(store.scan(household=household)))
+
+
+# Pairwise-complete sums and cross-products of every numeric column; any heatmap is a slice of them.
+@instrument.cached(st.cache_data)
+def correlation_stats(cleaned_version):
+    stats = correlation.CorrelationStats(store.numeric_columns)
+    for part in store.scan(columns=store.numeric_columns, household=household):
+        stats.update(part)
+    return stats
+
+
+# Histogram bins, KDE curve and box statistics per column; figures only draw these arrays.
+@instrument.cached(st.cache_data)
+def column_distribution(cleaned_version, col):
+    return distribution.column_stats(store.read(columns=[col], household=household)[col].to_numpy())
+
+
+# Voltage sags, power spikes and sub-meter mismatches, merged into intervals; a year scores in ~1 s.
+# Scored month by month; only the hour-of-week baseline reads its two columns in full.
+@instrument.cached(st.cache_data)
+def anomaly_baseline(cleaned_version):
+    return anomalies.seasonal_baseline(store.read(columns=["DateTime", "Global_active_power"], household=household))
+
+
+@instrument.cached(st.cache_data)
+def anomaly_intervals(cleaned_version):
+    parts = store.scan(columns=anomalies.INPUT_COLUMNS, household=household)
+    return anomalies.detect_parts(parts, anomaly_baseline(cleaned_version))
+
+
+# Live append mode: POWER_EDA_LIVE names a raw readings file or tcp://host:port. New rows are
+# cleaned and folded into copies of the cube, correlation sums and anomaly detector on a
+# background thread; Energy Trends and Insights rerun every POWER_EDA_REFRESH seconds.
+@instrument.cached(st.cache_resource(show_spinner="Starting live feed..."))
+def open_feed(cleaned_version, source):
+    last = store.bounds("DateTime", household)[1]
+    seed = store.read(last - 2 * anomalies.WINDOW, None, anomalies.INPUT_COLUMNS, household)
+    detector = anomalies.Detector(seed, anomaly_baseline(cleaned_version))
+    return live.LiveFeed(live.open_source(source), load_rollups(cleaned_version),
+                         correlation_stats(cleaned_version), detector, last).start()
+
 
+feed = open_feed(cleaned_version, os.environ[live.LIVE_ENV]) if os.environ.get(live.LIVE_ENV) else None
+live_fragment = st.fragment(run_every=live.refresh_seconds()) if feed else (lambda page: page)
+
+
+def current_views():
+    """``(version, cube, anomaly intervals, live minutes)``, with the live feed's rows folded in."""
+    if feed is None:
+        return cleaned_version, load_rollups(cleaned_version), anomaly_intervals(cleaned_version), None
+    revision, cube, intervals, recent = feed.snapshot()
+    st.caption(feed.describe())
+    intervals = anomalies.merge_intervals(anomaly_intervals(cleaned_version), intervals)
+    return f"{cleaned_version}+{revision}", cube, intervals, recent
+
+
+ANOMALY_COLORS = {"voltage_sag": "tab:red", "power_spike": "tab:orange", "submeter_mismatch": "tab:purple"}
+# Multi-year stores can flag far more intervals than a chart or table can show; keep the worst
+MAX_MARKED = 500
+MAX_LISTED = 1000
+
+
+def show_figure(chart, params, draw, version=None):
+    """Render ``draw()`` through the shared figure cache and display the PNG."""
+    png = figure_cache.render((version or cleaned_version, chart, params), draw)
+    with instrument.span(f"image:{chart}", "render"):
+        st.image(png, use_container_width=True)
 
-df_raw, df_cleaned = load_data()
 
 # ---------------------
 # Home Page
@@ -82,13 +216,16 @@ elif selected == "Data Overview":
 
     st.header("📊 Dataset Overview")
 
+    raw_rows, raw_head, raw_table = raw_overview(data_cache.dataset_version(RAW_FILE))
+
     # Shape Comparison
+    # From the raw pass and the store manifest; neither dataset is loaded whole
     st.markdown("### 📏 Dataset Shapes")
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Raw Data", f"{df_raw.shape[0]} rows × {df_raw.shape[1]} columns")
+        st.metric("Raw Data", f"{raw_rows} rows × {raw_head.shape[1]} columns")
     with col2:
-        st.metric("Cleaned Data", f"{df_cleaned.shape[0]} rows × {df_cleaned.shape[1]} columns")
+        st.metric("Cleaned Data", f"{store.n_rows(household)} rows × {len(store.columns)} columns")
 
     st.markdown("---")
 
@@ -98,11 +235,11 @@ elif selected == "Data Overview":
 
     with col1:
         st.subheader("📄 Raw Dataset")
-        st.dataframe(df_raw.head(), use_container_width=True)
+        st.dataframe(raw_head, use_container_width=True)
 
     with col2:
         st.subheader("🧹 Cleaned Dataset")
-        st.dataframe(df_cleaned.head(), use_container_width=True)
+        st.dataframe(store.head(household=household), use_container_width=True)
 
     st.markdown("---")
 
@@ -121,8 +258,9 @@ elif selected == "Data Overview":
     st.markdown("## 🧪 Explore the Cleaned Dataset")
 
     with st.expander("🔍 Column Explorer"):
-        selected_cols = st.multiselect("Choose columns to view", df_cleaned.columns.tolist(), default=df_cleaned.columns.tolist())
-        st.dataframe(df_cleaned[selected_cols], use_container_width=True)
+        # An expander's body always runs, so the household is read only once asked for
+        if st.toggle("Load every row of the household for browsing"):
+            grid.explorer(load_cleaned(cleaned_version), version=cleaned_version)
 
     # Summary Statistics
     st.markdown("## 📈 Summary Statistics")
@@ -130,90 +268,169 @@ elif selected == "Data Overview":
     tab1, tab2 = st.tabs(["📊 Raw Dataset", "📊 Cleaned Dataset"])
 
     with tab1:
-        st.write(df_raw.describe())
+        st.write(raw_table)
 
     with tab2:
-        st.write(df_cleaned.describe())
+        st.write(summary_table(cleaned_version))
+
+    st.caption(f"Count, mean, std, min and max are exact; percentiles are approximate "
+               f"(within ±{summary.RANK_ERROR:.2%} of the row count in rank).")
 
     # Download button
+    # Encoded in chunks only when asked for, then kept in .cache/ per dataset version and options
     st.markdown("## ⬇️ Download Cleaned Dataset")
-    st.download_button(
-        label="Download Cleaned CSV",
-        data=df_cleaned.to_csv(index=False),
-        file_name="cleaned_household_power_consumption.csv",
-        mime="text/csv"
-    )
+    c1, c2, c3 = st.columns([2, 1, 1])
+    export_cols = c1.multiselect("Columns to export", store.columns, default=store.columns)
+    export_format = c2.selectbox("Format", export.available_formats())
+    first_day, last_day = (stamp.date() for stamp in store.bounds("DateTime", household))
+    export_dates = c3.date_input("Date range", (first_day, last_day), min_value=first_day, max_value=last_day)
+
+    where = None
+    if len(export_dates) == 2 and tuple(export_dates) != (first_day, last_day):
+        where = ("DateTime", pd.Timestamp(export_dates[0]), pd.Timestamp(export_dates[1]) + pd.Timedelta(days=1))
+    export_args = (cleaned_version, export_format, data_cache.cache_dir_for(CLEANED_FILE),
+                   "cleaned_household_power_consumption", export_cols, where)
+    export_path = export.export_path(*export_args)
+
+    if not export_path.exists() and st.button("Prepare download"):
+        with st.spinner("Encoding export..."):
+            # Only the months in the range are read from the store
+            lo, hi = where[1:] if where else (None, None)
+            export.export_file(store.read(lo, hi, household=household), *export_args)
+    if export_path.exists():
+        st.download_button(
+            label=f"Download Cleaned {export_format}",
+            data=export.read_bytes(export_path),
+            file_name=f"cleaned_household_power_consumption{export.FORMATS[export_format].suffix}",
+            mime=export.FORMATS[export_format].mime
+        )
 
 # ---------------------
 # Energy Trends
 # ---------------------
 elif selected == "Energy Trends":
-    st.header("⚡ Energy Usage Trends")
-
-    # Aggregate values
-    hourly_avg = df_cleaned.groupby('hour')['Total_sub_metering'].mean()
-    daily_avg = df_cleaned.groupby('Date')['Total_sub_metering'].sum()
-    weekday_avg = df_cleaned.groupby(df_cleaned['DateTime'].dt.day_name())['Total_sub_metering'].mean()
-    monthly_avg = df_cleaned.groupby(df_cleaned['DateTime'].dt.month)['Total_sub_metering'].mean()
-
-    tab1, tab2, tab3, tab4 = st.tabs(["🕒 Hourly", "📅 Daily", "📆 Weekly", "🗓️ Monthly"])
-
-    with tab1:
-        st.subheader("Average Energy Consumption by Hour")
-        fig, ax = plt.subplots(figsize=(5, 3))
-        sns.lineplot(x=hourly_avg.index, y=hourly_avg.values, marker='o', ax=ax)
-        ax.set_title("Hourly Sub-Metering Trend")
-        ax.set_xlabel("Hour of Day")
-        ax.set_ylabel("Avg Total Sub-Metering")
-        with st.container():
-            col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.pyplot(fig)
-
-    with tab2:
-        st.subheader("Total Energy Consumption by Date")
-        fig, ax = plt.subplots(figsize=(6, 3.5))
-        daily_avg.plot(ax=ax)
-        ax.set_title("Daily Total Sub-Metering")
-        ax.set_xlabel("Date")
-        # ax.tick_params(axis='x', rotation=45)
-        ax.xaxis.set_major_locator(plt.MaxNLocator(100))  # Show only ~10 x-ticks
-        ax.set_ylabel("Total Sub-Metering")
-        fig.tight_layout()
-        with st.container():
-            col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.pyplot(fig)
-
-    with tab3:
-        st.subheader("Average Consumption by Day of the Week")
-        ordered_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        weekday_avg = weekday_avg.reindex(ordered_days)
-        fig, ax = plt.subplots(figsize=(6, 3.5))
-        sns.barplot(x=weekday_avg.index, y=weekday_avg.values, palette="viridis", ax=ax)
-        ax.set_title("Average by Day of Week")
-        ax.set_ylabel("Avg Total Sub-Metering")
-        ax.tick_params(axis='x', rotation=20)
-        with st.container():
-            col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.pyplot(fig)        
-
-    with tab4:
-        st.subheader("Average Consumption by Month")
-        month_names = {
-            1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
-            7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"
-        }
-        monthly_avg.index = monthly_avg.index.map(month_names)
-        fig, ax = plt.subplots(figsize=(6, 3.5))
-        sns.barplot(x=monthly_avg.index, y=monthly_avg.values, palette="coolwarm", ax=ax)
-        ax.set_title("Average by Month")
-        ax.set_ylabel("Avg Total Sub-Metering")
-        with st.container():
-            col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.pyplot(fig)
+    @live_fragment
+    def energy_trends():
+        st.header("⚡ Energy Usage Trends")
+
+        # Aggregate values (from the rollup cube, not the minute-level frame)
+        version, cube, flagged_all, recent = current_views()
+        hourly_avg = rollups.hourly_mean(cube)
+        daily_avg = rollups.daily_total(cube)
+        weekday_avg = rollups.weekday_mean(cube)
+        monthly_avg = rollups.monthly_mean(cube)
+
+        tab1, tab2, tab3, tab4 = st.tabs(["🕒 Hourly", "📅 Daily", "📆 Weekly", "🗓️ Monthly"])
+
+        with tab1:
+            st.subheader("Average Energy Consumption by Hour")
+
+            def draw_hourly():
+                fig, ax = plt.subplots(figsize=(5, 3))
+                sns.lineplot(x=hourly_avg.index, y=hourly_avg.values, marker='o', ax=ax)
+                ax.set_title("Hourly Sub-Metering Trend")
+                ax.set_xlabel("Hour of Day")
+                ax.set_ylabel("Avg Total Sub-Metering")
+                return fig
+
+            with st.container():
+                col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                show_figure("hourly", {}, draw_hourly, version)
+
+        with tab2:
+            st.subheader("Total Energy Consumption by Date")
+            first_day, last_day = daily_avg.index.min().date(), daily_avg.index.max().date()
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                start_day, end_day = st.slider(
+                    "Date range", min_value=first_day, max_value=last_day,
+                    value=(first_day, last_day), format="YYYY-MM-DD"
+                )
+            with col2:
+                method = st.selectbox("Downsampling", list(downsample.METHODS))
+                overlay = st.checkbox("Mark anomalies", value=True)
+
+            # Finest resolution that fits the range, then thin to the plotting budget
+            range_start, range_end = pd.Timestamp(start_day), pd.Timestamp(end_day) + pd.Timedelta(days=1)
+            resolution = downsample.pick_resolution(range_start, range_end)
+            minutes = None
+            if resolution == "minute":
+                with instrument.span("store.read minutes", "load"):
+                    minutes = store.read(range_start, range_end, ["DateTime", "Total_sub_metering"], household)
+                if recent is not None:
+                    live_minutes = recent[(recent["DateTime"] >= range_start) & (recent["DateTime"] < range_end)]
+                    minutes = pd.concat([minutes, live_minutes[minutes.columns]], ignore_index=True)
+            with instrument.span("downsample"):
+                series = downsample.total_series(minutes, cube, range_start, range_end, resolution)
+                plotted = downsample.downsample(series, method=method)
+            st.caption(f"Resolution: **{resolution}** · {len(series):,} points → {len(plotted):,} plotted")
+            in_range = (flagged_all["end"] >= range_start) & (flagged_all["start"] < range_end)
+            flagged = flagged_all[in_range] if overlay else flagged_all[:0]
+            flagged = flagged.nlargest(MAX_MARKED, "score")
+
+            def draw_daily():
+                fig, ax = plt.subplots(figsize=(6, 3.5))
+                plotted.plot(ax=ax, x_compat=True)
+                # One line collection per kind, at each interval's start
+                for kind, group in flagged.groupby("kind"):
+                    ax.vlines(group["start"], 0, 1, transform=ax.get_xaxis_transform(), colors=ANOMALY_COLORS[kind],
+                              alpha=0.5, linewidth=0.8, label=anomalies.KIND_LABELS[kind])
+                if len(flagged):
+                    ax.legend(fontsize=7, loc="upper right")
+                ax.set_title(f"Total Sub-Metering per {resolution.capitalize()}")
+                ax.set_xlabel("Date")
+                # ax.tick_params(axis='x', rotation=45)
+                ax.xaxis.set_major_locator(plt.MaxNLocator(10))  # Show only ~10 x-ticks
+                ax.set_ylabel("Total Sub-Metering")
+                fig.tight_layout()
+                return fig
+
+            with st.container():
+                col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                show_figure("daily", {"range": (start_day, end_day), "method": method, "anomalies": overlay},
+                            draw_daily, version)
+
+        with tab3:
+            st.subheader("Average Consumption by Day of the Week")
+            ordered_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            weekday_avg = weekday_avg.reindex(ordered_days)
+
+            def draw_weekday():
+                fig, ax = plt.subplots(figsize=(6, 3.5))
+                sns.barplot(x=weekday_avg.index, y=weekday_avg.values, palette="viridis", ax=ax)
+                ax.set_title("Average by Day of Week")
+                ax.set_ylabel("Avg Total Sub-Metering")
+                ax.tick_params(axis='x', rotation=20)
+                return fig
+
+            with st.container():
+                col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                show_figure("weekday", {}, draw_weekday, version)
+
+        with tab4:
+            st.subheader("Average Consumption by Month")
+            month_names = {
+                1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
+                7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"
+            }
+            monthly_avg.index = monthly_avg.index.map(month_names)
+
+            def draw_monthly():
+                fig, ax = plt.subplots(figsize=(6, 3.5))
+                sns.barplot(x=monthly_avg.index, y=monthly_avg.values, palette="coolwarm", ax=ax)
+                ax.set_title("Average by Month")
+                ax.set_ylabel("Avg Total Sub-Metering")
+                return fig
+
+            with st.container():
+                col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                show_figure("monthly", {}, draw_monthly, version)
+
+    energy_trends()
 
 # ---------------------
 # Visualizations
@@ -238,49 +455,87 @@ elif selected == "Visualizations":
     st.header("📉 Custom Visualizations")
     st.subheader("🔧 Select Parameters")
 
-    num_cols = df_cleaned.select_dtypes(include='number').columns.tolist()
+    num_cols = store.numeric_columns
     col = st.selectbox("Select numeric column", num_cols)
 
     # Histogram
     st.markdown(f"### 📊 Histogram - `{col}`")
-    fig1, ax1 = plt.subplots(figsize=(4.5, 3))
-    sns.histplot(df_cleaned[col], kde=True, ax=ax1, color="skyblue", edgecolor="black")
-    ax1.set_title(f"Distribution of {col}", fontsize=11)
-    ax1.set_xlabel(col, fontsize=10)
-    ax1.set_ylabel("Frequency", fontsize=10)
-    ax1.tick_params(axis='both', labelsize=8)
-    fig1.tight_layout()
-    st.pyplot(fig1)
+
+    def draw_histogram():
+        fig1, ax1 = plt.subplots(figsize=(4.5, 3))
+        distribution.plot_histogram(ax1, column_distribution(cleaned_version, col),
+                                    color="skyblue", edgecolor="black")
+        ax1.set_title(f"Distribution of {col}", fontsize=11)
+        ax1.set_xlabel(col, fontsize=10)
+        ax1.set_ylabel("Frequency", fontsize=10)
+        ax1.tick_params(axis='both', labelsize=8)
+        fig1.tight_layout()
+        return fig1
+
+    show_figure("histogram", {"col": col}, draw_histogram)
 
     st.markdown("---")
 
     # Boxplot
     st.markdown(f"### 📦 Boxplot - `{col}`")
-    fig2, ax2 = plt.subplots(figsize=(5.5, 2.5))
-    sns.boxplot(x=df_cleaned[col], ax=ax2, color="lightcoral")
-    ax2.set_title(f"Boxplot of {col}", fontsize=11)
-    ax2.set_xlabel(col, fontsize=10)
-    ax2.tick_params(axis='x', labelsize=8)
-    fig2.tight_layout()
-    st.pyplot(fig2)
+
+    def draw_boxplot():
+        fig2, ax2 = plt.subplots(figsize=(5.5, 2.5))
+        distribution.plot_boxplot(ax2, column_distribution(cleaned_version, col), color="lightcoral")
+        ax2.set_title(f"Boxplot of {col}", fontsize=11)
+        ax2.set_xlabel(col, fontsize=10)
+        ax2.tick_params(axis='x', labelsize=8)
+        fig2.tight_layout()
+        return fig2
+
+    show_figure("boxplot", {"col": col}, draw_boxplot)
 
 
 # ---------------------
 # Insights
 # ---------------------
 elif selected == "Insights":
-    st.header("💡 Key Observations")
+    @live_fragment
+    def insights():
+        st.header("💡 Key Observations")
     
-    peak_hour = df_cleaned.groupby('hour')['Total_sub_metering'].mean().idxmax()
-    high_day = df_cleaned.groupby('Date')['Total_sub_metering'].sum().idxmax()
-
-    st.success(f"🔌 Peak energy usage hour: {peak_hour}:00")
-    st.success(f"📅 Highest consumption date: {high_day}")
-
-    st.markdown("### Correlation Heatmap")
-    fig, ax = plt.subplots()
-    sns.heatmap(df_cleaned.select_dtypes(include='number').corr(), annot=True, cmap='YlGnBu', ax=ax)
-    st.pyplot(fig)
+        version, cube, flagged, recent = current_views()
+        peak_hour = rollups.peak_hour(cube)
+        high_day = rollups.high_day(cube)
+
+        st.success(f"🔌 Peak energy usage hour: {peak_hour}:00")
+        st.success(f"📅 Highest consumption date: {high_day}")
+
+        st.markdown("### Anomalies")
+        counts = flagged["kind"].value_counts()
+        for col, (kind, label) in zip(st.columns(len(anomalies.KIND_LABELS)), anomalies.KIND_LABELS.items()):
+            col.metric(label, f"{counts.get(kind, 0):,}")
+        kinds = st.multiselect(
+            "Kinds", list(anomalies.KIND_LABELS), default=list(anomalies.KIND_LABELS),
+            format_func=anomalies.KIND_LABELS.get
+        )
+        listed = flagged[flagged["kind"].isin(kinds)]
+        if len(listed) > MAX_LISTED:
+            st.caption(f"Showing the worst {MAX_LISTED:,} of {len(listed):,} intervals.")
+        listed = listed.nlargest(MAX_LISTED, "score")
+        st.dataframe(listed.assign(kind=listed["kind"].map(anomalies.KIND_LABELS)),
+                     hide_index=True, use_container_width=True)
+        st.caption(
+            "Worst first. Score is a robust z-score against the previous hour (and, for spikes, the usual "
+            "level for that hour of the week); for mismatches it is the sub-meter Wh above Voltage × Intensity."
+        )
+
+        st.markdown("### Correlation Heatmap")
+
+        def draw_heatmap():
+            fig, ax = plt.subplots()
+            corr = feed.correlation_matrix() if feed else correlation_stats(cleaned_version).corr()
+            sns.heatmap(corr, annot=True, cmap='YlGnBu', ax=ax)
+            return fig
+
+        show_figure("correlation", {}, draw_heatmap, version)
+
+    insights()
 
 # ---------------------
 # About Page
@@ -293,4 +548,8 @@ elif selected == "About":
     - **Tools Used**: Python, Streamlit, Pandas, Matplotlib, Seaborn
     - **Purpose**: Understand and visualize household energy trends for smart decision-making.
     """)
-    st.balloons()
\ No newline at end of file
+    st.balloons()
+
+# Cache effectiveness, shown under the navigation menu
+st.sidebar.caption(figure_cache.describe())
+instrument.sidebar_panel()
@@ -0,0 +1,105 @@
+"""Cold-start benchmark: CSV parsing vs. the Feather cache in ``data_cache``.
+
+Each measurement runs in a fresh interpreter so the numbers reflect a real
+app restart (no warm pandas state, peak RSS per process).
+
+    python bench_load.py                      # uses the real CSVs if present
+    python bench_load.py --rows 2000000       # synthetic data of a given size
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from schema import CLEANED_FILE, RAW_FILE
+
+
+def _child(mode, raw_path, cleaned_path):
+    import pandas as pd
+
+    import data_cache
+
+    start = time.perf_counter()
+    if mode == "csv":
+        df_raw = pd.read_csv(raw_path)
+        df_cleaned = pd.read_csv(cleaned_path, parse_dates=["DateTime"])
+    else:
+        df_raw = data_cache.load_raw(raw_path)
+        df_cleaned = data_cache.load_cleaned(cleaned_path)
+    elapsed = time.perf_counter() - start
+    frame_mb = (df_raw.memory_usage(deep=True).sum() + df_cleaned.memory_usage(deep=True).sum()) / 2**20
+    print(json.dumps({"seconds": elapsed, "frame_mb": frame_mb, "peak_rss_mb": _peak_rss_mb()}))
+
+
+def _peak_rss_mb():
+    # VmHWM is reset on exec, unlike ru_maxrss which a child inherits from its parent.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(mode, raw_path, cleaned_path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(raw_path), str(cleaned_path)],
+        check=True, capture_output=True, text=True, cwd=Path(__file__).parent,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, help="Generate synthetic data with this many minutes")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm-cache runs to average")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    workdir = None
+    here = Path(__file__).parent
+    raw_path, cleaned_path = here / RAW_FILE, here / CLEANED_FILE
+    if args.rows or not (raw_path.exists() and cleaned_path.exists()):
+        import synthetic
+
+        rows = args.rows or 1_000_000
+        workdir = Path(tempfile.mkdtemp(prefix="power_bench_"))
+        raw_path, cleaned_path = workdir / RAW_FILE, workdir / CLEANED_FILE
+        print(f"Generating {rows:,} synthetic rows in {workdir} ...")
+        synthetic.write_raw_csv(raw_path, rows)
+        synthetic.write_cleaned_csv(raw_path, cleaned_path)
+
+    try:
+        shutil.rmtree(raw_path.parent / ".cache", ignore_errors=True)
+        results = {
+            "csv": _run("csv", raw_path, cleaned_path),
+            "cache (build)": _run("cache", raw_path, cleaned_path),
+        }
+        warm = [_run("cache", raw_path, cleaned_path) for _ in range(args.repeat)]
+        results["cache (mmap)"] = {k: sum(r[k] for r in warm) / len(warm) for k in warm[0]}
+
+        csv_mb = (os.path.getsize(raw_path) + os.path.getsize(cleaned_path)) / 2**20
+        print(f"\nSource CSVs: {csv_mb:.1f} MB")
+        print(f"{'path':<16}{'load s':>10}{'frames MB':>12}{'peak RSS MB':>14}")
+        for name, r in results.items():
+            print(f"{name:<16}{r['seconds']:>10.2f}{r['frame_mb']:>12.1f}{r['peak_rss_mb']:>14.1f}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Scaling benchmark for ``parallel``: 1..N worker processes.
+
+Rollups run on an in-memory synthetic frame (10M minutes by default, about
+19 years of data). ``--clean-rows`` also times the raw-file cleaning pipeline
+on a synthetic CSV of that size.
+
+    python bench_parallel.py
+    python bench_parallel.py --rows 2000000 --workers 1 2 4 --clean-rows 2000000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import parallel
+import synthetic
+from rollups import ROLLUP_COLUMNS
+
+
+def synthetic_cleaned(n_rows, seed=0):
+    """Cleaned-shaped frame with just the columns the rollups read (float32)."""
+    rng = np.random.default_rng(seed)
+    frame = {"DateTime": synthetic.START + pd.to_timedelta(np.arange(n_rows), unit="min")}
+    for col in ROLLUP_COLUMNS:
+        frame[col] = rng.gamma(2.0, 1.0, n_rows).astype("float32")
+    return pd.DataFrame(frame)
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _default_workers():
+    n = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= n:
+        counts.append(counts[-1] * 2)
+    return counts if counts[-1] == n else counts + [n]
+
+
+def _report(title, timings):
+    print(f"\n{title}")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    base = timings[0][1]
+    for workers, seconds in timings:
+        print(f"{workers:>8}{seconds:>10.2f}{base / seconds:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows for the rollup benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to try (default 1, 2, 4, ... CPU count)")
+    parser.add_argument("--clean-rows", type=int, default=0, help="Also benchmark cleaning a raw CSV of this many rows")
+    args = parser.parse_args()
+    worker_counts = args.workers or _default_workers()
+
+    print(f"Building {args.rows:,}-row synthetic frame ...")
+    df = synthetic_cleaned(args.rows)
+    timings = [(w, _timed(parallel.parallel_cube, df, w)) for w in worker_counts]
+    _report(f"Rollup cube, {args.rows:,} rows", timings)
+    del df
+
+    if args.clean_rows:
+        workdir = Path(tempfile.mkdtemp(prefix="power_bench_"))
+        try:
+            raw = workdir / "raw.csv"
+            print(f"\nWriting {args.clean_rows:,}-row raw CSV ...")
+            synthetic.write_raw_csv(raw, args.clean_rows)
+            timings = [
+                (w, _timed(parallel.clean_file_parallel, raw, workdir / "cleaned.csv", w))
+                for w in worker_counts
+            ]
+            _report(f"Clean + rollup, {args.clean_rows:,} raw rows", timings)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Streaming version of the cleaning steps in ``clean_and_analysis.ipynb``.
+
+The raw file is read in fixed-size chunks and each chunk is cleaned and
+appended to the output before the next one is read, so peak memory depends on
+``chunk_rows`` and not on the size of the input.
+
+Per chunk, same as the notebook:
+
+- rows with a missing (``'?'``) reading are dropped
+- measurement columns are parsed as numbers
+- ``DateTime`` is built from Date + Time (explicit day-first format)
+- ``Total_sub_metering``, ``hour``, ``Days``, ``Month`` and
+  ``Unmetered_power`` are added, and ``Date`` becomes an ISO date
+
+Usage::
+
+    python cleaning.py household_power_consumption.csv cleaned_dataset.csv
+    python cleaning.py household_power_consumption.txt cleaned.parquet --sep ";"
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from schema import (
+    DAY_NAMES,
+    MEASUREMENT_COLUMNS,
+    MISSING_MARKER,
+    MONTH_NAMES,
+    RAW_COLUMNS,
+    RAW_DATETIME_FORMAT,
+)
+
+CHUNK_ROWS = 250_000
+
+
+def detect_separator(path):
+    """``','`` for the repo's CSV export, ``';'`` for the original UCI text file."""
+    with open(path) as fh:
+        header = fh.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS, sep=None):
+    """Yield raw chunks with measurements already parsed as float64 (``'?'`` -> NaN)."""
+    sep = sep or detect_separator(path)
+    reader = pd.read_csv(
+        path,
+        sep=sep,
+        usecols=RAW_COLUMNS,
+        dtype={"Date": str, "Time": str, **{c: "float64" for c in MEASUREMENT_COLUMNS}},
+        na_values=[MISSING_MARKER],
+        chunksize=chunk_rows,
+    )
+    with reader:
+        yield from reader
+
+
+def parse_datetime(dates, times):
+    """Combine raw ``Date``/``Time`` strings into a datetime64 Series.
+
+    Uses the explicit day-first format rather than ``dayfirst`` inference, and
+    parses each distinct date and time once: a chunk has a handful of dates
+    and at most 1,440 distinct times, so this is far cheaper than parsing
+    every concatenated string.
+    """
+    date_fmt, time_fmt = RAW_DATETIME_FORMAT.split(" ")
+    date_codes, date_uniques = pd.factorize(dates)
+    time_codes, time_uniques = pd.factorize(times)
+    day = pd.to_datetime(date_uniques, format=date_fmt).to_numpy()
+    clock = pd.to_datetime(time_uniques, format=time_fmt)
+    offset = (clock - clock.normalize()).to_numpy()
+    return pd.Series(day[date_codes] + offset[time_codes], index=dates.index)
+
+
+def clean_chunk(chunk):
+    """Apply the notebook's cleaning steps to one raw chunk."""
+    df = chunk.dropna(subset=MEASUREMENT_COLUMNS)
+    stamp = parse_datetime(df["Date"], df["Time"])
+    total = df["Sub_metering_1"] + df["Sub_metering_2"] + df["Sub_metering_3"]
+    return pd.DataFrame({
+        "Date": stamp.dt.normalize(),
+        "Time": df["Time"],
+        **{col: df[col] for col in MEASUREMENT_COLUMNS},
+        "Total_sub_metering": total,
+        "DateTime": stamp,
+        "hour": stamp.dt.hour,
+        "Days": pd.Categorical.from_codes(stamp.dt.dayofweek, categories=DAY_NAMES, ordered=True),
+        "Month": pd.Categorical.from_codes(stamp.dt.month - 1, categories=MONTH_NAMES, ordered=True),
+        # Global_active_power is kW; sub-meters are watt-hours per minute
+        "Unmetered_power": df["Global_active_power"] * 1000 / 60 - total,
+    })
+
+
+def clean_chunks(chunks):
+    """Yield ``(raw, cleaned)`` pairs, one per raw chunk."""
+    for chunk in chunks:
+        yield chunk, clean_chunk(chunk)
+
+
+def _iso_dates(dates):
+    # A chunk spans a handful of days, so format the distinct days only.
+    codes, uniques = pd.factorize(dates)
+    return pd.DatetimeIndex(uniques).strftime("%Y-%m-%d").to_numpy()[codes]
+
+
+def _write_csv(pairs, out_path):
+    # Arrow's CSV writer is several times faster than DataFrame.to_csv and
+    # streams batch by batch into the same file.
+    schema = _arrow_schema(text=True)
+    tmp = Path(f"{out_path}.tmp")
+    options = pacsv.WriteOptions(quoting_style="needed")
+    with pacsv.CSVWriter(tmp, schema, write_options=options) as writer:
+        for _, cleaned in pairs:
+            # Date is written as a bare date, like the notebook's dt.date column.
+            # DateTime is assembled from strings we already have, which is much
+            # cheaper than formatting every timestamp.
+            iso = _iso_dates(cleaned["Date"])
+            cleaned = cleaned.assign(Date=iso, DateTime=iso + " " + cleaned["Time"].to_numpy().astype(str))
+            writer.write_table(pa.Table.from_pandas(cleaned, preserve_index=False).cast(schema))
+            yield
+    os.replace(tmp, out_path)
+
+
+def _arrow_schema(text=False):
+    """Arrow schema of the cleaned output; ``text=True`` for the CSV writer."""
+    label = pa.string() if text else pa.dictionary(pa.int8(), pa.string(), ordered=True)
+    return pa.schema(
+        [("Date", pa.string() if text else pa.date32()), ("Time", pa.string())]
+        + [(col, pa.float64()) for col in MEASUREMENT_COLUMNS]
+        + [
+            ("Total_sub_metering", pa.float64()),
+            ("DateTime", pa.string() if text else pa.timestamp("ns")),
+            ("hour", pa.int8()),
+            ("Days", label),
+            ("Month", label),
+            ("Unmetered_power", pa.float64()),
+        ]
+    )
+
+
+def _write_parquet(pairs, out_path):
+    schema = _arrow_schema()
+    tmp = Path(f"{out_path}.tmp")
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for _, cleaned in pairs:
+            table = pa.Table.from_pandas(cleaned, preserve_index=False)
+            writer.write_table(table.cast(schema))
+            yield
+    os.replace(tmp, out_path)
+
+
+def write_output(pairs, out_path):
+    """Write cleaned chunks from ``(raw, cleaned)`` pairs, yielding after each one.
+
+    The format follows the extension of ``out_path`` (``.parquet`` or CSV).
+    """
+    writer = _write_parquet if str(out_path).endswith(".parquet") else _write_csv
+    yield from writer(pairs, out_path)
+
+
+def clean_file(raw_path, out_path, chunk_rows=CHUNK_ROWS, sep=None, progress=None):
+    """Stream ``raw_path`` through the cleaning steps into ``out_path``.
+
+    The output format follows the extension (``.parquet`` or CSV). The file is
+    written to a temporary name and moved into place at the end, so readers
+    never see a half-written output. Returns ``(rows_in, rows_out)``.
+    """
+    rows = {"in": 0, "out": 0}
+
+    def counted():
+        for raw, cleaned in clean_chunks(read_chunks(raw_path, chunk_rows, sep)):
+            rows["in"] += len(raw)
+            rows["out"] += len(cleaned)
+            yield raw, cleaned
+
+    for _ in write_output(counted(), out_path):
+        if progress:
+            progress(rows["in"], rows["out"])
+    return rows["in"], rows["out"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", help="Raw household power file")
+    parser.add_argument("out", help="Cleaned output (.csv or .parquet)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk (default %(default)s)")
+    parser.add_argument("--sep", help="Field separator of the raw file (detected from the header by default)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(rows_in, rows_out):
+        rate = rows_in / (time.perf_counter() - start)
+        print(f"\r{rows_in:,} rows read, {rows_out:,} kept ({rate:,.0f} rows/s)", end="", flush=True)
+
+    rows_in, rows_out = clean_file(args.raw, args.out, args.chunk_rows, args.sep, progress=report)
+    print(f"\nDropped {rows_in - rows_out:,} rows with missing readings, wrote {args.out} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Typed columnar cache for the household power CSV files.
+
+The first load of a CSV parses it once with explicit dtypes and writes an
+uncompressed Feather (Arrow IPC) copy to ``.cache/`` next to the source file.
+Later loads memory-map that copy instead of re-parsing text and datetimes.
+
+A cache entry is tied to the source file's fingerprint (size, mtime and
+SHA-256). The stat check runs on every load; the hash is only recomputed when
+size or mtime changed, so touching a file without editing it does not trigger
+a rebuild.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from schema import (
+    CLEANED_DTYPES,
+    DAY_NAMES,
+    MISSING_MARKER,
+    MONTH_NAMES,
+    RAW_DTYPES,
+)
+
+CACHE_DIR_NAME = ".cache"
+# Bump when the on-disk layout or dtypes change so stale caches are rebuilt.
+CACHE_FORMAT = 1
+_HASH_BLOCK = 1 << 20
+
+
+def cache_dir_for(csv_path):
+    """Directory holding cache artifacts derived from ``csv_path``."""
+    return Path(csv_path).resolve().parent / CACHE_DIR_NAME
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _meta_path(csv_path):
+    return cache_dir_for(csv_path) / f"{Path(csv_path).stem}.meta.json"
+
+
+def _read_meta(csv_path):
+    try:
+        with open(_meta_path(csv_path)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(csv_path, meta):
+    path = _meta_path(csv_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def fingerprint(csv_path):
+    """Return ``{"size", "mtime_ns", "sha256"}`` for ``csv_path``.
+
+    Reuses the stored hash when size and mtime are unchanged. A recomputed
+    hash is stored too, so files only read through derived stores (no
+    Feather cache) are not rehashed on every call; the Feather cache's
+    fields are kept only if the content is unchanged.
+    """
+    stat = _stat_key(csv_path)
+    meta = _read_meta(csv_path)
+    if meta and all(meta.get(k) == v for k, v in stat.items()):
+        return {**stat, "sha256": meta["sha256"]}
+    fp = {**stat, "sha256": file_sha256(csv_path)}
+    kept = {k: meta[k] for k in ("kind", "format") if k in meta} if meta and meta.get("sha256") == fp["sha256"] else {}
+    _write_meta(csv_path, {**fp, **kept})
+    return fp
+
+
+def dataset_version(csv_path):
+    """Short content hash identifying the current version of ``csv_path``.
+
+    Derived artifacts (rollups, figures, exports) key their caches on this.
+    """
+    return fingerprint(csv_path)["sha256"][:16]
+
+
+def _read_raw_csv(csv_path):
+    return pd.read_csv(csv_path, dtype=RAW_DTYPES, na_values=[MISSING_MARKER])
+
+
+def _typed_cleaned(df):
+    df["DateTime"] = pd.to_datetime(df["DateTime"], format="ISO8601")
+    df["Days"] = df["Days"].cat.set_categories(DAY_NAMES, ordered=True)
+    df["Month"] = df["Month"].cat.set_categories(MONTH_NAMES, ordered=True)
+    return df
+
+
+def _read_cleaned_csv(csv_path):
+    return _typed_cleaned(pd.read_csv(csv_path, dtype=CLEANED_DTYPES))
+
+
+def read_cleaned_chunks(csv_path, chunk_rows):
+    """Yield the cleaned CSV ``chunk_rows`` rows at a time, typed like ``load_cleaned``."""
+    with pd.read_csv(csv_path, dtype=CLEANED_DTYPES, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield _typed_cleaned(chunk)
+
+
+_READERS = {
+    "raw": _read_raw_csv,
+    "cleaned": _read_cleaned_csv,
+}
+
+
+def _build(csv_path, kind, cache_path, fp):
+    df = _READERS[kind](csv_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(".tmp")
+    # Uncompressed so the file can be memory-mapped without a decode pass.
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, cache_path)
+    _write_meta(csv_path, {**fp, "kind": kind, "format": CACHE_FORMAT})
+    return df
+
+
+def load_frame(csv_path, kind):
+    """Load ``csv_path`` as a typed DataFrame, going through the Feather cache.
+
+    ``kind`` is ``"raw"`` or ``"cleaned"`` and selects the dtypes applied when
+    the cache is (re)built.
+    """
+    if kind not in _READERS:
+        raise ValueError(f"Unknown dataset kind {kind!r}, expected one of {sorted(_READERS)}")
+
+    cache_path = cache_dir_for(csv_path) / f"{Path(csv_path).stem}.feather"
+    meta = _read_meta(csv_path)
+    fp = fingerprint(csv_path)
+
+    fresh = (
+        meta is not None
+        and meta.get("sha256") == fp["sha256"]
+        and meta.get("kind") == kind
+        and meta.get("format") == CACHE_FORMAT
+        and cache_path.exists()
+    )
+    if not fresh:
+        return _build(csv_path, kind, cache_path, fp)
+
+    if meta["size"] != fp["size"] or meta["mtime_ns"] != fp["mtime_ns"]:
+        # Same content, new stat (e.g. file copied or touched): just refresh meta.
+        _write_meta(csv_path, {**fp, "kind": kind, "format": CACHE_FORMAT})
+
+    table = feather.read_table(cache_path, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def load_raw(csv_path):
+    return load_frame(csv_path, "raw")
+
+
+def load_cleaned(csv_path):
+    return load_frame(csv_path, "cleaned")
+
+
+def cache_nbytes(csv_path):
+    """Size of the Feather cache for ``csv_path`` in bytes (0 if not built)."""
+    path = cache_dir_for(csv_path) / f"{Path(csv_path).stem}.feather"
+    return path.stat().st_size if path.exists() else 0
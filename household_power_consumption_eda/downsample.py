@@ -0,0 +1,136 @@
+"""Resolution picking and shape-preserving downsampling for time-series charts.
+
+A chart asks for a date range; ``pick_resolution`` chooses the finest of
+minute/hour/day/week whose point count stays under ``max_points``, the series
+is built at that resolution (minutes from the cleaned frame, everything
+coarser from the rollup cube), and ``lttb``/``minmax`` thin it to the plotting
+budget without flattening peaks.
+"""
+
+import numpy as np
+import pandas as pd
+
+import rollups
+
+# Resolution name -> bucket width, finest first
+RESOLUTIONS = {
+    "minute": pd.Timedelta(minutes=1),
+    "hour": pd.Timedelta(hours=1),
+    "day": pd.Timedelta(days=1),
+    "week": pd.Timedelta(weeks=1),
+}
+# A week of minutes (10,080) should still be drawn at minute resolution.
+MAX_POINTS = 20_000
+POINT_BUDGET = 2_000
+
+
+def pick_resolution(start, end, max_points=MAX_POINTS):
+    """Finest resolution with at most ``max_points`` buckets in ``[start, end)``."""
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for name, step in RESOLUTIONS.items():
+        if span / step <= max_points:
+            return name
+    return "week"
+
+
+def total_series(df, cube, start, end, resolution, col="Total_sub_metering"):
+    """Sum of ``col`` per ``resolution`` bucket over ``[start, end)``.
+
+    Minute values are sliced straight out of ``df`` (which is in time order),
+    coarser resolutions are summed from the rollup cube and ignore ``df``.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if resolution == "minute":
+        stamps = df["DateTime"]
+        if stamps.is_monotonic_increasing:
+            lo, hi = stamps.searchsorted([start, end])
+            window = df.iloc[lo:hi]
+        else:
+            window = df[(stamps >= start) & (stamps < end)]
+        return pd.Series(window[col].to_numpy(), index=window["DateTime"].to_numpy())
+
+    in_range = cube[(cube["date"] >= start.normalize()) & (cube["date"] < end)]
+    if resolution == "hour":
+        stamps = in_range["date"] + pd.to_timedelta(in_range["hour"], unit="h")
+        series = pd.Series(in_range[f"{col}_sum"].to_numpy(), index=stamps.to_numpy())
+        return series[(series.index >= start) & (series.index < end)]
+
+    daily = rollups.daily_total(in_range, col)
+    if resolution == "day":
+        return daily
+    return daily.resample("W-MON", label="left", closed="left").sum()
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype("int64").astype("float64")
+    return x.astype("float64")
+
+
+def _buckets(y, n_buckets):
+    """Reshape ``y`` into at most ``n_buckets`` equal-width rows.
+
+    Only the last row is padded (with NaN), so every row holds real points.
+    """
+    width = -(-len(y) // n_buckets)
+    rows = -(-len(y) // width)
+    padded = np.full(rows * width, np.nan)
+    padded[: len(y)] = y
+    return padded.reshape(rows, width), width
+
+
+def minmax(x, y, n_out=POINT_BUDGET):
+    """Indices of the min and max of ``y`` in each of ``n_out // 2`` buckets.
+
+    Keeps every spike and dip, at the cost of a slightly jagged line.
+    """
+    y = _as_float(y)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    grid, width = _buckets(y, max(n_out // 2, 1))
+    offsets = np.arange(grid.shape[0]) * width
+    lo = np.nanargmin(grid, axis=1) + offsets
+    hi = np.nanargmax(grid, axis=1) + offsets
+    return np.unique(np.concatenate([[0], lo, hi, [n - 1]]))
+
+
+def lttb(x, y, n_out=POINT_BUDGET):
+    """Largest-Triangle-Three-Buckets downsampling, returns selected indices.
+
+    Bucket averages and triangle areas are computed with array ops; only the
+    dependency on the previously selected point walks bucket by bucket, so the
+    Python loop is O(n_out) regardless of input size.
+    """
+    xf, yf = _as_float(x), _as_float(y)
+    n = len(yf)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # Interior points split into n_out - 2 buckets; first and last are always kept.
+    xs, width = _buckets(xf[1:-1], n_out - 2)
+    ys, _ = _buckets(yf[1:-1], n_out - 2)
+    n_buckets = xs.shape[0]
+    x_avg = np.append(np.nanmean(xs, axis=1), xf[-1])
+    y_avg = np.append(np.nanmean(ys, axis=1), yf[-1])
+
+    selected = np.empty(n_buckets + 2, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    ax, ay = xf[0], yf[0]
+    for i in range(n_buckets):
+        area = np.abs((ax - x_avg[i + 1]) * (ys[i] - ay) - (ax - xs[i]) * (y_avg[i + 1] - ay))
+        idx = 1 + i * width + int(np.nanargmax(area))
+        selected[i + 1] = idx
+        ax, ay = xf[idx], yf[idx]
+    return selected
+
+
+METHODS = {"LTTB": lttb, "Min/Max": minmax}
+
+
+def downsample(series, n_out=POINT_BUDGET, method="LTTB"):
+    """Thin ``series`` to about ``n_out`` points with the named method."""
+    series = series.dropna()
+    idx = METHODS[method](series.index.to_numpy(), series.to_numpy(), n_out)
+    return series.iloc[idx]
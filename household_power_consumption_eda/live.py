@@ -0,0 +1,232 @@
+"""Live append mode: tail raw meter readings and fold them into the app's views.
+
+A source yields new raw lines in the UCI ``Date;Time;...`` schema (``,``
+separated lines are accepted too): ``FileTail`` follows an append-only
+readings file, ``SocketLines`` reads a local TCP feed such as the one
+``replay.py --port`` serves. ``LiveFeed`` polls the source on a background
+thread, cleans each batch with ``cleaning.clean_chunk`` and folds it into
+
+- the hour x date rollup cube (``rollups.fold_cube``), which every trend view
+  and the Insights peak hour/day are derived from;
+- the correlation statistics (``CorrelationStats.update``);
+- the anomaly ``Detector`` (``Detector.update``);
+- a buffer of the latest minutes for minute-resolution charts.
+
+Nothing already folded is rescanned. Rows at or before the newest minute
+seen so far are counted as stale and dropped, so re-reading a file from the
+start does not double count it.
+
+The app starts a feed when ``POWER_EDA_LIVE`` is set to a file path or
+``tcp://host:port``:
+
+    python replay.py household_power_consumption.csv --to readings.txt --speed 600
+    POWER_EDA_LIVE=readings.txt streamlit run app.py
+"""
+
+import copy
+import io
+import os
+import socket
+import threading
+import time
+
+import pandas as pd
+
+import anomalies
+import cleaning
+import rollups
+from schema import MEASUREMENT_COLUMNS, MISSING_MARKER, RAW_COLUMNS
+
+LIVE_ENV = "POWER_EDA_LIVE"
+REFRESH_ENV = "POWER_EDA_REFRESH"
+DEFAULT_REFRESH = 5.0
+POLL_SECONDS = 0.5
+# Bytes read per poll, so a long backlog is folded in batches instead of one huge frame
+READ_BYTES = 8 << 20
+# Minute rows kept in memory for minute-resolution charts; older minutes live in the cube only
+RECENT_WINDOW = pd.Timedelta(days=7)
+_RAW_DTYPES = {"Date": str, "Time": str, **{col: "float64" for col in MEASUREMENT_COLUMNS}}
+
+
+def refresh_seconds():
+    return float(os.environ.get(REFRESH_ENV) or DEFAULT_REFRESH)
+
+
+class FileTail:
+    """New complete lines of an append-only file, from its start.
+
+    A trailing line without a newline is held back until it is finished; if
+    the file shrinks (rotated or truncated) it is read again from the start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self._partial = b""
+
+    def read(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset, self._partial = 0, b""
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            data = fh.read(min(size - self.offset, READ_BYTES))
+        self.offset += len(data)
+        return self._lines(data)
+
+    def _lines(self, data):
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        return [line.decode() for line in lines if line.strip()]
+
+
+class SocketLines(FileTail):
+    """New complete lines from a TCP feed, reconnecting when it drops."""
+
+    def __init__(self, host, port):
+        self.address = (host, int(port))
+        self._sock = None
+        self._partial = b""
+
+    def read(self):
+        if self._sock is None:
+            try:
+                self._sock = socket.create_connection(self.address, timeout=POLL_SECONDS)
+            except OSError:
+                return []
+            self._sock.setblocking(False)
+        chunks = []
+        while True:
+            try:
+                data = self._sock.recv(1 << 16)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self._sock.close()
+                self._sock = None
+                break
+            chunks.append(data)
+        return self._lines(b"".join(chunks))
+
+
+def open_source(spec):
+    """``FileTail`` for a path, ``SocketLines`` for ``tcp://host:port``."""
+    if spec.startswith("tcp://"):
+        host, port = spec[len("tcp://"):].rsplit(":", 1)
+        return SocketLines(host, port)
+    return FileTail(spec)
+
+
+def parse_lines(lines):
+    """Raw lines -> a raw chunk typed like ``cleaning.read_chunks`` output.
+
+    Header lines are skipped, and so are lines without the nine fields.
+    """
+    lines = [line for line in lines if not line.startswith("Date")]
+    if not lines:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in _RAW_DTYPES.items()})
+    text = "\n".join(lines)
+    sep = ";" if lines[0].count(";") > lines[0].count(",") else ","
+    return pd.read_csv(io.StringIO(text), sep=sep, header=None, names=RAW_COLUMNS, dtype=_RAW_DTYPES,
+                       na_values=[MISSING_MARKER], on_bad_lines="skip")
+
+
+class LiveFeed:
+    """Views of the base data plus everything a source has delivered since.
+
+    ``cube``, ``correlation`` and ``detector`` are the base data's rollup
+    cube, correlation statistics and an anomaly detector seeded with the
+    base's last minutes; ``last_stamp`` is the base's newest minute.
+    ``snapshot()`` returns a consistent view for a page rerun.
+    """
+
+    def __init__(self, source, cube, correlation, detector, last_stamp):
+        self.source = source
+        self.cube = cube
+        self.correlation = correlation
+        self.detector = detector
+        self.intervals = detector.intervals.iloc[:0]
+        self.recent = None
+        self.last_stamp = last_stamp
+        self.revision = 0
+        self.rows = 0
+        self.stale = 0
+        self.error = None
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fold(self, lines):
+        """Clean ``lines`` and fold them into every view; returns the rows added."""
+        cleaned = cleaning.clean_chunk(parse_lines(lines))
+        if not cleaned["DateTime"].is_monotonic_increasing:
+            cleaned = cleaned.sort_values("DateTime", kind="stable")
+        fresh = cleaned["DateTime"] > self.last_stamp if self.last_stamp is not None else slice(None)
+        new = cleaned[fresh].reset_index(drop=True)
+        self.stale += len(cleaned) - len(new)
+        if new.empty:
+            return 0
+
+        # Every view is computed aside and swapped in together, so a batch that fails
+        # leaves the feed as it was. The detector keeps state, so it goes last.
+        cube = rollups.fold_cube(self.cube, new)
+        correlation = copy.deepcopy(self.correlation).update(new)
+        recent = new if self.recent is None else pd.concat([self.recent, new], ignore_index=True)
+        recent = recent[recent["DateTime"] > new["DateTime"].iloc[-1] - RECENT_WINDOW]
+        intervals = anomalies.merge_intervals(self.intervals, self.detector.update(new))
+        with self._lock:
+            self.cube = cube
+            self.correlation = correlation
+            self.intervals = intervals
+            self.recent = recent
+            self.last_stamp = new["DateTime"].iloc[-1]
+            self.rows += len(new)
+            self.revision += 1
+        return len(new)
+
+    def poll(self):
+        lines = self.source.read()
+        return self.fold(lines) if lines else 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                added = self.poll()
+            except Exception as exc:  # a bad batch must not kill the feed
+                self.error = f"{type(exc).__name__}: {exc}"
+                added = 0
+            if not added:
+                self._stop.wait(POLL_SECONDS)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="power-live-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def snapshot(self):
+        """``(revision, cube, intervals, recent minutes)`` as of the last fold."""
+        with self._lock:
+            return self.revision, self.cube, self.intervals, self.recent
+
+    def correlation_matrix(self):
+        with self._lock:
+            return self.correlation.corr()
+
+    def describe(self):
+        rate = self.rows / max(time.monotonic() - self.started, 1e-9)
+        newest = "—" if self.last_stamp is None else f"{self.last_stamp:%Y-%m-%d %H:%M}"
+        text = f"Live: {self.rows:,} new rows ({rate:,.0f}/s), {self.stale:,} stale · newest {newest}"
+        return text if self.error is None else f"{text} · last error: {self.error}"
@@ -0,0 +1,213 @@
+"""Process-pool execution for cleaning and rollups.
+
+Per-period work on the household data is independent, so it is farmed out to
+worker processes that each return sum/count/min/max partials
+(``rollups.build_cube``); the parent merges them with ``rollups.merge_cubes``.
+
+- ``parallel_cube`` partitions an in-memory cleaned frame by month.
+- ``store_cube`` does the same over the monthly files of a partitioned store.
+- ``clean_file_parallel`` reads the raw file in chunks (reading stays
+  sequential), cleans each chunk in a worker, writes the cleaned rows in input
+  order and returns the merged rollup cube built along the way.
+
+The worker count comes from the ``workers`` argument, then the
+``POWER_EDA_WORKERS`` environment variable, then ``os.cpu_count()`` (the app
+defaults to 1 instead, so its pool is opt-in). ``workers=1`` runs everything
+in-process with no pool. Pools started from a multithreaded process, such as
+the Streamlit server, should pass ``mp_context=server_context()``: forking a
+process with running threads can deadlock.
+
+Usage::
+
+    python parallel.py household_power_consumption.csv cleaned_dataset.csv --workers 8
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow.feather as feather
+
+import cleaning
+import rollups
+
+WORKERS_ENV = "POWER_EDA_WORKERS"
+
+
+def resolve_workers(workers=None, default=None):
+    if workers is None:
+        workers = os.environ.get(WORKERS_ENV) or default or os.cpu_count() or 1
+    workers = int(workers)
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    return workers
+
+
+def server_context():
+    """A start method that does not fork the calling process (forkserver, else spawn)."""
+    return mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+
+
+def month_rows(df):
+    """Row positions of ``df`` per calendar month, in month order.
+
+    Time-ordered frames (the normal case) give contiguous ``slice`` objects,
+    which are cheap to send to a worker; otherwise index arrays.
+    """
+    if df.empty:
+        return []
+    month = df["DateTime"].to_numpy().astype("datetime64[M]")
+    if (month[1:] >= month[:-1]).all():
+        bounds = np.concatenate([[0], np.flatnonzero(month[1:] != month[:-1]) + 1, [len(month)]])
+        return [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    order = np.argsort(month, kind="stable")
+    ordered = month[order]
+    return np.split(order, np.flatnonzero(ordered[1:] != ordered[:-1]) + 1)
+
+
+def partition_by_month(df):
+    """Yield the rows of ``df`` one calendar month at a time."""
+    for rows in month_rows(df):
+        yield df.iloc[rows]
+
+
+# Frame shared with forked workers; they inherit it copy-on-write instead of
+# receiving a pickled copy of every partition.
+_shared_frame = None
+
+
+def _cube_for_rows(rows):
+    return rollups.build_cube(_shared_frame.iloc[rows])
+
+
+def parallel_cube(df, workers=None, mp_context=None):
+    """``rollups.build_cube(df)`` computed month by month across ``workers`` processes.
+
+    Forks by default so workers share ``df``; with another ``mp_context`` each
+    month is pickled to its worker instead.
+    """
+    global _shared_frame
+    workers = resolve_workers(workers)
+    if workers == 1:
+        return rollups.build_cube(df)
+    if mp_context is not None or "fork" not in mp.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            return rollups.merge_cubes(list(pool.map(rollups.build_cube, partition_by_month(df))))
+
+    _shared_frame = df
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+            partials = list(pool.map(_cube_for_rows, month_rows(df)))
+    finally:
+        _shared_frame = None
+    return rollups.merge_cubes(partials)
+
+
+def _cube_for_partition(task):
+    path, columns = task
+    return rollups.build_cube(feather.read_feather(path, columns=columns, memory_map=True))
+
+
+def store_cube(store, household=None, workers=None, mp_context=None):
+    """``rollups.build_cube`` over the partitions of a ``partitioned.Store``.
+
+    Each task reads one partition itself, so only the small per-month cubes
+    travel between processes and at most ``workers`` months are in memory.
+    """
+    columns = [col for col in ["DateTime"] + rollups.ROLLUP_COLUMNS if col in store.columns]
+    tasks = [(store.root / part["path"], columns) for part in store.select(household=household)]
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    if workers == 1:
+        partials = list(map(_cube_for_partition, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            partials = list(pool.map(_cube_for_partition, tasks))
+    return rollups.merge_cubes(partials)
+
+
+def _clean_and_rollup(chunk):
+    cleaned = cleaning.clean_chunk(chunk)
+    return len(chunk), cleaned, rollups.build_cube(cleaned)
+
+
+def _bounded_map(pool, fn, items, window):
+    """Like ``pool.map`` but keeps at most ``window`` tasks in flight, in order.
+
+    ``Executor.map`` submits the whole iterable up front, which would pull the
+    entire raw file into memory.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def clean_file_parallel(raw_path, out_path, workers=None, chunk_rows=cleaning.CHUNK_ROWS, sep=None, progress=None):
+    """Parallel ``cleaning.clean_file`` that also returns the rollup cube.
+
+    Returns ``(rows_in, rows_out, cube)``.
+    """
+    workers = resolve_workers(workers)
+    chunks = cleaning.read_chunks(raw_path, chunk_rows, sep)
+    rows = {"in": 0, "out": 0}
+    partials = []
+
+    def pairs(results):
+        for n_raw, cleaned, cube in results:
+            rows["in"] += n_raw
+            rows["out"] += len(cleaned)
+            partials.append(cube)
+            yield None, cleaned
+
+    if workers == 1:
+        results = map(_clean_and_rollup, chunks)
+        for _ in cleaning.write_output(pairs(results), out_path):
+            if progress:
+                progress(rows["in"], rows["out"])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = _bounded_map(pool, _clean_and_rollup, chunks, window=2 * workers)
+            for _ in cleaning.write_output(pairs(results), out_path):
+                if progress:
+                    progress(rows["in"], rows["out"])
+
+    # Chunks straddle hour boundaries, so partials may overlap; merge combines them.
+    return rows["in"], rows["out"], rollups.merge_cubes(partials)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", help="Raw household power file")
+    parser.add_argument("out", help="Cleaned output (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, help=f"Worker processes (default ${WORKERS_ENV} or CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=cleaning.CHUNK_ROWS, help="Rows per chunk (default %(default)s)")
+    parser.add_argument("--sep", help="Field separator of the raw file (detected from the header by default)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    workers = resolve_workers(args.workers)
+
+    def report(rows_in, rows_out):
+        rate = rows_in / (time.perf_counter() - start)
+        print(f"\r{rows_in:,} rows read, {rows_out:,} kept ({rate:,.0f} rows/s)", end="", flush=True)
+
+    rows_in, rows_out, cube = clean_file_parallel(
+        args.raw, args.out, workers, args.chunk_rows, args.sep, progress=report
+    )
+    if not str(args.out).endswith(".parquet"):
+        # Saves the app from rebuilding the rollups on first load
+        rollups.save_cube(args.out, cube)
+    print(f"\nDropped {rows_in - rows_out:,} rows with missing readings, wrote {args.out} "
+          f"with {workers} worker(s) in {time.perf_counter() - start:.1f}s "
+          f"({len(cube):,} hourly rollup rows)")
+
+
+if __name__ == "__main__":
+    main()
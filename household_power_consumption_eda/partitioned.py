@@ -0,0 +1,306 @@
+"""Date-partitioned on-disk store for cleaned household power data.
+
+Layout::
+
+    <root>/manifest.json
+    <root>/household=<id>/<YYYY-MM>.feather
+
+Each household/month is one uncompressed Feather file with rows in time
+order. ``manifest.json`` lists every partition with its row count and the
+min/max of each numeric and datetime column. A read is pruned on the manifest
+alone: only partitions overlapping the requested dates (and household) are
+opened, they are memory-mapped, and only the requested columns are turned
+into pandas. Pages asking about one month touch one file per household,
+however many years the store holds.
+
+The app builds a store for ``cleaned_dataset.csv`` under ``.cache/`` (rebuilt
+when the CSV changes), or opens the store named by ``POWER_EDA_STORE``:
+
+    store = partitioned.ensure_store("cleaned_dataset.csv")
+    june = store.read("2008-06-01", "2008-07-01", ["DateTime", "Voltage"])
+    for part in store.scan(columns=["DateTime", "Global_active_power"]):
+        ...
+
+Stores holding several households are built from one cleaned file each,
+streamed in chunks so the input never has to fit in memory:
+
+    python partitioned.py cleaned_house1.csv power_store --household 1
+    python partitioned.py cleaned_house2.csv power_store --household 2
+    POWER_EDA_STORE=power_store streamlit run app.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+import data_cache
+import parallel
+
+MANIFEST = "manifest.json"
+# Bump when the layout or manifest fields change so stale stores are rebuilt.
+STORE_FORMAT = 1
+STORE_ENV = "POWER_EDA_STORE"
+DEFAULT_HOUSEHOLD = "1"
+CHUNK_ROWS = 500_000
+
+
+def _month_name(stamp):
+    return pd.Timestamp(stamp).strftime("%Y-%m")
+
+
+def _stat(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _stats(df):
+    """Per-column ``(min, max)`` of the numeric and datetime columns, JSON-ready."""
+    lo, hi = {}, {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            lo[col], hi[col] = _stat(series.min()), _stat(series.max())
+    return lo, hi
+
+
+def _concat(frames):
+    """``pd.concat`` that keeps per-partition categoricals categorical."""
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    columns = {}
+    for col in frames[0].columns:
+        parts = [frame[col] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[col] = pd.api.types.union_categoricals(parts)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+class Store:
+    """Reader over a partitioned store; see the module docstring for the layout."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        with open(self.root / MANIFEST) as fh:
+            self.manifest = json.load(fh)
+        self.columns = self.manifest["columns"]
+        self.partitions = sorted(self.manifest["partitions"], key=lambda p: (p["household"], p["month"]))
+        # Derived caches (rollups, figures) key on this; it changes with any partition
+        self.version = hashlib.sha256(json.dumps(self.manifest, sort_keys=True).encode()).hexdigest()[:16]
+
+    @property
+    def households(self):
+        return sorted({p["household"] for p in self.partitions})
+
+    @property
+    def numeric_columns(self):
+        """Columns with min/max statistics, minus ``DateTime``: what ``select_dtypes("number")`` picks."""
+        stats = {col for part in self.partitions for col in part["min"]}
+        return [col for col in self.columns if col in stats and col != "DateTime"]
+
+    def _matching(self, household):
+        return [p for p in self.partitions if household is None or p["household"] == str(household)]
+
+    def n_rows(self, household=None):
+        return sum(p["rows"] for p in self._matching(household))
+
+    def bounds(self, col="DateTime", household=None):
+        """``(min, max)`` of ``col`` from the manifest, without opening any partition."""
+        lo = [p["min"][col] for p in self._matching(household) if p["min"].get(col) is not None]
+        hi = [p["max"][col] for p in self._matching(household) if p["max"].get(col) is not None]
+        if not lo:
+            return None, None
+        if col == "DateTime":
+            return pd.Timestamp(min(lo)), pd.Timestamp(max(hi))
+        return min(lo), max(hi)
+
+    def select(self, start=None, end=None, household=None):
+        """Partitions holding rows in ``[start, end)``, in household then time order."""
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        return [
+            p for p in self._matching(household)
+            if (start is None or pd.Timestamp(p["max"]["DateTime"]) >= start)
+            and (end is None or pd.Timestamp(p["min"]["DateTime"]) < end)
+        ]
+
+    def _read(self, part, columns, start, end):
+        table = feather.read_table(self.root / part["path"], memory_map=True)
+        inside = (start is None or pd.Timestamp(part["min"]["DateTime"]) >= start) and \
+                 (end is None or pd.Timestamp(part["max"]["DateTime"]) < end)
+        if not inside:
+            # Rows are in time order: cut the date range with two binary searches
+            stamps = table.column("DateTime").to_numpy()
+            lo = 0 if start is None else np.searchsorted(stamps, start.to_datetime64(), side="left")
+            hi = len(stamps) if end is None else np.searchsorted(stamps, end.to_datetime64(), side="left")
+            table = table.slice(lo, hi - lo)
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+
+    def head(self, n=5, household=None):
+        """The first ``n`` rows of ``household`` (default all), read from its first partition alone."""
+        parts = self._matching(household)
+        if not parts:
+            return pd.DataFrame(columns=self.columns)
+        return feather.read_table(self.root / parts[0]["path"], memory_map=True).slice(0, n).to_pandas()
+
+    def scan(self, start=None, end=None, columns=None, household=None):
+        """Yield one frame per matching partition, restricted to ``[start, end)`` and ``columns``."""
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        for part in self.select(start, end, household):
+            yield self._read(part, columns, start, end)
+
+    def read(self, start=None, end=None, columns=None, household=None):
+        """Rows in ``[start, end)`` of ``household`` (default all) as one frame.
+
+        Only partitions overlapping the range are opened, and only ``columns``
+        (default all) are materialized.
+        """
+        frames = list(self.scan(start, end, columns, household))
+        if not frames:
+            return pd.DataFrame(columns=self.columns if columns is None else columns)
+        return _concat(frames)
+
+
+def _write_month(root, household, month, frames):
+    df = _concat(frames)
+    if not df["DateTime"].is_monotonic_increasing:
+        df = df.sort_values("DateTime", kind="stable", ignore_index=True)
+    path = Path(f"household={household}") / f"{month}.feather"
+    (root / path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = (root / path).with_suffix(".tmp")
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, root / path)
+    lo, hi = _stats(df)
+    return {"household": household, "month": month, "path": path.as_posix(), "rows": len(df), "min": lo, "max": hi}
+
+
+def _read_manifest(root):
+    try:
+        with open(root / MANIFEST) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(root, manifest):
+    tmp = root / f"{MANIFEST}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(manifest, fh, indent=1)
+    os.replace(tmp, root / MANIFEST)
+
+
+def write_household(chunks, root, household=DEFAULT_HOUSEHOLD, source=None, progress=None):
+    """Partition cleaned ``chunks`` into ``root`` as ``household``, replacing its old partitions.
+
+    Rows are buffered per month and a month is written once the chunks have
+    moved past it, so time-ordered input holds about one month in memory. A
+    month that shows up again later (unordered input) is merged with what was
+    already written. Returns the opened ``Store``.
+    """
+    root, household = Path(root), str(household)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(root) or {"format": STORE_FORMAT, "columns": None, "sources": {}, "partitions": []}
+    manifest["partitions"] = [p for p in manifest["partitions"] if p["household"] != household]
+    shutil.rmtree(root / f"household={household}", ignore_errors=True)
+
+    written, pending, rows = {}, {}, 0
+
+    def flush(month):
+        frames = pending.pop(month)
+        if month in written:
+            frames = [feather.read_feather(root / written[month]["path"])] + frames
+        written[month] = _write_month(root, household, month, frames)
+
+    for chunk in chunks:
+        if manifest["columns"] is None:
+            manifest["columns"] = list(chunk.columns)
+        for part in parallel.month_rows(chunk):
+            frame = chunk.iloc[part]
+            pending.setdefault(_month_name(frame["DateTime"].iloc[0]), []).append(frame)
+        if len(chunk):
+            current = _month_name(chunk["DateTime"].iloc[-1])
+            for month in [m for m in pending if m < current]:
+                flush(month)
+        rows += len(chunk)
+        if progress:
+            progress(rows)
+    for month in sorted(pending):
+        flush(month)
+
+    manifest["partitions"] += list(written.values())
+    manifest["sources"][household] = source
+    _write_manifest(root, manifest)
+    return Store(root)
+
+
+def store_dir_for(csv_path):
+    return data_cache.cache_dir_for(csv_path) / f"{Path(csv_path).stem}.store"
+
+
+def ensure_store(csv_path, household=DEFAULT_HOUSEHOLD, chunk_rows=CHUNK_ROWS):
+    """The store derived from the current version of ``csv_path``, built if missing or stale."""
+    root = store_dir_for(csv_path)
+    version = data_cache.dataset_version(csv_path)
+    manifest = _read_manifest(root)
+    if manifest and manifest.get("format") == STORE_FORMAT and manifest["sources"].get(str(household)) == version:
+        return Store(root)
+    shutil.rmtree(root, ignore_errors=True)
+    return write_household(data_cache.read_cleaned_chunks(csv_path, chunk_rows), root, household, source=version)
+
+
+def open_store(csv_path=None):
+    """The store named by ``POWER_EDA_STORE`` if set, else ``ensure_store(csv_path)``."""
+    root = os.environ.get(STORE_ENV)
+    return Store(root) if root else ensure_store(csv_path)
+
+
+def store_key(csv_path=None):
+    """A cheap key that changes whenever ``open_store(csv_path)`` would open a different store.
+
+    The path and manifest mtime of a ``POWER_EDA_STORE`` store (its manifest is
+    rewritten whenever a household is rebuilt), else the CSV's content hash.
+    """
+    root = os.environ.get(STORE_ENV)
+    if root:
+        return f"{Path(root).resolve()}@{os.stat(Path(root) / MANIFEST).st_mtime_ns}"
+    return data_cache.dataset_version(csv_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cleaned", help="Cleaned household power CSV")
+    parser.add_argument("root", help="Store directory (created if missing)")
+    parser.add_argument("--household", default=DEFAULT_HOUSEHOLD, help="Household id (default %(default)s)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk (default %(default)s)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(rows):
+        rate = rows / (time.perf_counter() - start)
+        print(f"\r{rows:,} rows partitioned ({rate:,.0f} rows/s)", end="", flush=True)
+
+    store = write_household(data_cache.read_cleaned_chunks(args.cleaned, args.chunk_rows), args.root,
+                            args.household, source=data_cache.dataset_version(args.cleaned), progress=report)
+    months = len(store.select(household=args.household))
+    print(f"\nWrote {months} monthly partitions for household {args.household} to {args.root} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Replay a raw household power file as a live meter feed, for load-testing live mode.
+
+Rows are emitted in the UCI ``Date;Time;...`` schema, paced by their
+timestamps: ``--speed 60`` plays one minute of readings per second,
+``--speed 0`` as fast as the reader can take them. ``--start`` re-stamps the
+rows so the feed continues after the data the app already has. Output is
+appended to a readings file (``--to``) or served to one client on a local
+TCP port (``--port``), the two sources ``live.py`` understands.
+
+    python replay.py household_power_consumption.csv --to readings.txt --speed 600 --start 2007-01-28
+    python replay.py household_power_consumption.csv --port 9999 --speed 0 --rows 1000000
+    POWER_EDA_LIVE=tcp://127.0.0.1:9999 streamlit run app.py
+"""
+
+import argparse
+import socket
+import time
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+from schema import RAW_COLUMNS
+
+CHUNK_ROWS = 50_000
+# Longest pause between two sends, so progress and pacing stay smooth
+TICK_SECONDS = 0.1
+
+
+def read_lines(path, chunk_rows=CHUNK_ROWS, sep=None):
+    """Yield raw chunks as strings (``'?'`` kept) together with their parsed timestamps."""
+    sep = sep or cleaning.detect_separator(path)
+    with pd.read_csv(path, sep=sep, usecols=RAW_COLUMNS, dtype=str, keep_default_na=False,
+                     chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk[RAW_COLUMNS], cleaning.parse_datetime(chunk["Date"], chunk["Time"]).to_numpy()
+
+
+def restamp(chunk, stamps):
+    """``chunk`` with Date/Time rewritten from ``stamps``.
+
+    Like ``cleaning._iso_dates``, each distinct day and time of day is
+    formatted once.
+    """
+    days = stamps.astype("datetime64[D]")
+    day_codes, day_uniques = pd.factorize(days)
+    seconds = (stamps - days) // np.timedelta64(1, "s")
+    time_codes, time_uniques = pd.factorize(seconds)
+    times = np.array([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in time_uniques])
+    return chunk.assign(Date=pd.DatetimeIndex(day_uniques).strftime("%d/%m/%Y").to_numpy()[day_codes],
+                        Time=times[time_codes])
+
+
+def to_lines(chunk):
+    """``;``-joined lines, newline-terminated, as one bytes block."""
+    lines = chunk[RAW_COLUMNS[0]].str.cat([chunk[col] for col in RAW_COLUMNS[1:]], sep=";")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class FileSink:
+    def __init__(self, path):
+        self._fh = open(path, "ab")
+
+    def send(self, data):
+        self._fh.write(data)
+        self._fh.flush()
+
+    def close(self):
+        self._fh.close()
+
+
+class SocketSink:
+    """Serves the feed to the first client that connects to ``127.0.0.1:port``."""
+
+    def __init__(self, port):
+        server = socket.create_server(("127.0.0.1", port))
+        print(f"Waiting for a reader on tcp://127.0.0.1:{port} ...", flush=True)
+        self._conn, _ = server.accept()
+        server.close()
+
+    def send(self, data):
+        self._conn.sendall(data)
+
+    def close(self):
+        self._conn.close()
+
+
+def replay(path, sink, speed=60.0, start=None, rows=None, sep=None, progress=None):
+    """Send the rows of ``path`` to ``sink`` paced at ``speed`` x real time; returns rows sent."""
+    sent, clock, first, shift = 0, time.perf_counter(), None, None
+    for chunk, stamps in read_lines(path, sep=sep):
+        if rows is not None:
+            chunk, stamps = chunk.iloc[:rows - sent], stamps[:rows - sent]
+        if first is None and len(stamps):
+            shift = np.datetime64(pd.Timestamp(start), "ns") - stamps[0] if start else np.timedelta64(0, "ns")
+            first = stamps[0] + shift
+        if start:
+            stamps = stamps + shift
+            chunk = restamp(chunk, stamps)
+        # Seconds after the replay started at which each row is due
+        due = (stamps - first) / np.timedelta64(1, "s") / speed if speed else np.zeros(len(stamps))
+        lo = 0
+        while lo < len(chunk):
+            elapsed = time.perf_counter() - clock
+            hi = int(np.searchsorted(due, elapsed, side="right"))
+            if hi > lo:
+                sink.send(to_lines(chunk.iloc[lo:hi]))
+                sent += hi - lo
+                lo = hi
+                if progress:
+                    progress(sent)
+            else:
+                time.sleep(min(due[lo] - elapsed, TICK_SECONDS))
+        if rows is not None and sent >= rows:
+            break
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", help="Raw household power file (.csv or the UCI ; separated .txt)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--to", help="Readings file to append to")
+    target.add_argument("--port", type=int, help="Serve the feed on this local TCP port")
+    parser.add_argument("--speed", type=float, default=60.0,
+                        help="Data minutes per wall-clock minute, 0 for no pacing (default %(default)s)")
+    parser.add_argument("--start", help="Re-stamp the rows to begin at this timestamp")
+    parser.add_argument("--rows", type=int, help="Stop after this many rows")
+    parser.add_argument("--sep", help="Field separator of the raw file (detected from the header by default)")
+    args = parser.parse_args()
+
+    sink = FileSink(args.to) if args.to else SocketSink(args.port)
+    start = time.perf_counter()
+
+    def report(rows):
+        rate = rows / (time.perf_counter() - start)
+        print(f"\r{rows:,} rows sent ({rate:,.0f} rows/s)", end="", flush=True)
+
+    try:
+        sent = replay(args.raw, sink, args.speed, args.start, args.rows, args.sep, progress=report)
+    finally:
+        sink.close()
+    print(f"\nReplayed {sent:,} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Hour x date rollup cube for the Energy Trends and Insights pages.
+
+The cube holds one row per (date, hour) with sum/count/min/max partials for
+every measurement column. Hourly, daily, weekday and monthly views are all
+derived from those partials, so a page switch touches ~35k cube rows instead
+of the ~1M minute rows.
+
+Cubes are persisted to ``.cache/`` next to the cleaned CSV, one file per
+dataset version.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+import data_cache
+from schema import DAY_NAMES, MEASUREMENT_COLUMNS
+
+ROLLUP_COLUMNS = MEASUREMENT_COLUMNS + ["Total_sub_metering", "Unmetered_power"]
+STATS = ("sum", "count", "min", "max")
+
+
+def _columns(df):
+    return [c for c in ROLLUP_COLUMNS if c in df.columns]
+
+
+def build_cube(df):
+    """Aggregate a cleaned frame to hour x date partials.
+
+    Returns a frame with ``date`` (datetime64, midnight), ``hour`` (int8) and
+    ``<col>_sum``/``_count``/``_min``/``_max`` for each measurement column.
+    """
+    cols = _columns(df)
+    # One datetime64[h] key is much cheaper to group on than (Date, hour).
+    key = df["DateTime"].to_numpy().astype("datetime64[h]")
+    if len(key) and (key[1:] >= key[:-1]).all():
+        parts, hours = _reduce_sorted(df, cols, key)
+    else:
+        parts, hours = _reduce_grouped(df, cols, key)
+
+    cube = pd.DataFrame({f"{col}_{stat}": parts[stat][col] for col in cols for stat in STATS})
+    stamp = pd.DatetimeIndex(hours.astype("datetime64[ns]"))
+    cube.insert(0, "hour", stamp.hour.astype("int8"))
+    cube.insert(0, "date", stamp.normalize())
+    return cube
+
+
+def _reduce_sorted(df, cols, key):
+    # Time-ordered input (the normal case): each hour is a contiguous run, so
+    # the partials are ufunc reductions over run boundaries, no hashing.
+    starts = np.concatenate([[0], np.flatnonzero(key[1:] != key[:-1]) + 1])
+    parts = {stat: {} for stat in STATS}
+    for col in cols:
+        values = df[col].to_numpy()
+        missing = np.isnan(values)
+        parts["sum"][col] = np.add.reduceat(np.where(missing, 0, values).astype("float64"), starts)
+        parts["count"][col] = np.add.reduceat(~missing, starts, dtype="int32")
+        # fmin/fmax skip NaN like pandas min/max do
+        parts["min"][col] = np.fmin.reduceat(values, starts)
+        parts["max"][col] = np.fmax.reduceat(values, starts)
+    return parts, key[starts]
+
+
+def _reduce_grouped(df, cols, key):
+    grouped = df[cols].groupby(key, sort=True)
+    parts = {
+        "sum": grouped.sum().astype("float64"),
+        "count": grouped.count().astype("int32"),
+        "min": grouped.min(),
+        "max": grouped.max(),
+    }
+    hours = parts["sum"].index.to_numpy()
+    return {stat: {col: frame[col].to_numpy() for col in cols} for stat, frame in parts.items()}, hours
+
+
+def merge_cubes(cubes):
+    """Combine cubes built from disjoint or overlapping row sets."""
+    stacked = pd.concat(cubes, ignore_index=True)
+    cols = sorted({c.rsplit("_", 1)[0] for c in stacked.columns if c not in ("date", "hour")},
+                  key=ROLLUP_COLUMNS.index)
+    agg = {}
+    for col in cols:
+        agg[f"{col}_sum"] = "sum"
+        agg[f"{col}_count"] = "sum"
+        agg[f"{col}_min"] = "min"
+        agg[f"{col}_max"] = "max"
+    merged = stacked.groupby(["date", "hour"], sort=True).agg(agg).reset_index()
+    merged["hour"] = merged["hour"].astype("int8")
+    return merged
+
+
+def fold_cube(cube, df):
+    """Add the minutes in ``df`` (newly arrived rows) to ``cube``.
+
+    Only cube rows from the first hour of ``df`` onwards are regrouped with
+    the new partials; everything earlier is kept as it is, so folding the
+    latest minutes costs about as much as the hours they touch.
+    """
+    if len(df) == 0:
+        return cube
+    delta = build_cube(df)
+    if cube is None or cube.empty:
+        return delta
+    first = delta["date"].iloc[0] + pd.Timedelta(hours=int(delta["hour"].iloc[0]))
+    later = (cube["date"] + pd.to_timedelta(cube["hour"], unit="h") >= first).to_numpy()
+    if not later.any():
+        return pd.concat([cube, delta], ignore_index=True)
+    return pd.concat([cube[~later], merge_cubes([cube[later], delta])], ignore_index=True)
+
+
+def _cube_path(csv_path, version):
+    return data_cache.cache_dir_for(csv_path) / f"{Path(csv_path).stem}.rollup.{version}.feather"
+
+
+def _save(path, stale_pattern, cube):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for stale in path.parent.glob(stale_pattern):
+        stale.unlink()
+    tmp = path.with_suffix(".tmp")
+    feather.write_feather(cube, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def save_cube(csv_path, cube):
+    """Persist ``cube`` as the rollup of the current version of ``csv_path``."""
+    path = _cube_path(csv_path, data_cache.dataset_version(csv_path))
+    _save(path, f"{Path(csv_path).stem}.rollup.*.feather", cube)
+
+
+def load_cube(csv_path, df=None, workers=1, mp_context=None):
+    """Return the rollup cube for the current version of ``csv_path``.
+
+    Reads the persisted cube if one exists for this version, otherwise builds
+    it from ``df`` (or the cached cleaned frame) and saves it, removing cubes
+    left behind by older versions. With ``workers > 1`` the build is split by
+    month across a process pool started with ``mp_context`` (see
+    ``parallel.parallel_cube``).
+    """
+    path = _cube_path(csv_path, data_cache.dataset_version(csv_path))
+    if path.exists():
+        return feather.read_feather(path)
+
+    if df is None:
+        df = data_cache.load_cleaned(csv_path)
+    if workers == 1:
+        cube = build_cube(df)
+    else:
+        import parallel  # parallel imports this module
+
+        cube = parallel.parallel_cube(df, workers, mp_context)
+    save_cube(csv_path, cube)
+    return cube
+
+
+def load_store_cube(store, household, workers=1, mp_context=None):
+    """Return the rollup cube of one household of a ``partitioned.Store``.
+
+    Built one partition at a time (across ``workers`` processes started with
+    ``mp_context``, see ``parallel.store_cube``) and kept inside the store per
+    store version.
+    """
+    path = store.root / f"rollup.{household}.{store.version}.feather"
+    if path.exists():
+        return feather.read_feather(path)
+
+    import parallel  # parallel imports this module
+
+    cube = parallel.store_cube(store, household, workers, mp_context)
+    _save(path, f"rollup.{household}.*.feather", cube)
+    return cube
+
+
+# ---------------------
+# Views
+# ---------------------
+def _mean_by(cube, key, col):
+    grouped = cube.groupby(key)[[f"{col}_sum", f"{col}_count"]].sum()
+    return grouped[f"{col}_sum"] / grouped[f"{col}_count"]
+
+
+def hourly_mean(cube, col="Total_sub_metering"):
+    """Mean per hour of day (0-23), same as ``df.groupby('hour')[col].mean()``."""
+    return _mean_by(cube, "hour", col).rename_axis("hour")
+
+
+def daily_total(cube, col="Total_sub_metering"):
+    """Total per calendar date, same as ``df.groupby('Date')[col].sum()``."""
+    return cube.groupby("date")[f"{col}_sum"].sum().rename_axis("Date")
+
+
+def daily_max(cube, col="Total_sub_metering"):
+    """Per-minute maximum within each calendar date."""
+    return cube.groupby("date")[f"{col}_max"].max().rename_axis("Date")
+
+
+def weekday_mean(cube, col="Total_sub_metering"):
+    """Mean per day of week, Monday first, indexed by day name."""
+    means = _mean_by(cube, cube["date"].dt.dayofweek, col)
+    return pd.Series(means.reindex(range(7)).to_numpy(), index=pd.Index(DAY_NAMES, name="DateTime"))
+
+
+def monthly_mean(cube, col="Total_sub_metering"):
+    """Mean per calendar month, indexed by month number (1-12)."""
+    return _mean_by(cube, cube["date"].dt.month, col).rename_axis("DateTime")
+
+
+def peak_hour(cube, col="Total_sub_metering"):
+    return int(hourly_mean(cube, col).idxmax())
+
+
+def high_day(cube, col="Total_sub_metering"):
+    return daily_total(cube, col).idxmax().date()
@@ -0,0 +1,58 @@
+"""Column layout and dtypes of the household power consumption files.
+
+The raw file is the UCI minute-level export (Date, Time and seven measurements,
+``'?'`` for missing readings). The cleaned file is what ``clean_and_analysis.ipynb``
+writes to ``cleaned_dataset.csv``.
+"""
+
+RAW_FILE = "household_power_consumption.csv"
+CLEANED_FILE = "cleaned_dataset.csv"
+
+# Raw dates are day-first (16/12/2006), the notebook parsed them with dayfirst=True.
+RAW_DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+MISSING_MARKER = "?"
+
+MEASUREMENT_COLUMNS = [
+    "Global_active_power",
+    "Global_reactive_power",
+    "Voltage",
+    "Global_intensity",
+    "Sub_metering_1",
+    "Sub_metering_2",
+    "Sub_metering_3",
+]
+
+RAW_COLUMNS = ["Date", "Time"] + MEASUREMENT_COLUMNS
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+# Same column order as the notebook's df.to_csv('cleaned_dataset.csv')
+CLEANED_COLUMNS = RAW_COLUMNS + [
+    "Total_sub_metering",
+    "DateTime",
+    "hour",
+    "Days",
+    "Month",
+    "Unmetered_power",
+]
+
+# Measurements fit comfortably in float32 (3 significant digits in the source),
+# Date/Time repeat heavily so they are stored as categoricals.
+RAW_DTYPES = {
+    "Date": "category",
+    "Time": "category",
+    **{col: "float32" for col in MEASUREMENT_COLUMNS},
+}
+
+CLEANED_DTYPES = {
+    **RAW_DTYPES,
+    "Total_sub_metering": "float32",
+    "hour": "int8",
+    "Days": "category",
+    "Month": "category",
+    "Unmetered_power": "float32",
+}
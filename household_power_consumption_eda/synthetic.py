@@ -0,0 +1,68 @@
+"""Synthetic household power data shaped like the UCI export.
+
+Used by the benchmark scripts so they can run at sizes well beyond the real
+file (and on machines that don't have it).
+"""
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+from schema import RAW_COLUMNS
+
+START = pd.Timestamp("2006-12-16 17:24:00")
+CHUNK_ROWS = 500_000
+_TIME_STRINGS = np.array([f"{m // 60:02d}:{m % 60:02d}:00" for m in range(24 * 60)])
+
+
+def _date_strings(ts):
+    # strftime per row dominates generation time, so format each day once.
+    days, inverse = np.unique(ts.normalize(), return_inverse=True)
+    return pd.DatetimeIndex(days).strftime("%d/%m/%Y").to_numpy()[inverse]
+
+
+def raw_chunks(n_rows, seed=0, missing_rate=0.004, chunk_rows=CHUNK_ROWS, start=START):
+    """Yield raw-format DataFrames (strings, ``'?'`` gaps) totalling ``n_rows`` minutes."""
+    rng = np.random.default_rng(seed)
+    for offset in range(0, n_rows, chunk_rows):
+        n = min(chunk_rows, n_rows - offset)
+        ts = start + pd.to_timedelta(np.arange(offset, offset + n), unit="min")
+        hour = ts.hour.to_numpy()
+        # Evening peak, night trough
+        load = 0.6 + 0.9 * np.exp(-((hour - 20) ** 2) / 8.0) + 0.4 * np.exp(-((hour - 8) ** 2) / 4.0)
+        gap = rng.gamma(2.0, 0.5, n) * load
+        sub1 = np.where(rng.random(n) < 0.05, rng.integers(1, 40, n), 0)
+        sub2 = np.where(rng.random(n) < 0.1, rng.integers(1, 30, n), rng.integers(0, 2, n))
+        sub3 = np.clip(np.round(rng.normal(6, 8, n) * load), 0, 31)
+        voltage = rng.normal(240.8, 3.2, n)
+
+        frame = pd.DataFrame({
+            "Date": _date_strings(ts),
+            "Time": _TIME_STRINGS[hour * 60 + ts.minute.to_numpy()],
+            "Global_active_power": np.round(gap, 3).astype(str),
+            "Global_reactive_power": np.round(rng.gamma(1.5, 0.08, n), 3).astype(str),
+            "Voltage": np.round(voltage, 2).astype(str),
+            "Global_intensity": np.round(gap * 1000 / voltage, 1).astype(str),
+            "Sub_metering_1": sub1.astype(str),
+            "Sub_metering_2": sub2.astype(str),
+            "Sub_metering_3": sub3.astype(str),
+        }, columns=RAW_COLUMNS)
+
+        # Outages in the real data blank every measurement for a run of minutes.
+        starts = np.flatnonzero(rng.random(n) < missing_rate / 30)
+        for s in starts:
+            frame.iloc[s:s + int(rng.integers(1, 60)), 2:] = "?"
+        yield frame
+
+
+def write_raw_csv(path, n_rows, seed=0, **kwargs):
+    """Write a synthetic raw CSV of ``n_rows`` minutes to ``path``."""
+    for i, chunk in enumerate(raw_chunks(n_rows, seed=seed, **kwargs)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
+
+
+def write_cleaned_csv(raw_path, path):
+    """Run the streaming cleaner over ``raw_path`` and write ``path``."""
+    cleaning.clean_file(raw_path, path)
+    return path
@@ -0,0 +1,38 @@
+"""Regression tests for the shared helpers and the apps' pure data functions.
+
+The apps are not installable packages, so their directories are put on
+``sys.path`` here. The power project's environment has every dependency:
+
+    uv run --project household_power_consumption_eda --with pytest pytest tests
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+for path in (REPO / "eda_common" / "src", REPO / "household_power_consumption_eda", REPO / "tutorial"):
+    sys.path.insert(0, str(path))
+
+
+def _power_module(name):
+    # Loaded by path: the tutorial has modules with the same names
+    path = REPO / "household_power_consumption_eda" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"power_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def power_minutes(tmp_path_factory):
+    """Three weeks of cleaned synthetic minutes, as the app reads them from the store."""
+    import cleaning
+
+    raw = tmp_path_factory.mktemp("power") / "raw.csv"
+    _power_module("synthetic").write_raw_csv(raw, 30_000, seed=3)
+    return pd.concat([cleaned for _, cleaned in cleaning.clean_chunks(cleaning.read_chunks(raw))],
+                     ignore_index=True)
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+import anomalies
+
+
+@pytest.fixture(scope="module")
+def minutes(power_minutes):
+    # Sags and spikes planted across the frame, one run straddling the split below
+    df = power_minutes[anomalies.INPUT_COLUMNS].copy()
+    for start in (2_000, 9_998, 17_500, 25_000):
+        df.loc[start:start + 4, "Voltage"] -= 30
+        df.loc[start + 300:start + 302, "Global_active_power"] += 9
+    return df
+
+
+@pytest.fixture(scope="module")
+def baseline(minutes):
+    return anomalies.seasonal_baseline(minutes)
+
+
+def test_planted_anomalies_are_found(minutes, baseline):
+    found = anomalies.detect(minutes, baseline)
+    assert (found["kind"] == "voltage_sag").sum() >= 4
+    assert (found["kind"] == "power_spike").sum() >= 4
+
+
+@pytest.mark.parametrize("splits", [[10_000], [3_000, 10_001, 10_002, 22_222]])
+def test_update_matches_full_rescore(minutes, baseline, splits):
+    bounds = [0, *splits, len(minutes)]
+    detector = anomalies.Detector(minutes.iloc[:bounds[1]], baseline)
+    appended = [detector.update(minutes.iloc[a:b]) for a, b in zip(bounds[1:], bounds[2:])]
+    expected = anomalies.detect(minutes, baseline)
+
+    pd.testing.assert_frame_equal(detector.intervals, expected)
+    # The returned intervals are what was added to the ones seen before
+    first = anomalies.detect(minutes.iloc[:bounds[1]], baseline)
+    for part in appended:
+        first = anomalies.merge_intervals(first, part)
+    pd.testing.assert_frame_equal(first, expected)
+
+
+def test_detect_parts_matches_detect(minutes, baseline):
+    parts = [minutes.iloc[i:i + 4_321] for i in range(0, len(minutes), 4_321)]
+    pd.testing.assert_frame_equal(anomalies.detect_parts(parts, baseline), anomalies.detect(minutes, baseline))
+
+
+def test_update_rejects_rows_before_the_tail(minutes, baseline):
+    detector = anomalies.Detector(minutes.iloc[:5_000], baseline)
+    with pytest.raises(ValueError):
+        detector.update(minutes.iloc[4_000:6_000])
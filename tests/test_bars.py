@@ -0,0 +1,49 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_common import bars
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    return pd.DataFrame({
+        "brand": pd.Categorical(rng.zipf(1.5, n).clip(max=60).astype(str)),
+        "model": pd.Categorical(rng.zipf(1.3, n).clip(max=300).astype(str)),
+        "price": rng.lognormal(1, 0.5, n),
+    })
+
+
+def _pooled_moments(stats):
+    n = stats["count"].sum()
+    return n, (stats["count"] * stats["mean"]).sum() / n
+
+
+def test_top_n_caps_x_and_hue_and_keeps_totals(frame):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        full = bars.group_stats(frame["brand"], frame["price"], frame["model"])
+        capped = bars.top_n(full, 10, hue_n=5)
+    assert capped.index.get_level_values(0).nunique() == 11
+    assert capped.index.get_level_values(1).nunique() == 6
+    assert not capped.index.duplicated().any()
+    np.testing.assert_allclose(_pooled_moments(capped), _pooled_moments(full))
+    np.testing.assert_allclose(capped["count"].sum(), len(frame))
+
+
+def test_hue_equal_to_x(frame):
+    stats = bars.top_n(bars.group_stats(frame["brand"], frame["price"], frame["brand"]), 10)
+    assert (stats.index.get_level_values(0) == stats.index.get_level_values(1)).sum() == 10
+    np.testing.assert_allclose(stats["count"].sum(), len(frame))
+
+
+def test_pooled_std_matches_pandas(frame):
+    stats = bars.top_n(bars.group_stats(frame["brand"], frame["price"]), 5)
+    top = frame["brand"].value_counts().index[:5]
+    rest = frame.loc[~frame["brand"].isin(top), "price"]
+    assert stats.loc[bars.OTHER, "count"] == len(rest)
+    np.testing.assert_allclose(stats.loc[bars.OTHER, ["mean", "std"]].to_numpy(float), [rest.mean(), rest.std()])
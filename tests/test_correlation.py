@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_common.correlation import CorrelationStats
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0, 1, n)
+    df = pd.DataFrame({
+        "a": base,
+        # Far from zero, so an unshifted sum of squares would lose the variance
+        "b": 1e6 + 0.5 * base + rng.normal(0, 1, n),
+        "c": -2 * base + rng.normal(0, 3, n),
+        "d": rng.integers(0, 10, n).astype("float64"),
+    })
+    for col, rate in zip(df.columns, (0.05, 0.1, 0.0, 0.2)):
+        df.loc[rng.random(n) < rate, col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_chunked_matches_dataframe_corr(seed):
+    df = _frame(50_000, seed)
+    stats = CorrelationStats.from_frame(df, chunk_rows=7_000)
+    pd.testing.assert_frame_equal(stats.corr(), df.corr(), atol=1e-9)
+    pd.testing.assert_frame_equal(stats.corr(["c", "a"]), df[["c", "a"]].corr(), atol=1e-9)
+
+
+def test_merge_matches_dataframe_corr():
+    # Parts with different means, so merge has to re-express one side's shift
+    parts = [_frame(20_000, 0), _frame(5_000, 1) * 3 + 100, _frame(12_000, 2) - 50]
+    merged = CorrelationStats(parts[0].columns)
+    for part in parts:
+        merged.merge(CorrelationStats.from_frame(part, chunk_rows=4_000))
+    expected = pd.concat(parts, ignore_index=True).corr()
+    pd.testing.assert_frame_equal(merged.corr(), expected, atol=1e-9)
+
+
+def test_undefined_pairs_are_nan_like_pandas():
+    df = pd.DataFrame({
+        "x": [1.0, 2.0, 3.0, np.nan, np.nan],
+        "y": [np.nan, np.nan, np.nan, 1.0, 2.0],
+        "flat": [4.0, 4.0, 4.0, 4.0, 4.0],
+        "z": [1.0, 3.0, 2.0, 5.0, 4.0],
+    })
+    pd.testing.assert_frame_equal(CorrelationStats.from_frame(df).corr(), df.corr())
+
+
+def test_merge_rejects_other_columns():
+    with pytest.raises(ValueError):
+        CorrelationStats(["a", "b"]).merge(CorrelationStats(["b", "a"]))
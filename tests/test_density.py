@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.figure import Figure
+
+from eda_common import density
+
+
+@pytest.mark.parametrize("hue", [None, pd.Series(list("abcab")), pd.Series([1.0, 2.0, np.nan, 4.0, 5.0])])
+@pytest.mark.parametrize("x", [[], [np.nan] * 5])
+def test_no_finite_points_gives_an_empty_raster(x, hue):
+    y = np.arange(len(x), dtype="float64")
+    r = density.raster(x, y, hue=None if hue is None else hue[:len(x)])
+    assert r["n"] == 0 and r["counts"].sum() == 0
+    assert len(density.outliers(r)) == 0
+    density.plot_raster(Figure().subplots(), r)
+
+
+def test_counts_and_outliers():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(0, 1, 50_000), [40.0], [np.nan]])
+    y = np.concatenate([rng.normal(0, 1, 50_000), [40.0], [1.0]])
+    r = density.raster(x, y, bins=50)
+    assert r["n"] == r["counts"].sum() == 50_001
+    assert 50_000 in density.outliers(r)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from eda_common import distribution
+
+
+@pytest.mark.parametrize("values", [[], [np.nan, np.inf, -np.inf]])
+def test_no_finite_values_plot_a_note(values):
+    stats = distribution.column_stats(values)
+    assert stats is None
+    for plot in (distribution.plot_histogram, distribution.plot_boxplot):
+        ax = Figure().subplots()
+        plot(ax, stats)
+        assert [t.get_text() for t in ax.texts] == ["No finite values"]
+
+
+def test_stats_match_numpy():
+    values = np.random.default_rng(0).lognormal(0, 1, 10_001)
+    stats = distribution.column_stats(np.append(values, np.nan))
+    assert stats["n"] == len(values)
+    assert stats["counts"].sum() == len(values)
+    np.testing.assert_allclose([stats["box"]["q1"], stats["box"]["med"], stats["box"]["q3"]],
+                               np.percentile(values, [25, 50, 75]))
+    for plot in (distribution.plot_histogram, distribution.plot_boxplot):
+        plot(Figure().subplots(), stats)
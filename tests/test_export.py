@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_common import export
+
+
+@pytest.fixture(scope="module")
+def frame():
+    n = 10_000
+    rng = np.random.default_rng(0)
+    value = rng.normal(0, 1, n)
+    value[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "DateTime": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "value": value,
+        "count": rng.integers(0, 100, n),
+        "kind": pd.Categorical.from_codes(rng.integers(0, 3, n), ["low", "mid", "high"]),
+    })
+
+
+def _read(path, fmt):
+    if fmt == "Parquet":
+        return pd.read_parquet(path)
+    got = pd.read_csv(path)
+    return got.astype({"DateTime": "datetime64[ns]"}) if "DateTime" in got else got
+
+
+@pytest.mark.parametrize("fmt", export.available_formats())
+@pytest.mark.parametrize("columns, where", [
+    (None, None),
+    (["DateTime", "kind", "value"], ("DateTime", pd.Timestamp("2024-01-02 03:00"), pd.Timestamp("2024-01-04"))),
+    # Nothing in range: the file still has its header
+    (["value"], ("count", 200, 300)),
+])
+def test_round_trip(tmp_path, frame, fmt, columns, where):
+    path = export.export_file(frame, "v1", fmt, tmp_path, "cleaned", columns=columns, where=where, chunk_rows=999)
+    expected = frame if columns is None else frame[columns]
+    if where is not None:
+        column, lo, hi = where
+        expected = expected[(frame[column] >= lo) & (frame[column] < hi)]
+    expected = expected.astype({"kind": object} if "kind" in expected else {}).reset_index(drop=True)
+
+    got = _read(path, fmt)
+    assert list(got.columns) == list(expected.columns)
+    if len(expected):
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    else:
+        assert got.empty
+
+
+def test_whole_seconds_have_no_fraction(tmp_path, frame):
+    path = export.export_file(frame.head(3), "v1", "CSV", tmp_path, "cleaned", columns=["DateTime"])
+    assert path.read_text().splitlines()[1:] == ["2024-01-01 00:00:00", "2024-01-01 00:01:00", "2024-01-01 00:02:00"]
+
+
+def test_cached_export_is_not_rewritten(tmp_path, frame):
+    path = export.export_file(frame, "v1", "CSV", tmp_path, "cleaned")
+    os.utime(path, (0, 0))
+    assert export.export_file(frame, "v1", "CSV", tmp_path, "cleaned") == path
+    assert path.stat().st_mtime == 0
+
+
+def test_prune_keeps_the_newest_of_the_current_version(tmp_path, frame):
+    old_version = export.export_file(frame.head(10), "v0", "CSV", tmp_path, "cleaned")
+    other_stem = export.export_file(frame.head(10), "v0", "CSV", tmp_path, "raw")
+    written = []
+    for i, col in enumerate(frame.columns.tolist() * 3):
+        where = ("count", 0, i)
+        path = export.export_file(frame.head(10), "v1", "CSV", tmp_path, "cleaned", columns=[col], where=where)
+        # Distinct mtimes, oldest first, whatever the filesystem's resolution
+        os.utime(path, (i, i))
+        written.append(path)
+
+    kept = sorted(tmp_path.glob("cleaned.export.*"))
+    assert kept == sorted(written[-export.KEEP_FILES:])
+    assert not old_version.exists()
+    assert other_stem.exists()
+
+
+def test_read_bytes_reads_each_file_once(tmp_path, frame, monkeypatch):
+    monkeypatch.setattr(export, "_reads", type(export._reads)())
+    paths = [export.export_file(frame.head(10), "v1", "CSV", tmp_path, "cleaned", columns=[col])
+             for col in frame.columns[:export.CACHED_READS + 1]]
+    first = export.read_bytes(paths[0])
+    assert first == paths[0].read_bytes()
+    paths[0].unlink()
+    assert export.read_bytes(paths[0]) == first
+    for path in paths[1:]:
+        export.read_bytes(path)
+    # Evicted once more files than CACHED_READS were served
+    with pytest.raises(FileNotFoundError):
+        export.read_bytes(paths[0])
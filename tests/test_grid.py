@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_common import grid
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    days = pd.Categorical(rng.choice(DAYS, 500), categories=DAYS, ordered=True)
+    days[rng.random(500) < 0.05] = np.nan
+    return pd.DataFrame({
+        "Days": days,
+        "Name": pd.Categorical(rng.choice(["b", "c", "a"], 500)),
+        "value": rng.normal(0, 1, 500),
+    })
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_ordered_categorical_sorts_in_category_order(frame, ascending):
+    rows, _ = grid.window(frame, ["Days"], page_size=500, sort="Days", ascending=ascending,
+                          version=f"ordered-{ascending}")
+    present = rows["Days"].dropna()
+    assert rows["Days"].isna().to_numpy()[len(present):].all()
+    codes = present.cat.codes.to_numpy()
+    assert (np.diff(codes) >= 0).all() if ascending else (np.diff(codes) <= 0).all()
+
+
+def test_sort_agrees_with_filter_order(frame):
+    # Rows after "Friday" in the sort are exactly the rows the > filter keeps
+    rows, _ = grid.window(frame, ["Days"], page_size=500, sort="Days", version="agree")
+    later, n_later = grid.window(frame, ["Days"], page_size=500, predicates=[("Days", ">", "Friday")],
+                                 version="agree")
+    tail = rows["Days"].dropna()
+    assert tail.iloc[-n_later:].index.sort_values().equals(later.index.sort_values())
+
+
+def test_unordered_categorical_sorts_by_label(frame):
+    rows, _ = grid.window(frame, ["Name"], page_size=500, sort="Name", version="labels")
+    assert rows["Name"].tolist() == sorted(frame["Name"].tolist())
+
+
+def test_window_needs_a_version(frame):
+    with pytest.raises(TypeError):
+        grid.window(frame, ["value"], sort="value")
@@ -0,0 +1,35 @@
+import types
+
+import pytest
+
+from eda_common import instrument
+
+scriptrunner = pytest.importorskip("streamlit.runtime.scriptrunner")
+
+
+def test_messages_are_sized_through_enqueue(monkeypatch):
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    sent = []
+    ctx = types.SimpleNamespace(_enqueue=sent.append)
+    monkeypatch.setattr(scriptrunner, "get_script_run_ctx", lambda suppress_warning=False: ctx)
+    run = instrument.start_run("test", enabled=True)
+    msg = ForwardMsg()
+    msg.delta.new_element.markdown.body = "hello"
+    try:
+        ctx._enqueue(msg)
+    finally:
+        instrument.finish_run()
+    assert sent == [msg]
+    assert run.messages == {("markdown", None): [1, msg.ByteSize()]}
+
+
+def test_missing_private_enqueue_is_skipped(monkeypatch):
+    # A Streamlit release without ScriptRunContext._enqueue must not break ?debug=1 sessions
+    ctx = types.SimpleNamespace()
+    monkeypatch.setattr(scriptrunner, "get_script_run_ctx", lambda suppress_warning=False: ctx)
+    run = instrument.start_run("test", enabled=True)
+    with instrument.span("work"):
+        pass
+    assert instrument.finish_run() is run
+    assert not hasattr(ctx, "_enqueue")
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import rollups
+
+
+def _groupby_cube(df):
+    """The cube as a plain pandas groupby over the minutes."""
+    cols = rollups._columns(df)
+    stamp = df["DateTime"].dt.floor("h")
+    grouped = df[cols].groupby([stamp.dt.normalize().rename("date"), stamp.dt.hour.astype("int8").rename("hour")])
+    parts = {stat: getattr(grouped, stat)() for stat in rollups.STATS}
+    cube = pd.DataFrame({f"{col}_{stat}": parts[stat][col] for col in cols for stat in rollups.STATS})
+    return cube.reset_index()
+
+
+def _assert_cubes_equal(cube, expected):
+    pd.testing.assert_frame_equal(cube.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+@pytest.fixture(scope="module")
+def minutes(power_minutes):
+    # A few gaps, so counts and NaN-skipping min/max are exercised
+    df = power_minutes.copy()
+    rng = np.random.default_rng(0)
+    df.loc[rng.random(len(df)) < 0.01, "Voltage"] = np.nan
+    return df
+
+
+def test_build_cube_matches_groupby(minutes):
+    _assert_cubes_equal(rollups.build_cube(minutes), _groupby_cube(minutes))
+
+
+def test_build_cube_unsorted_matches_groupby(minutes):
+    shuffled = minutes.sample(frac=1, random_state=0)
+    _assert_cubes_equal(rollups.build_cube(shuffled), _groupby_cube(minutes))
+
+
+@pytest.mark.parametrize("splits", [[7_000], [1, 12_345, 20_000]])
+def test_merge_cubes_matches_groupby(minutes, splits):
+    # Split points fall inside hours, so the same (date, hour) is in two cubes
+    bounds = [0, *splits, len(minutes)]
+    cubes = [rollups.build_cube(minutes.iloc[a:b]) for a, b in zip(bounds, bounds[1:])]
+    _assert_cubes_equal(rollups.merge_cubes(cubes), _groupby_cube(minutes))
+
+
+@pytest.mark.parametrize("cut", [6_000, 6_030])
+def test_fold_cube_matches_rebuild(minutes, cut):
+    # Batches end mid-hour, so every fold reopens the last hour of the cube
+    cube = rollups.build_cube(minutes.iloc[:cut])
+    for start in range(cut, len(minutes), 4_111):
+        cube = rollups.fold_cube(cube, minutes.iloc[start:start + 4_111])
+    _assert_cubes_equal(cube, _groupby_cube(minutes))
+
+
+def test_fold_cube_empty_batch_keeps_cube(minutes):
+    cube = rollups.build_cube(minutes)
+    assert rollups.fold_cube(cube, minutes.iloc[:0]) is cube
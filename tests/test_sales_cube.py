@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sales_cube import PRODUCTS, REGIONS, SalesCube, sample_sales, synthetic_sales
+
+RAW_ROWS = 1000
+
+
+def _selections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield [r for r in REGIONS if rng.random() < 0.6], [p for p in PRODUCTS if rng.random() < 0.6]
+
+
+def _filtered(df, regions, products):
+    return df[df["Region"].isin(regions) & df["Product"].isin(products)]
+
+
+@pytest.fixture(scope="module", params=["synthetic", "sample"])
+def sales(request):
+    # Categorical Region/Product at scale, plain strings in the dashboard's sample
+    df = synthetic_sales(60_000, days=120, seed=1) if request.param == "synthetic" else sample_sales()
+    return df, SalesCube(df, chunk_rows=7_000)
+
+
+@pytest.mark.parametrize("selection", list(_selections(12)))
+def test_cube_matches_pandas_filters(sales, selection):
+    df, cube = sales
+    regions, products = selection
+    filtered = _filtered(df, regions, products)
+
+    assert cube.totals(regions, products) == (filtered["Revenue"].sum(), filtered["Units_Sold"].sum(), len(filtered))
+    by_product = filtered.groupby("Product", observed=True)["Revenue"].sum()
+    pd.testing.assert_series_equal(cube.by_product(regions, products), by_product,
+                                   check_dtype=False, check_index_type=False, check_categorical=False)
+    by_date = filtered.groupby("Date")["Units_Sold"].sum()
+    pd.testing.assert_series_equal(cube.by_date(regions, products), by_date, check_dtype=False)
+
+
+@pytest.mark.parametrize("selection", list(_selections(12, seed=1)))
+def test_recent_prefix_holds_the_latest_rows(sales, selection):
+    df, cube = sales
+    regions, products = selection
+    newest_first = df["Date"].to_numpy().argsort(kind="stable")[::-1]
+    prefix = df.iloc[newest_first[:cube.recent_prefix(regions, products, RAW_ROWS)]]
+    recent = _filtered(prefix, regions, products).head(RAW_ROWS)
+
+    expected = _filtered(df, regions, products).sort_values("Date", ascending=False).head(RAW_ROWS)
+    assert len(recent) == len(expected)
+    # Ties on the last date may pick different rows, so compare dates only
+    np.testing.assert_array_equal(recent["Date"].to_numpy(), expected["Date"].to_numpy())
+
+
+def test_empty_selection_selects_nothing(sales):
+    _, cube = sales
+    for regions, products in (([], PRODUCTS), (REGIONS, []), (["Nowhere"], PRODUCTS)):
+        assert cube.totals(regions, products) == (0, 0, 0)
+        assert cube.by_product(regions, products).empty
+        assert cube.by_date(regions, products).empty
+        assert cube.recent_prefix(regions, products, RAW_ROWS) == 0
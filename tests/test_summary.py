@@ -0,0 +1,51 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_common import summary
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.lognormal(0, 1, n), "y": rng.normal(5, 2, n)})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_percentiles_within_rank_error(seed):
+    values = _frame(200_000, seed)["x"]
+    summaries = summary.summarize(values.to_frame(), chunk_rows=30_000, seed=seed)
+    ordered = np.sort(values.to_numpy())
+    qs = [0.05, 0.25, 0.5, 0.75, 0.95]
+    for q, estimate in zip(qs, summaries["x"].sketch.quantile(qs)):
+        rank = np.searchsorted(ordered, estimate) / len(ordered)
+        assert abs(rank - q) <= summary.RANK_ERROR
+
+
+def test_moments_are_exact():
+    df = _frame(50_000, 0)
+    table = summary.describe(summary.summarize(df, chunk_rows=7_000))
+    expected = df.describe()
+    for row in ("count", "mean", "std", "min", "max"):
+        np.testing.assert_allclose(table.loc[row], expected.loc[row], rtol=1e-9)
+
+
+def test_merge_matches_one_pass_and_leaves_inputs_unchanged():
+    df = _frame(40_000, 1)
+    left = summary.summarize(df.iloc[:25_000], seed=1)
+    right = summary.summarize(df.iloc[25_000:], seed=2)
+    before = copy.deepcopy((left, right))
+
+    merged = summary.merge(left, right)
+
+    for part, saved in zip((left, right), before):
+        for col in df.columns:
+            for name in ("count", "mean", "m2", "min", "max"):
+                assert getattr(part[col], name) == getattr(saved[col], name)
+            assert part[col].sketch.n == saved[col].sketch.n
+            for level, saved_level in zip(part[col].sketch._levels, saved[col].sketch._levels, strict=True):
+                np.testing.assert_array_equal(level, saved_level)
+    assert merged["x"] is not left["x"]
+    np.testing.assert_allclose(summary.describe(merged).loc[["count", "mean", "std"]],
+                               df.describe().loc[["count", "mean", "std"]], rtol=1e-9)
@@ -0,0 +1,84 @@
+"""Filter latency of the sales dashboard: pandas masks on raw rows vs. ``SalesCube``.
+
+For each size, generates synthetic sales, builds the cube once, then times
+random Region/Product selections through both paths. Each path computes
+what one dashboard rerun needs: the three KPIs, revenue by product, units by
+date, and the newest ``RAW_ROWS`` matching rows.
+
+    python bench_cube.py
+    python bench_cube.py --rows 1000000 10000000 30000000 --queries 10
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from sales_cube import PRODUCTS, REGIONS, SalesCube, synthetic_sales
+
+RAW_ROWS = 1000
+
+
+def pandas_path(df, regions, products):
+    filtered = df[df["Region"].isin(regions) & df["Product"].isin(products)]
+    kpis = filtered["Revenue"].sum(), filtered["Units_Sold"].sum(), filtered["Units_Sold"].mean()
+    by_product = filtered.groupby("Product", observed=True)["Revenue"].sum()
+    by_date = filtered.groupby("Date")["Units_Sold"].sum()
+    recent = filtered.sort_values(by="Date", ascending=False).head(RAW_ROWS)
+    return kpis, by_product, by_date, recent
+
+
+def cube_path(df, newest_first, cube, regions, products):
+    revenue, units, rows = cube.totals(regions, products)
+    kpis = revenue, units, units / rows if rows else float("nan")
+    by_product = cube.by_product(regions, products)
+    by_date = cube.by_date(regions, products)
+    recent = df.iloc[newest_first[:cube.recent_prefix(regions, products, RAW_ROWS)]]
+    recent = recent[recent["Region"].isin(regions) & recent["Product"].isin(products)].head(RAW_ROWS)
+    return kpis, by_product, by_date, recent
+
+
+def _selections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        regions = [r for r in REGIONS if rng.random() < 0.6] or [REGIONS[0]]
+        products = [p for p in PRODUCTS if rng.random() < 0.6] or [PRODUCTS[0]]
+        yield regions, products
+
+
+def _ms(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--queries", type=int, default=10, help="Random selections per size (default %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'build s':>8} {'pandas ms':>10} {'cube ms':>8} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = synthetic_sales(n_rows)
+        start = time.perf_counter()
+        cube = SalesCube(df)
+        newest_first = df["Date"].to_numpy().argsort(kind="stable")[::-1]
+        build = time.perf_counter() - start
+
+        slow, fast = [], []
+        for regions, products in _selections(args.queries):
+            ms, expected = _ms(pandas_path, df, regions, products)
+            slow.append(ms)
+            ms, got = _ms(cube_path, df, newest_first, cube, regions, products)
+            fast.append(ms)
+            assert expected[0][:2] == got[0][:2], "cube totals differ from pandas"
+            assert np.array_equal(expected[2], got[2]), "cube units by date differ from pandas"
+        slow_ms, fast_ms = statistics.median(slow), statistics.median(fast)
+        print(f"{n_rows:>12,} {build:>8.2f} {slow_ms:>10.1f} {fast_ms:>8.2f} {slow_ms / fast_ms:>7.0f}x")
+        del df, cube, newest_first
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,91 @@
-import streamlit as st
+import hashlib
+import io
+
+import numpy as np
 import pandas as pd
+import streamlit as st
+
+CHUNK_ROWS = 100_000
+PAGE_ROWS = 100
+
+
+# Keyed on the upload's content hash: re-uploading the same file, or any
+# widget change, reuses the parsed frame instead of reading the CSV again.
+# The progress bar is created and cleared in here: a cache hit replays the
+# elements the function drew, which must not belong to a block made outside it.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_upload(digest, _data):
+    status = st.empty()
+    buffer = io.BytesIO(_data)
+    reader = pd.read_csv(buffer, chunksize=CHUNK_ROWS)
+    chunks = []
+    with reader:
+        for chunk in reader:
+            # Text columns become categoricals chunk by chunk, so the raw strings never pile up
+            chunks.append(chunk.astype({col: 'category' for col in chunk.select_dtypes('object').columns}))
+            status.progress(min(buffer.tell() / max(len(_data), 1), 1.0), text='Parsing upload...')
+    status.empty()
+    if not chunks:
+        return pd.read_csv(io.BytesIO(_data))
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[col] = pd.api.types.union_categoricals(parts)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def summarize(digest, _df):
+    return _df.describe()
+
+
+# Rows of each city, stored contiguously: one argsort per upload, then a slice per city
+@st.cache_resource(max_entries=4, show_spinner=False)
+def city_index(digest, _df):
+    city = _df['City'].astype('category')
+    codes = city.cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(city.cat.categories))
+    offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+    return city.cat.categories, order, offsets
+
+
+def upload_digest(file):
+    # Hash each upload once; later reruns look it up by the uploader's file id
+    key = f'digest_{file.file_id}'
+    if key not in st.session_state:
+        st.session_state[key] = hashlib.sha256(file.getvalue()).hexdigest()
+    return st.session_state[key]
+
+
+def show_page(frame, key):
+    pages = max(1, -(-len(frame) // PAGE_ROWS))
+    page = st.number_input('Page', 1, pages, 1, key=key) if pages > 1 else 1
+    start = (page - 1) * PAGE_ROWS
+    st.dataframe(frame.iloc[start:start + PAGE_ROWS])
+    st.caption(f'Rows {min(start + 1, len(frame)):,}–{min(start + PAGE_ROWS, len(frame)):,} of {len(frame):,}')
+
 
 st.title('Chai Sales Dashboard')
 
 file = st.file_uploader('Upload your CSV file', type=['csv'])
 
 if file:
+    digest = upload_digest(file)
+    df = load_upload(digest, file.getvalue())
     st.success('File Upload Successful!')
 
-    df = pd.read_csv(file)
-
-    st.dataframe(df)
+    show_page(df, f'preview_page_{digest}')
 
 if file:
     st.subheader('Data Summary')
-    st.write(df.describe())
+    st.write(summarize(digest, df))
 
-if file:
-    cities = df['City'].unique()
-    selected_city = st.selectbox('Filter by cities', cities)
-    filterd_data = df[df['City'] == selected_city]
-    st.dataframe(filterd_data)
\ No newline at end of file
+if file and 'City' in df.columns:
+    cities, order, offsets = city_index(digest, df)
+    selected_city = st.selectbox('Filter by cities', range(len(cities)), format_func=lambda i: cities[i])
+    filterd_data = df.iloc[order[offsets[selected_city]:offsets[selected_city + 1]]]
+    show_page(filterd_data, f'city_page_{digest}_{selected_city}')
@@ -1,35 +1,34 @@
+import os
+
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from sales_cube import SalesCube, sample_sales, synthetic_sales
 
 st.set_page_config(page_title='Simple Sales Dashboard', layout='wide')
 
-@st.cache_data
-def load_data():
-    np.random.seed(42)
-    data = {
-        "Date": pd.date_range("2024-01-01", periods=60),
-        "Region": ["North", "South", "East", "West"] * 15,
-        "Product": ["Chai", "Coffee", "Green Tea"] * 20,
-        "Revenue": np.random.randint(500, 3000, 60),
-        "Units_Sold": np.random.randint(20, 100, 60)
-    }
+# Rows shown in the Raw Data table (newest first)
+RAW_ROWS = 1000
 
-    return pd.DataFrame(data)
+# SALES_ROWS=20000000 swaps the 60-row sample for that many synthetic rows.
+# Kept as a resource (not copied per rerun); the cube is built once here and
+# every KPI and chart below is a sum over its slice for the selected filters.
+@st.cache_resource
+def load_data(n_rows=0):
+    df = synthetic_sales(n_rows) if n_rows else sample_sales()
+    newest_first = df['Date'].to_numpy().argsort(kind='stable')[::-1]
+    options = {col: df[col].unique().tolist() for col in ("Region", "Product")}
+    return df, newest_first, options, SalesCube(df)
 
-df = load_data()
+df, newest_first, options, cube = load_data(int(os.environ.get("SALES_ROWS", 0)))
 
 st.sidebar.header('Filters')
-region_filter = st.sidebar.multiselect("Select Region", df['Region'].unique(), default=df['Region'].unique())
-product_filter = st.sidebar.multiselect("Select Product", df['Product'].unique(), default=df['Product'].unique())
-
-filtered_df = df[df['Region'].isin(region_filter) & df['Product'].isin(product_filter)]
+region_filter = st.sidebar.multiselect("Select Region", options['Region'], default=options['Region'])
+product_filter = st.sidebar.multiselect("Select Product", options['Product'], default=options['Product'])
 
 st.title('Simple Sales Dasboard')
 
-total_revenue = filtered_df['Revenue'].sum()
-units_sold = filtered_df['Units_Sold'].sum()
-avg_units = filtered_df['Units_Sold'].mean()
+total_revenue, units_sold, n_rows = cube.totals(region_filter, product_filter)
+avg_units = units_sold / n_rows if n_rows else float('nan')
 
 col1, col2, col3 = st.columns(3)
 col1.metric('Total Revenue', f'Rs. {total_revenue:,}')
@@ -39,13 +38,18 @@ col3.metric("Avg Units per Day", f"{avg_units:.2f}")
 st.markdown('---')
 
 st.subheader('Revenue by Product')
-revenue_chart = filtered_df.groupby('Product')['Revenue'].sum()
+revenue_chart = cube.by_product(region_filter, product_filter)
 st.bar_chart(revenue_chart)
 
 st.subheader('Units Sold over Time')
-units_time = filtered_df.groupby('Date')['Units_Sold'].sum()
+units_time = cube.by_date(region_filter, product_filter)
 st.line_chart(units_time)
 
 st.markdown('---')
 st.subheader("Raw Data")
-st.dataframe(filtered_df.sort_values(by="Date", ascending=False), use_container_width=True)
\ No newline at end of file
+# Only the newest dates that can hold RAW_ROWS selected rows are filtered
+recent = df.iloc[newest_first[:cube.recent_prefix(region_filter, product_filter, RAW_ROWS)]]
+recent = recent[recent['Region'].isin(region_filter) & recent['Product'].isin(product_filter)].head(RAW_ROWS)
+st.dataframe(recent, use_container_width=True)
+if n_rows > RAW_ROWS:
+    st.caption(f"Latest {RAW_ROWS:,} of {n_rows:,} matching rows")
\ No newline at end of file
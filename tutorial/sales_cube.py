@@ -0,0 +1,147 @@
+"""Region x Product x Date sums behind the sales dashboard.
+
+``SalesCube`` bins every row once into a dense ``regions x products x dates``
+array of Revenue sums, Units_Sold sums and row counts. The dashboard's KPIs
+and charts are sums over a slice of it, so a filter change costs the size of
+the cube (a few thousand cells), not the number of rows.
+
+``synthetic_sales`` generates rows shaped like the dashboard's sample data at
+any size, for ``bench_cube.py`` or ``SALES_ROWS=20000000 streamlit run dashboard.py``.
+"""
+
+import numpy as np
+import pandas as pd
+
+REGIONS = ["North", "South", "East", "West"]
+PRODUCTS = ["Chai", "Coffee", "Green Tea"]
+START = "2024-01-01"
+CHUNK_ROWS = 5_000_000
+
+
+def sample_sales():
+    """The dashboard's original 60-row sample (seed 42)."""
+    np.random.seed(42)
+    data = {
+        "Date": pd.date_range(START, periods=60),
+        "Region": ["North", "South", "East", "West"] * 15,
+        "Product": ["Chai", "Coffee", "Green Tea"] * 20,
+        "Revenue": np.random.randint(500, 3000, 60),
+        "Units_Sold": np.random.randint(20, 100, 60)
+    }
+    return pd.DataFrame(data)
+
+
+def synthetic_sales(n_rows, days=730, seed=0, chunk_rows=CHUNK_ROWS):
+    """``n_rows`` of random sales over ``days`` days, with categorical Region/Product.
+
+    Built in chunks into preallocated arrays, so peak memory stays close to
+    the size of the result.
+    """
+    rng = np.random.default_rng(seed)
+    date = np.empty(n_rows, dtype="datetime64[ns]")
+    region = np.empty(n_rows, dtype=np.int8)
+    product = np.empty(n_rows, dtype=np.int8)
+    revenue = np.empty(n_rows, dtype=np.int32)
+    units = np.empty(n_rows, dtype=np.int16)
+    start = np.datetime64(START, "ns")
+    for offset in range(0, n_rows, chunk_rows):
+        part = slice(offset, min(offset + chunk_rows, n_rows))
+        n = part.stop - part.start
+        date[part] = start + rng.integers(0, days, n).astype("timedelta64[D]")
+        region[part] = rng.integers(0, len(REGIONS), n)
+        product[part] = rng.integers(0, len(PRODUCTS), n)
+        revenue[part] = rng.integers(500, 3000, n)
+        units[part] = rng.integers(20, 100, n)
+    return pd.DataFrame({
+        "Date": date,
+        "Region": pd.Categorical.from_codes(region, REGIONS),
+        "Product": pd.Categorical.from_codes(product, PRODUCTS),
+        "Revenue": revenue,
+        "Units_Sold": units,
+    })
+
+
+def _levels(series):
+    """Sorted distinct values of a cube dimension."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories
+    return pd.Index(pd.unique(series.dropna())).sort_values()
+
+
+def _positions(series, levels):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64)
+    return levels.get_indexer(series)
+
+
+class SalesCube:
+    """Revenue/Units_Sold sums and row counts per (Region, Product, Date).
+
+    Rows are binned ``chunk_rows`` at a time, so building needs a few
+    arrays of one chunk's length on top of the frame itself.
+    """
+
+    def __init__(self, df, chunk_rows=CHUNK_ROWS):
+        self.regions = _levels(df["Region"])
+        self.products = _levels(df["Product"])
+        self.dates = _levels(df["Date"])
+        shape = (len(self.regions), len(self.products), len(self.dates))
+        size = int(np.prod(shape))
+        self.n_rows = len(df)
+        self.revenue = np.zeros(size, dtype=_sum_dtype(df["Revenue"]))
+        self.units = np.zeros(size, dtype=_sum_dtype(df["Units_Sold"]))
+        self.rows = np.zeros(size, dtype=np.int64)
+        for start in range(0, len(df), chunk_rows):
+            part = df.iloc[start:start + chunk_rows]
+            r = _positions(part["Region"], self.regions)
+            p = _positions(part["Product"], self.products)
+            d = _positions(part["Date"], self.dates)
+            valid = (r >= 0) & (p >= 0) & (d >= 0)
+            cell = ((r * shape[1] + p) * shape[2] + d)[valid]
+            for total, col in ((self.revenue, "Revenue"), (self.units, "Units_Sold")):
+                weights = part[col].to_numpy(dtype="float64")[valid]
+                total += np.bincount(cell, weights=weights, minlength=size).astype(total.dtype)
+            self.rows += np.bincount(cell, minlength=size)
+        self.revenue, self.units, self.rows = (a.reshape(shape) for a in (self.revenue, self.units, self.rows))
+
+    def _slice(self, values, regions, products):
+        ri = self.regions.get_indexer(list(regions))
+        pi = self.products.get_indexer(list(products))
+        return values[np.ix_(np.sort(ri[ri >= 0]), np.sort(pi[pi >= 0]))]
+
+    def totals(self, regions, products):
+        """``(revenue, units, rows)`` over the selected regions and products."""
+        return tuple(self._slice(v, regions, products).sum().item() for v in (self.revenue, self.units, self.rows))
+
+    def by_product(self, regions, products):
+        """Revenue per selected product that has rows, like ``groupby("Product")["Revenue"].sum()``."""
+        revenue = self._slice(self.revenue, regions, products).sum(axis=(0, 2))
+        rows = self._slice(self.rows, regions, products).sum(axis=(0, 2))
+        pi = self.products.get_indexer(list(products))
+        index = pd.Index(self.products[np.sort(pi[pi >= 0])], name="Product")
+        return pd.Series(revenue, index=index, name="Revenue")[rows > 0]
+
+    def by_date(self, regions, products):
+        """Units_Sold per date with selected rows, like ``groupby("Date")["Units_Sold"].sum()``."""
+        units = self._slice(self.units, regions, products).sum(axis=(0, 1))
+        rows = self._slice(self.rows, regions, products).sum(axis=(0, 1))
+        return pd.Series(units, index=pd.Index(self.dates, name="Date"), name="Units_Sold")[rows > 0]
+
+    def recent_prefix(self, regions, products, n):
+        """Length of the newest-first frame's prefix that holds the latest ``n`` selected rows.
+
+        The prefix covers whole dates, counted back until at least ``n``
+        selected rows are in it (or every date is). It is empty when nothing
+        is selected, so an empty selection never scans the frame.
+        """
+        selected = self._slice(self.rows, regions, products).sum(axis=(0, 1))
+        if n <= 0 or not selected.any():
+            return 0
+        newest_first = np.cumsum(selected[::-1])
+        days = min(int(np.searchsorted(newest_first, n)) + 1, len(selected))
+        return int(self.rows[:, :, len(selected) - days:].sum())
+
+
+def _sum_dtype(values):
+    # Integer columns keep integer sums (per-chunk float sums are exact below 2**53)
+    return np.int64 if pd.api.types.is_integer_dtype(values) else np.float64
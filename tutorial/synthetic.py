@@ -0,0 +1,43 @@
+"""Synthetic ``chai_sales.csv`` uploads for ``chapter-4.py``, at any size.
+
+Rows follow the sample file: one row per city and chai type sold on a day,
+``Revenue`` being ``Cups_Sold`` times the type's price per cup. The sales
+dashboard's own generator is ``sales_cube.synthetic_sales``.
+
+    write_chai_csv("chai_sales_1m.csv", 1_000_000)
+"""
+
+import numpy as np
+import pandas as pd
+
+CITIES = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Jaipur"]
+# Rs. per cup, as in the sample
+CHAI_TYPES = {"Masala": 15, "Adrak": 15, "Kesar": 20, "Elaichi": 18, "Tulsi": 17}
+START = "2024-01-01"
+CHUNK_ROWS = 1_000_000
+
+
+def chai_sales(n_rows, days=730, seed=0, chunk_rows=CHUNK_ROWS):
+    """Yield chunks of ``chai_sales.csv`` rows totalling ``n_rows``, in date order."""
+    rng = np.random.default_rng(seed)
+    types = list(CHAI_TYPES)
+    prices = np.array(list(CHAI_TYPES.values()))
+    dates = pd.date_range(START, periods=days).strftime("%Y-%m-%d").to_numpy()
+    for offset in range(0, n_rows, chunk_rows):
+        n = min(chunk_rows, n_rows - offset)
+        chai = rng.integers(0, len(types), n)
+        cups = rng.integers(40, 140, n)
+        yield pd.DataFrame({
+            "Date": dates[np.arange(offset, offset + n) * days // n_rows],
+            "City": np.array(CITIES, dtype=object)[rng.integers(0, len(CITIES), n)],
+            "Chai_Type": np.array(types, dtype=object)[chai],
+            "Cups_Sold": cups,
+            "Revenue": cups * prices[chai],
+        })
+
+
+def write_chai_csv(path, n_rows, seed=0, **kwargs):
+    """Write a synthetic ``chai_sales.csv`` of ``n_rows`` rows to ``path``."""
+    for i, chunk in enumerate(chai_sales(n_rows, seed=seed, **kwargs)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path